@@ -502,7 +502,10 @@ class TripOptimizerService implements ITripOptimizerService {
 	}
 
 	private async pollOptimizationJob(jobId: string) {
+		// Each status call long-polls (the optimizer holds it until the job
+		// leaves "pending"), so the loop only spins once per wait window
 		const pollIntervalMs = 300;
+		const longPollWaitSeconds = 25;
 		const maxWaitMs = 300_000; // 5 minutes
 		const deadline = Date.now() + maxWaitMs;
 
@@ -519,7 +522,8 @@ class TripOptimizerService implements ITripOptimizerService {
 					`${this.TRIP_OPTIMIZER_URL}/optimizer/api/v1/optimize/${jobId}/status`,
 					{
 						headers: { "X-API-Key": this.TRIP_OPTIMIZER_API_KEY },
-						timeout: 5_000,
+						params: { wait: longPollWaitSeconds },
+						timeout: (longPollWaitSeconds + 10) * 1000,
 					},
 				);
 
@@ -5,30 +5,50 @@ Public and authenticated API routes for the service.
 """
 
 # Standard library imports
+import asyncio
+import gzip
+import time
 import uuid
+from datetime import datetime, timezone
+from typing import Annotated, List, Optional
 
 # Third-party imports
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Body, Depends, Header, HTTPException, Query, Response, status
+from fastapi.responses import JSONResponse, StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 # Local application imports
 from app.core.config import settings
 from app.db import models
-from app.db.session import SessionLocal
-from app.dependencies import get_api_key, get_db
+from app.dependencies import get_api_key, get_async_db, get_db
 from app.models import schemas
-from app.services.data_manager import DataManager
-from app.services.optimization_service import OptimizationService
+from app.services.job_cost import estimate_job_cost, priority_at
+from app.services.job_queue import JobQueue
+from app.services.plan_delta import diff_plans
+from app.services.repair_service import RepairService
+from app.services.result_cache import (
+    accepts_gzip, etag_matches, msgpack_cache_key, msgpack_etag, result_cache, serialize_stored_result,
+)
+from app.services.retention_service import RetentionService
+from app.services.trip_stream import TripStream
 from app.utils.info_utils import InfoUtils
+from app.utils.msgpack_utils import MSGPACK_MEDIA_TYPE, MessagePackRoute, prefers_msgpack
+from app.utils.startup_utils import startup_monitor
+from app.workers.job_worker import default_worker_id, run_claimed_job
+from app.workers.solver_pool import solver_pool
 
 
 # -----------------------------------------------------------------------------
 # Routers
 # -----------------------------------------------------------------------------
 public_router = APIRouter(tags=["Public"])
+# Authenticated routes also take request bodies as MessagePack
 optimizer_router = APIRouter(
     tags=["Trip Optimizer"],
-    dependencies=[Depends(get_api_key)]
+    dependencies=[Depends(get_api_key)],
+    route_class=MessagePackRoute,
 )
 
 info_utils = InfoUtils()
@@ -38,7 +58,7 @@ info_utils = InfoUtils()
 # Public Routes
 # -----------------------------------------------------------------------------
 @public_router.get("/health", status_code=status.HTTP_200_OK)
-def health_check():
+async def health_check():
     """
     Health check endpoint.
 
@@ -48,6 +68,26 @@ def health_check():
     return {"status": "ok"}
 
 
+@public_router.get("/ready", status_code=status.HTTP_200_OK)
+async def readiness_check():
+    """
+    Readiness endpoint for orchestrator probes.
+
+    Returns 503 until the startup solver warmup has finished, so traffic is
+    only routed to instances that can solve without cold-start delay.
+
+    Returns:
+        dict: Readiness status and startup timings.
+    """
+    report = startup_monitor.report()
+    if not startup_monitor.is_ready:
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"status": "warming_up", **report},
+        )
+    return {"status": "ready", **report}
+
+
 @public_router.get("/info", status_code=status.HTTP_200_OK)
 def get_info():
     """
@@ -74,7 +114,7 @@ def get_version():
 # Authenticated Routes
 # -----------------------------------------------------------------------------
 @optimizer_router.get("/config", response_model=schemas.AppConfigResponse)
-def get_app_config():
+async def get_app_config():
     """
     Retrieve optimization configuration parameters.
 
@@ -88,13 +128,27 @@ def get_app_config():
     }
 
 
+@optimizer_router.get("/admin/storage", response_model=schemas.StorageReport)
+def get_storage_report(db: Session = Depends(get_db)):
+    """
+    Report database storage usage per table and the retention policy.
+
+    Args:
+        db (Session): Database session.
+
+    Returns:
+        schemas.StorageReport: Row counts and sizes of every table.
+    """
+    return RetentionService(db).storage_report()
+
+
 @optimizer_router.post(
     "/optimize",
     response_model=schemas.JobCreationResponse,
     status_code=status.HTTP_202_ACCEPTED
 )
 def create_optimization_task(
-    request: schemas.OptimizationRequest,
+    request: Annotated[schemas.AnyOptimizationRequest, Body()],
     background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
 ):
@@ -102,151 +156,383 @@ def create_optimization_task(
     Create a new optimization job.
 
     Args:
-        request (schemas.OptimizationRequest): Incoming request data with trips and vehicles.
+        request (schemas.AnyOptimizationRequest): Incoming request data with trips and
+            vehicles, in the full (nested) or compact (columnar) format, sent as
+            JSON or ``application/msgpack``.
         background_tasks (BackgroundTasks): FastAPI background task manager.
         db (Session): Database session.
 
+    The job's estimated cost sets its place in the queue (see
+    SCHEDULER_POLICY) and its memory reservation while it runs.
+
     Returns:
         dict: ID of the newly created job.
+
+    Raises:
+        HTTPException:
+            - 400 if ``previous_job_id`` refers to an unknown job.
+            - 429 with a Retry-After header if the solver queue is full.
     """
+    if request.previous_job_id and db.get(models.OptimizationJob, request.previous_job_id) is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown previous_job_id '{request.previous_job_id}'."
+        )
+
+    # Reject before creating the job so a full queue leaves no orphaned rows
+    queue = JobQueue(db)
+    if queue.is_full():
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Solver queue is full. Retry later.",
+            headers={"Retry-After": str(queue.retry_after())},
+        )
+
     # Generate unique job id
     task_id = f"OPT-{uuid.uuid4()}"
-
-    # Insert a new job record with 'pending' status
-    new_task = models.OptimizationJob(id=task_id, status="pending")
+    estimate = estimate_job_cost(*request.solver_input(), request.solver_mode)
+    queued_at = datetime.now(timezone.utc)
+
+    # Insert a new job record with 'pending' status; the row is the durable queue entry
+    new_task = models.OptimizationJob(
+        id=task_id,
+        status="pending",
+        request_payload=request.model_dump(mode="json"),
+        queued_at=queued_at,
+        priority_at=priority_at(queued_at, estimate.estimated_seconds),
+        estimated_seconds=estimate.estimated_seconds,
+        estimated_memory_mb=estimate.estimated_memory_mb,
+        attempts=0,
+    )
     db.add(new_task)
     db.commit()
     db.refresh(new_task)
 
-    # Launch background process to run optimization
-    background_tasks.add_task(run_optimization_background, request, task_id)
+    # Wake a pooled worker, or claim and run the job here when the pool is disabled
+    if solver_pool is None:
+        background_tasks.add_task(run_claimed_job, task_id, default_worker_id("-api"))
+    else:
+        solver_pool.wake()
 
     return {"job_id": task_id}
 
 
+@optimizer_router.post("/optimize/estimate", response_model=schemas.OptimizationEstimateResponse)
+def estimate_optimization_task(
+    request: Annotated[schemas.AnyOptimizationRequest, Body()],
+    db: Session = Depends(get_db),
+):
+    """
+    Estimate a job's cost and queue wait without creating it (dry run).
+
+    Args:
+        request (schemas.AnyOptimizationRequest): The payload POST /optimize would take.
+        db (Session): Database session.
+
+    Returns:
+        dict: The cost estimate, whether the queue is full, and the waiting
+        jobs (count and estimated solve time per worker) it would queue behind.
+    """
+    estimate = estimate_job_cost(*request.solver_input(), request.solver_mode)
+    queue = JobQueue(db)
+    ahead, ahead_seconds = queue.ahead_of(priority_at(datetime.now(timezone.utc), estimate.estimated_seconds))
+    return {
+        "estimate": estimate,
+        "queue_full": queue.is_full(),
+        "queue_ahead": ahead,
+        "estimated_wait_seconds": round(ahead_seconds / max(1, settings.SOLVER_WORKER_PROCESSES), 1),
+    }
+
+
 @optimizer_router.get("/optimize/{task_id}/status", response_model=schemas.JobStatusResponse)
-def get_optimization_status(task_id: str, db: Session = Depends(get_db)):
+async def get_optimization_status(
+    task_id: str,
+    wait: float = Query(
+        0, ge=0, le=settings.LONG_POLL_MAX_WAIT_SECONDS,
+        description="Seconds to hold the request while the job is pending (long polling)",
+    ),
+    db: AsyncSession = Depends(get_async_db),
+):
     """
     Retrieve the status of an optimization job.
 
+    With ``wait`` > 0 the request is held until the job leaves "pending" or
+    the wait elapses, re-checking every LONG_POLL_INTERVAL_SECONDS. The
+    session's connection is returned to the pool between checks.
+
     Args:
         task_id (str): ID of the optimization job.
-        db (Session): Database session.
+        wait (float): Maximum seconds to wait for a status change.
+        db (AsyncSession): Async database session.
 
     Returns:
-        dict: Job ID and current status.
+        dict: Job ID, current status and, while pending, the solver queue position.
 
     Raises:
         HTTPException: If the job is not found.
     """
-    task = db.get(models.OptimizationJob, task_id)
+    Job = models.OptimizationJob
+    deadline = time.monotonic() + wait
+    while True:
+        # Only the queue columns; the result body is never loaded for a poll
+        task = (await db.execute(
+            select(
+                Job.id, Job.status, Job.claimed_by, Job.priority_at, Job.queued_at, Job.created_at
+            ).where(Job.id == task_id)
+        )).first()
+        if not task:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
+        remaining = deadline - time.monotonic()
+        if task.status != "pending" or remaining <= 0:
+            queue_position = await JobQueue.queue_position_async(db, task)
+            return {"job_id": task.id, "status": task.status, "queue_position": queue_position}
+        await db.rollback()
+        await asyncio.sleep(min(settings.LONG_POLL_INTERVAL_SECONDS, remaining))
+
+
+@optimizer_router.get(
+    "/optimize/{task_id}/result",
+    response_model=schemas.OptimizationResult,
+    responses={
+        200: {"content": {MSGPACK_MEDIA_TYPE: {}}},
+        304: {"description": "Result unchanged since the ETag in If-None-Match"},
+    },
+)
+async def get_optimization_result(
+    task_id: str,
+    if_none_match: Optional[str] = Header(default=None),
+    accept: Optional[str] = Header(default=None),
+    accept_encoding: Optional[str] = Header(default=None),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Retrieve the result of a completed optimization job.
+
+    Serves the pre-serialized body stored when the job finished (from the
+    in-process LRU when hot) with an ETag, gzip-encoded when the client
+    accepts it. Clients preferring ``application/msgpack`` in Accept get
+    the MessagePack body stored alongside, with datetimes as timestamps,
+    under its own ETag. Results stored before bodies were pre-serialized
+    are serialized on first read and backfilled. Serialization and
+    decompression of a body run in a worker thread, keeping the event loop
+    free for other requests.
+
+    Args:
+        task_id (str): ID of the optimization job.
+        if_none_match (str | None): ETag of the client's cached copy.
+        accept (str | None): Media types the client accepts.
+        accept_encoding (str | None): Encodings the client accepts.
+        db (AsyncSession): Async database session.
+
+    Returns:
+        Response: JSON (or MessagePack) body of schemas.OptimizationResult,
+        or 304 if unchanged.
+
+    Raises:
+        HTTPException:
+            - 404 if the job is not found.
+            - 400 if the job is still running or pending.
+    """
+    Job = models.OptimizationJob
+    # Status and ETag only; the result body is loaded on a cache miss
+    row = (await db.execute(select(Job.status, Job.result_etag).where(Job.id == task_id))).first()
+    if not row:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
+
+    # Only allow result retrieval when job is finished
+    if row.status not in ["completed", "failed", "completed_with_no_solution"]:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Task is still in '{row.status}' state. Result not available yet."
+        )
+
+    # Both representations are cached under the JSON ETag, so they go stale together
+    msgpack = prefers_msgpack(accept)
+    media_type = MSGPACK_MEDIA_TYPE if msgpack else "application/json"
+    cache_key = msgpack_cache_key(task_id) if msgpack else task_id
+    body_column = Job.result_msgpack_blob if msgpack else Job.result_blob
+
+    etag = row.result_etag
+    blob = result_cache.get(cache_key, etag) if etag else None
+    if blob is None:
+        if etag is not None:
+            blob = (await db.execute(select(body_column).where(Job.id == task_id))).scalar()
+        if blob is None:
+            # Build and store the response bodies for jobs finished before pre-serialization
+            task = await db.get(Job, task_id)
+            response_data = {**(task.result or {}), "job_id": task.id, "status": task.status}
+            for column, value in (await asyncio.to_thread(serialize_stored_result, response_data)).items():
+                setattr(task, column, value)
+            await db.commit()
+            etag, blob = task.result_etag, getattr(task, body_column.key)
+        result_cache.put(cache_key, etag, blob)
+    if msgpack:
+        etag = msgpack_etag(etag)
+
+    headers = {"ETag": etag, "Vary": "Accept, Accept-Encoding"}
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    if accepts_gzip(accept_encoding):
+        headers["Content-Encoding"] = "gzip"
+        return Response(content=blob, media_type=media_type, headers=headers)
+    # Multi-MB bodies take milliseconds to inflate; keep that off the event loop
+    return Response(content=await asyncio.to_thread(gzip.decompress, blob), media_type=media_type, headers=headers)
+
+
+@optimizer_router.get("/optimize/{task_id}/delta", response_model=schemas.PlanDelta)
+def get_optimization_delta(
+    task_id: str,
+    previous_job_id: Optional[str] = Query(
+        default=None,
+        description="Completed job to diff against; defaults to the repaired job or the request's previous_job_id",
+    ),
+    db: Session = Depends(get_db),
+):
+    """
+    Retrieve only the trips that changed relative to a previous job's plan.
+
+    Trips are matched by ``trip_key`` (vehicle and request set), so applying
+    the delta (insert ``added``, update ``modified``, delete
+    ``removed_trip_keys``) turns the previous plan into this one. Loading
+    and diffing two large plans is CPU-bound, so this is a blocking handler
+    run in the threadpool, like ``/trips`` and ``/repair``.
+
+    Args:
+        task_id (str): ID of the completed optimization job.
+        previous_job_id (str | None): ID of the completed job it replaces.
+        db (Session): Database session.
+
+    Returns:
+        schemas.PlanDelta: Added, modified and removed trips.
+
+    Raises:
+        HTTPException:
+            - 404 if either job is not found.
+            - 400 if no previous job is given or known, or either job is not completed.
+    """
+    Job = models.OptimizationJob
+    columns = (Job.id, Job.status, Job.result, Job.base_job_id, Job.request_payload)
+    task = db.execute(select(*columns).where(Job.id == task_id)).first()
     if not task:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
-    return {"job_id": task.id, "status": task.status}
+    previous_job_id = previous_job_id or task.base_job_id or (task.request_payload or {}).get("previous_job_id")
+    if not previous_job_id:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No previous job to diff against. Pass previous_job_id."
+        )
+    previous = db.execute(select(*columns).where(Job.id == previous_job_id)).first()
+    if not previous:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Previous task not found")
+    # A failed job has no plan; diffing it would read as a full rewrite
+    for job in (task, previous):
+        if job.status != "completed":
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Task {job.id} is in '{job.status}' state. Only completed tasks have a delta."
+            )
 
+    return diff_plans(task.id, previous.id, task.result, previous.result)
 
-@optimizer_router.get("/optimize/{task_id}/result", response_model=schemas.OptimizationResult)
-def get_optimization_result(task_id: str, db: Session = Depends(get_db)):
+
+@optimizer_router.get(
+    "/optimize/{task_id}/trips",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"application/x-ndjson": {}}, "description": "One ScheduledTrip per line"}},
+)
+def stream_optimization_trips(
+    task_id: str,
+    vehicle_id: Optional[List[str]] = Query(default=None, description="Only trips of these vehicles (repeatable)"),
+    start_from: Optional[datetime] = Query(default=None, description="Only trips starting at or after this time"),
+    start_to: Optional[datetime] = Query(default=None, description="Only trips starting before this time"),
+    after: int = Query(default=-1, ge=-1, description="Page cursor: only trips with a greater trip_index"),
+    limit: Optional[int] = Query(default=None, ge=1, description="Maximum number of trips in this page"),
+    db: Session = Depends(get_db),
+):
     """
-    Retrieve the result of a completed optimization job.
+    Stream a finished job's trips as NDJSON, one ScheduledTrip per line.
+
+    Each line adds the trip's ``trip_index`` (its position in the full
+    result). When more trips match than ``limit``, the ``X-Next-After``
+    header holds the cursor for the next page.
 
     Args:
         task_id (str): ID of the optimization job.
+        vehicle_id (list[str] | None): Vehicle filter.
+        start_from (datetime | None): Lower bound on trip start (inclusive).
+        start_to (datetime | None): Upper bound on trip start (exclusive).
+        after (int): Page cursor.
+        limit (int | None): Page size (all matching trips when omitted).
         db (Session): Database session.
 
     Returns:
-        schemas.OptimizationResult: Result data for the completed job.
+        StreamingResponse: NDJSON body.
 
     Raises:
         HTTPException:
             - 404 if the job is not found.
             - 400 if the job is still running or pending.
     """
-    task = db.get(models.OptimizationJob, task_id)
-    if not task:
+    Job = models.OptimizationJob
+    job_status = db.scalar(select(Job.status).where(Job.id == task_id))
+    if job_status is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
-
-    # Only allow result retrieval when job is finished
-    if task.status not in ["completed", "failed", "completed_with_no_solution"]:
+    if job_status == "pending":
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Task is still in '{task.status}' state. Result not available yet."
+            detail=f"Task is still in '{job_status}' state. Trips not available yet."
         )
 
-    # Build and return the response model
-    response_data = task.result or {}
-    response_data["job_id"] = task.id
-    response_data["status"] = task.status
-    return schemas.OptimizationResult(**response_data)
+    trip_stream = TripStream(task_id, vehicle_id, start_from, start_to, after, limit)
+    headers = {}
+    next_after = trip_stream.next_cursor(db)
+    if next_after is not None:
+        headers["X-Next-After"] = str(next_after)
+    # The stream reads with its own session, independent of the request's
+    return StreamingResponse(trip_stream.iter_lines(), media_type="application/x-ndjson", headers=headers)
 
 
-# -----------------------------------------------------------------------------
-# Background Task
-# -----------------------------------------------------------------------------
-def run_optimization_background(request: schemas.OptimizationRequest, task_id: str):
+@optimizer_router.post("/optimize/{task_id}/repair", response_model=schemas.RepairResponse)
+def repair_optimization_result(
+    task_id: str,
+    repair_request: schemas.RepairRequest,
+    db: Session = Depends(get_db)
+):
     """
-    Execute the optimization workflow in a background task.
+    Locally repair a completed job's plan after cancellations or breakdowns.
 
-    Steps:
-        1. Clear previous temporary data.
-        2. Load incoming request data into the database.
-        3. Run the optimization solver.
-        4. Save and commit results back to the job record.
+    Removes the given requests and vehicles, re-inserts orphaned requests into
+    the remaining vehicles, and stores the repaired plan as a new job.
 
     Args:
-        request (schemas.OptimizationRequest): Input data for optimization.
-        task_id (str): ID of the job being processed.
+        task_id (str): ID of the completed job to repair.
+        repair_request (schemas.RepairRequest): Requests and vehicles to remove.
+        db (Session): Database session.
+
+    Returns:
+        schemas.RepairResponse: New job ID and the trips that changed.
+
+    Raises:
+        HTTPException:
+            - 404 if the job is not found.
+            - 400 if the job is not completed or the repair references unknown IDs.
+            - 409 if the job predates stored request payloads.
     """
-    db = SessionLocal()
-    try:
-        task = db.get(models.OptimizationJob, task_id)
-        if not task:
-            print(f"[{task_id}] Task not found in database.")
-            return
-
-        print(f"[{task_id}] Starting background optimization workflow...")
-
-        # Clear any old temp data from previous runs
-        dm = DataManager(db)
-        dm.clear_table("Trip")
-        dm.clear_table("BookingRequest")
-        dm.clear_table("Vehicle")
-        dm.clear_table("Location")
-
-        # Load new request data into tables
-        print(f"[{task_id}] Loading request data into DB...")
-        dm.load_and_save_payload(request.model_dump(mode="json"))
-
-        # Run the optimization solver (with graceful fallback)
-        print(f"[{task_id}] Running optimization solver...")
-        optimizer = OptimizationService(db)
-        try:
-            result = optimizer.run_optimization(task_id, request)
-        except Exception as solver_err:
-            # Graceful fallback: mark all as unassigned instead of failing the job
-            print(f"[{task_id}] Solver error, returning fallback result: {solver_err}")
-            all_req_ids = [r.id for r in request.requests]
-            result = schemas.OptimizationResult(
-                job_id=task_id,
-                status="completed",
-                message="Fallback result: all requests unassigned due to solver error.",
-                scheduled_trips=[],
-                unassigned_requests=all_req_ids,
-            )
+    task = db.get(models.OptimizationJob, task_id)
+    if not task:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
+    if task.status != "completed":
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Task is in '{task.status}' state. Only completed tasks can be repaired."
+        )
+    if not task.request_payload:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Task has no stored request payload and cannot be repaired."
+        )
 
-        # Update task with results
-        task.status = result.status
-        task.result = result.model_dump(mode="json")
-        db.commit()
-        print(f"[{task_id}] Optimization completed and committed.")
-
-    except Exception as e:
-        # Capture and store any failure details
-        print(f"[{task_id}] Optimization failed: {e}")
-        task = db.get(models.OptimizationJob, task_id)
-        if task:
-            task.status = "failed"
-            task.result = {"message": str(e)}
-            db.commit()
-    finally:
-        db.close()
+    try:
+        return RepairService(db).repair(task, repair_request, f"OPT-{uuid.uuid4()}")
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
@@ -9,9 +9,6 @@ from typing import List, Tuple, Dict, Any
 import time
 from math import radians, cos, sin, asin, sqrt
 
-# Third-party imports
-import requests
-
 # Local application imports
 from app.core.config import settings
 """Note: This client now returns time values in SECONDS.
@@ -70,7 +67,9 @@ class DistanceMatrixClient:
             "units": settings.GOOGLE_MAPS_UNITS,
         }
 
-        # Perform request
+        # Perform request (requests is imported lazily; fallback-only runs never need it)
+        import requests
+
         response = requests.get(url, params=params)
         response.raise_for_status()
         return response.json()
@@ -0,0 +1,119 @@
+"""
+app/clients/webhook_client.py
+
+Client for delivering signed job-completion webhooks.
+
+Each delivery is a JSON POST signed with HMAC-SHA256 over
+``"{timestamp}.{body}"``:
+
+    X-Optimizer-Timestamp: 1724140800
+    X-Optimizer-Signature: sha256=<hex digest>
+
+Receivers recompute the digest with the shared secret (WEBHOOK_SECRET, or
+API_KEY when unset) and should reject stale timestamps.
+"""
+
+# Standard library imports
+import hashlib
+import hmac
+import json
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, Optional
+
+# Local application imports
+from app.core.config import settings
+
+
+def sign_payload(body: bytes, timestamp: str, secret: Optional[str] = None) -> str:
+    """
+    Compute the signature header value for a webhook body.
+
+    Args:
+        body (bytes): Exact request body.
+        timestamp (str): Value of the X-Optimizer-Timestamp header.
+        secret (str | None): Shared secret (defaults to WEBHOOK_SECRET or API_KEY).
+
+    Returns:
+        str: ``"sha256=<hex digest>"``.
+    """
+    key = (secret or settings.WEBHOOK_SECRET or settings.API_KEY).encode("utf-8")
+    digest = hmac.new(key, timestamp.encode("utf-8") + b"." + body, hashlib.sha256).hexdigest()
+    return f"sha256={digest}"
+
+
+class WebhookClient:
+    """
+    Delivers webhooks in the background with exponential-backoff retries.
+
+    Network errors, 5xx, 408 and 429 responses are retried up to
+    WEBHOOK_MAX_ATTEMPTS times; other 4xx responses are final.
+    """
+
+    def __init__(self):
+        """Initialize the client with a small delivery thread pool."""
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="webhook")
+
+    def send(self, url: str, payload: Dict[str, Any]) -> Future:
+        """
+        Queue a delivery without blocking the caller.
+
+        Args:
+            url (str): Receiver URL.
+            payload (dict): JSON-serializable event body.
+
+        Returns:
+            Future: Resolves to True once delivered, False if all attempts failed.
+        """
+        return self._executor.submit(self.deliver, url, payload)
+
+    def deliver(self, url: str, payload: Dict[str, Any]) -> bool:
+        """
+        Deliver a webhook synchronously, retrying transient failures.
+
+        Args:
+            url (str): Receiver URL.
+            payload (dict): JSON-serializable event body.
+
+        Returns:
+            bool: True if the receiver answered 2xx.
+        """
+        # Imported lazily; only workers that deliver webhooks need requests
+        import requests
+
+        body = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+        delay = settings.WEBHOOK_BACKOFF_SECONDS
+        for attempt in range(1, settings.WEBHOOK_MAX_ATTEMPTS + 1):
+            # Timestamp and signature are refreshed per attempt
+            timestamp = str(int(time.time()))
+            headers = {
+                "Content-Type": "application/json",
+                "X-Optimizer-Event": payload.get("event", ""),
+                "X-Optimizer-Timestamp": timestamp,
+                "X-Optimizer-Signature": sign_payload(body, timestamp),
+                "X-Optimizer-Delivery-Attempt": str(attempt),
+            }
+            try:
+                response = requests.post(url, data=body, headers=headers, timeout=settings.WEBHOOK_TIMEOUT_SECONDS)
+                if 200 <= response.status_code < 300:
+                    print(f"[WEBHOOK] Delivered {payload.get('event')} for {payload.get('job_id')} (attempt {attempt}).")
+                    return True
+                retryable = response.status_code >= 500 or response.status_code in (408, 429)
+                error = f"HTTP {response.status_code}"
+            except requests.RequestException as e:
+                retryable, error = True, str(e)
+
+            print(f"[WEBHOOK] Attempt {attempt} to {url} failed: {error}")
+            if not retryable or attempt == settings.WEBHOOK_MAX_ATTEMPTS:
+                break
+            time.sleep(delay)
+            delay *= 2
+
+        print(f"[WEBHOOK] Giving up on {payload.get('event')} for {payload.get('job_id')}.")
+        return False
+
+
+# -----------------------------------------------------------------------------
+# Global client instance
+# -----------------------------------------------------------------------------
+webhook_client = WebhookClient()
@@ -50,6 +50,26 @@ class Settings(BaseSettings):
     # Local API database for storing temporary data
     DATABASE_URL: str = "sqlite:///./optimizer_local.db"
 
+    # -------------------------------------------------------------------------
+    # Database Engine Settings
+    # -------------------------------------------------------------------------
+    # SQLite: WAL lets status polls read while a worker writes
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    # SQLite: NORMAL is durable in WAL mode except for the last commits on power loss
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    # SQLite: how long a writer waits for a lock before "database is locked" (ms)
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    # SQLite: bytes of the database file memory-mapped for reads
+    SQLITE_MMAP_SIZE_BYTES: int = 268_435_456
+    # SQLite: free-page handling of new database files (INCREMENTAL lets workers reclaim space in steps)
+    SQLITE_AUTO_VACUUM: str = "INCREMENTAL"
+
+    # Server databases (e.g. PostgreSQL): connection pool per process
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT_SECONDS: int = 30
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+
     # -------------------------------------------------------------------------
     # Google Maps API Settings
     # -------------------------------------------------------------------------
@@ -83,11 +103,133 @@ class Settings(BaseSettings):
 
     # Maximum waiting time at a stop (in minutes)
     SOLVER_MAX_WAITING_TIME_MINUTES: int = 720
+    # Boarding/alighting time at a stop when a request does not give one (in minutes)
+    SOLVER_DEFAULT_SERVICE_MINUTES: float = 0
     # Maximum route duration for any single vehicle (in minutes)
     SOLVER_MAX_VEHICLE_TIME_MINUTES: int = 720
+    # UTC offset of the operating region (in hours); vehicle unavailability
+    # dates are local days (Asia/Ho_Chi_Minh by default)
+    SOLVER_LOCAL_UTC_OFFSET_HOURS: float = 7
     # Penalty cost for leaving a request unassigned (pickup/drop both dropped)
     SOLVER_UNASSIGNED_PENALTY: int = 1_000_000
 
+    # Stop the OR-Tools search once a solution is within this relative gap of
+    # the instance lower bound, e.g. 0.05 for 5% (0 disables)
+    SOLVER_GAP_STOP_THRESHOLD: float = 0
+
+    # Solver used when a request does not choose one ("ortools" or "heuristic")
+    SOLVER_DEFAULT_MODE: str = "ortools"
+    # Seed OR-Tools with the heuristic plan instead of its first-solution strategy
+    SOLVER_HEURISTIC_WARM_START: bool = False
+    # Number of deadline-sorted requests placed together by regret insertion
+    HEURISTIC_REGRET_WINDOW: int = 25
+    # Run a tiny solve at startup so the first real job skips one-time initialization
+    SOLVER_WARMUP_ENABLED: bool = True
+
+    # Multi-day payloads: one model ("single"), consecutive windows ("rolling"),
+    # or "auto" (rolling once dropoffs span more than a window plus its overlap)
+    SOLVER_HORIZON_MODE: str = "auto"
+    # Span of dropoff times committed per rolling-horizon window (in hours)
+    SOLVER_HORIZON_WINDOW_HOURS: int = 24
+    # Look-ahead solved with each window but committed by a later one (in hours)
+    SOLVER_HORIZON_OVERLAP_HOURS: int = 6
+
+    # -------------------------------------------------------------------------
+    # Solver Worker Pool Settings
+    # -------------------------------------------------------------------------
+    # Number of solver worker processes (0 runs solves in the API process)
+    SOLVER_WORKER_PROCESSES: int = 2
+    # Maximum number of jobs waiting for a worker before POST /optimize returns 429
+    SOLVER_QUEUE_MAXSIZE: int = 20
+    # Estimated solver memory allowed across running jobs (in MB); a job that does
+    # not fit waits for running jobs to finish, and a larger one runs alone (0 disables)
+    SOLVER_MEMORY_BUDGET_MB: int = 2048
+
+    # Claim order: "sjf" runs cheaper jobs first (with aging), "fifo" runs in arrival order
+    SCHEDULER_POLICY: str = "sjf"
+    # Seconds a job is pushed back in the queue per second of estimated solve time
+    SCHEDULER_COST_WEIGHT: float = 1.0
+    # Longest a job can be pushed back (in seconds), so later jobs never starve it
+    SCHEDULER_MAX_DELAY_SECONDS: int = 600
+
+    # Seconds a claimed job stays leased without a heartbeat before it is re-queued
+    JOB_LEASE_SECONDS: int = 120
+    # Seconds between lease renewals while a job is being solved
+    JOB_HEARTBEAT_SECONDS: int = 15
+    # Claims per job before it is marked failed (covers crashed or killed workers)
+    JOB_MAX_ATTEMPTS: int = 3
+    # Seconds an idle worker waits before polling the queue again
+    JOB_POLL_INTERVAL_SECONDS: float = 1.0
+
+    # "staged" writes staging rows before solving; "direct" solves straight from the
+    # request and stores only the result on the critical path
+    PIPELINE_MODE: str = "staged"
+    # In direct mode, write staging rows and trips in the background after the result
+    PIPELINE_PERSIST_ARTIFACTS: bool = True
+
+    # Hours a finished job's staging rows (locations, vehicles, requests, trips) are kept
+    STAGING_TTL_HOURS: int = 24
+    # Seconds between staging purges run by each worker
+    STAGING_PURGE_INTERVAL_SECONDS: int = 300
+
+    # -------------------------------------------------------------------------
+    # Retention Settings
+    # -------------------------------------------------------------------------
+    # Finished jobs are removed once older than this many days (0 = no age limit)
+    JOB_RETENTION_DAYS: int = 0
+    # ...or once this many newer jobs exist (0 = no count limit). Both 0 (the
+    # default) keeps every job, as before retention existed
+    JOB_RETENTION_MAX_JOBS: int = 0
+    # Removed jobs are archived here as gzip-compressed JSON lines ("" = delete only)
+    JOB_ARCHIVE_DIR: str = "archive"
+    # Jobs removed per transaction, keeping write locks short
+    RETENTION_BATCH_SIZE: int = 200
+    # Seconds between retention passes run by each worker
+    RETENTION_INTERVAL_SECONDS: int = 3600
+    # SQLite: free pages returned to the OS per retention pass (incremental vacuum)
+    VACUUM_INCREMENTAL_PAGES: int = 2000
+
+    # -------------------------------------------------------------------------
+    # Result Serving Settings
+    # -------------------------------------------------------------------------
+    # gzip level for stored result bodies (1 = fastest, 9 = smallest)
+    RESULT_GZIP_LEVEL: int = 6
+    # In-process LRU of compressed results served by GET /optimize/{id}/result
+    RESULT_CACHE_MAX_ENTRIES: int = 128
+    RESULT_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+
+    # Rows fetched per round trip when streaming trips as NDJSON
+    TRIP_STREAM_BATCH_SIZE: int = 500
+
+    # -------------------------------------------------------------------------
+    # Completion Notification Settings
+    # -------------------------------------------------------------------------
+    # HMAC secret for webhook signatures (falls back to API_KEY when empty)
+    WEBHOOK_SECRET: str = ""
+    # Delivery attempts per webhook, first retry delay (doubles each time) and timeout
+    WEBHOOK_MAX_ATTEMPTS: int = 5
+    WEBHOOK_BACKOFF_SECONDS: float = 1.0
+    WEBHOOK_TIMEOUT_SECONDS: float = 5.0
+    # Longest ?wait= accepted by the status endpoint, and how often it re-checks
+    LONG_POLL_MAX_WAIT_SECONDS: int = 60
+    LONG_POLL_INTERVAL_SECONDS: float = 1.0
+
+    # -------------------------------------------------------------------------
+    # Local Repair Settings
+    # -------------------------------------------------------------------------
+    # Default time budget for re-inserting orphaned requests (in seconds)
+    REPAIR_TIME_LIMIT_SECONDS: float = 2.0
+
+    # -------------------------------------------------------------------------
+    # Instance Capture Settings
+    # -------------------------------------------------------------------------
+    # Save each job's solver input for offline replay: "off", "slow" (solves
+    # taking longer than CAPTURE_SLOW_SECONDS) or "always"
+    CAPTURE_MODE: str = "off"
+    CAPTURE_SLOW_SECONDS: float = 60.0
+    # One gzip-compressed MessagePack file per captured job
+    CAPTURE_DIR: str = "captures"
+
     # -------------------------------------------------------------------------
     # Pydantic model configuration
     # -------------------------------------------------------------------------
@@ -2,16 +2,29 @@
 app/db/models.py
 
 SQLAlchemy ORM models for database tables used in the optimization service.
+
+Staging tables (locations, vehicles, booking_requests, trips, trip_requests,
+trip_stops) are scoped by
+``job_id``: business IDs are unique per job, so concurrent jobs never collide
+and a job's rows are removed with one indexed delete per table.
 """
 
 # Third-party imports
-from sqlalchemy import Column, Integer, String, Text, JSON, DateTime, ForeignKey
+from sqlalchemy import (
+    Column, Integer, Float, String, Text, JSON, DateTime, ForeignKey, LargeBinary,
+    ForeignKeyConstraint, Index, UniqueConstraint,
+)
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.sql import func
 
 # Local application imports
 from .session import Base
 
 
+# JSON columns are stored as JSONB on PostgreSQL (binary, indexable)
+JSONType = JSON().with_variant(JSONB(), "postgresql")
+
+
 # -----------------------------------------------------------------------------
 # Vehicle Model
 # -----------------------------------------------------------------------------
@@ -20,18 +33,26 @@ class Vehicle(Base):
     Represents a vehicle used for optimization.
 
     Attributes:
+        job_id (str): Optimization job the row was staged for.
         vehicle_id (str): Business identifier (e.g., "VEH-001").
         capacity (int): Capacity of the vehicle.
-        base_location_id (str): Reference to the base location.
+        base_location_id (str): Reference to the base location (same job).
         unavailable_dates (list): Optional list of unavailable date strings.
     """
     __tablename__ = "vehicles"
+    __table_args__ = (
+        UniqueConstraint("job_id", "vehicle_id", name="uq_vehicles_job_vehicle"),
+        ForeignKeyConstraint(
+            ["job_id", "base_location_id"], ["locations.job_id", "locations.location_id"]
+        ),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    vehicle_id = Column(String, unique=True, nullable=False, index=True)
+    job_id = Column(String, ForeignKey("optimization_jobs.id"), nullable=False, index=True)
+    vehicle_id = Column(String, nullable=False)
     capacity = Column(Integer, nullable=False)
-    base_location_id = Column(String, ForeignKey("locations.location_id"), nullable=False)
-    unavailable_dates = Column(JSON, nullable=True)
+    base_location_id = Column(String, nullable=False)
+    unavailable_dates = Column(JSONType, nullable=True)
 
 
 # -----------------------------------------------------------------------------
@@ -42,14 +63,19 @@ class Location(Base):
     Represents a geographical location with latitude and longitude.
 
     Attributes:
+        job_id (str): Optimization job the row was staged for.
         location_id (str): Business identifier (e.g., "LOC-001").
         latitude (str): Latitude coordinate.
         longitude (str): Longitude coordinate.
     """
     __tablename__ = "locations"
+    __table_args__ = (
+        UniqueConstraint("job_id", "location_id", name="uq_locations_job_location"),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    location_id = Column(String, unique=True, nullable=False, index=True)
+    job_id = Column(String, ForeignKey("optimization_jobs.id"), nullable=False, index=True)
+    location_id = Column(String, nullable=False)
     latitude = Column(String, nullable=False)
     longitude = Column(String, nullable=False)
 
@@ -62,48 +88,132 @@ class BookingRequest(Base):
     Represents a booking request for optimization.
 
     Attributes:
+        job_id (str): Optimization job the row was staged for.
         request_id (str): Business identifier (e.g., "REQ-001").
-        pickup_location_id (str): Pickup location reference.
-        dropoff_location_id (str): Dropoff location reference.
+        pickup_location_id (str): Pickup location reference (same job).
+        dropoff_location_id (str): Dropoff location reference (same job).
         dropoff_time (datetime): Time by which dropoff must occur.
         capacity_demand (int): Required capacity for this request.
     """
     __tablename__ = "booking_requests"
+    __table_args__ = (
+        UniqueConstraint("job_id", "request_id", name="uq_booking_requests_job_request"),
+        ForeignKeyConstraint(
+            ["job_id", "pickup_location_id"], ["locations.job_id", "locations.location_id"]
+        ),
+        ForeignKeyConstraint(
+            ["job_id", "dropoff_location_id"], ["locations.job_id", "locations.location_id"]
+        ),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    request_id = Column(String, unique=True, nullable=False, index=True)
-    pickup_location_id = Column(String, ForeignKey("locations.location_id"), nullable=False)
-    dropoff_location_id = Column(String, ForeignKey("locations.location_id"), nullable=False)
+    job_id = Column(String, ForeignKey("optimization_jobs.id"), nullable=False, index=True)
+    request_id = Column(String, nullable=False)
+    pickup_location_id = Column(String, nullable=False)
+    dropoff_location_id = Column(String, nullable=False)
     dropoff_time = Column(DateTime(timezone=True), nullable=False)
     capacity_demand = Column(Integer, nullable=False)
 
 
 # -----------------------------------------------------------------------------
-# Trip Model
+# Trip Models
 # -----------------------------------------------------------------------------
 class Trip(Base):
     """
-    Represents a trip assignment.
+    Represents one scheduled trip (a vehicle route) of a job's result.
+
+    Requests and stops live in ``trip_requests`` and ``trip_stops``, so a
+    shared ride is stored once however many requests it combines.
 
     Attributes:
-        vehicle_id (str): Assigned vehicle ID.
-        booking_request_id (str): Assigned booking request ID.
+        job_id (str): Optimization job that produced the trip.
+        trip_index (int): Position of the trip in the job's result.
+        vehicle_id (str): Assigned vehicle ID (same job).
         trip_start_time (datetime): Trip start timestamp.
         trip_end_time (datetime): Trip end timestamp.
         total_distance (int): Total distance in meters.
         total_duration (int): Total duration in minutes.
-        trip_stop_sequence (list): Ordered sequence of stop location IDs.
     """
     __tablename__ = "trips"
+    __table_args__ = (
+        UniqueConstraint("job_id", "trip_index", name="uq_trips_job_trip_index"),
+        ForeignKeyConstraint(
+            ["job_id", "vehicle_id"], ["vehicles.job_id", "vehicles.vehicle_id"]
+        ),
+        Index("ix_trips_job_vehicle", "job_id", "vehicle_id"),
+        Index("ix_trips_job_start_time", "job_id", "trip_start_time"),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    vehicle_id = Column(String, ForeignKey("vehicles.vehicle_id"), nullable=False, index=True)
-    booking_request_id = Column(String, ForeignKey("booking_requests.request_id"), nullable=False, index=True)
+    job_id = Column(String, ForeignKey("optimization_jobs.id"), nullable=False, index=True)
+    trip_index = Column(Integer, nullable=False)
+    vehicle_id = Column(String, nullable=False)
     trip_start_time = Column(DateTime(timezone=True), nullable=False)
     trip_end_time = Column(DateTime(timezone=True), nullable=False)
     total_distance = Column(Integer, nullable=False)
     total_duration = Column(Integer, nullable=False)
-    trip_stop_sequence = Column(JSON, nullable=False)
+
+
+class TripRequest(Base):
+    """
+    Associates a booking request with the trip that serves it.
+
+    Attributes:
+        job_id (str): Optimization job that produced the trip.
+        trip_index (int): Trip serving the request (same job).
+        request_id (str): Served booking request ID (same job).
+    """
+    __tablename__ = "trip_requests"
+    __table_args__ = (
+        UniqueConstraint("job_id", "request_id", name="uq_trip_requests_job_request"),
+        ForeignKeyConstraint(
+            ["job_id", "trip_index"], ["trips.job_id", "trips.trip_index"]
+        ),
+        ForeignKeyConstraint(
+            ["job_id", "request_id"], ["booking_requests.job_id", "booking_requests.request_id"]
+        ),
+        Index("ix_trip_requests_job_trip_index", "job_id", "trip_index"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    job_id = Column(String, ForeignKey("optimization_jobs.id"), nullable=False, index=True)
+    trip_index = Column(Integer, nullable=False)
+    request_id = Column(String, nullable=False)
+
+
+class TripStop(Base):
+    """
+    One stop of a trip, in visiting order.
+
+    Attributes:
+        job_id (str): Optimization job that produced the trip.
+        trip_index (int): Trip the stop belongs to (same job).
+        sequence (int): Position of the stop within the trip.
+        location_id (str): Stop location ID ("DEPOT" for start and end).
+        latitude (float): Latitude coordinate.
+        longitude (float): Longitude coordinate.
+        estimated_arrival_time (datetime): Planned service start at the stop.
+        stop_type (str): "start", "pickup", "dropoff" or "end".
+        request_id (str): Request picked up or dropped off (pickup/dropoff only).
+    """
+    __tablename__ = "trip_stops"
+    __table_args__ = (
+        ForeignKeyConstraint(
+            ["job_id", "trip_index"], ["trips.job_id", "trips.trip_index"]
+        ),
+        Index("ix_trip_stops_job_trip_sequence", "job_id", "trip_index", "sequence"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    job_id = Column(String, ForeignKey("optimization_jobs.id"), nullable=False, index=True)
+    trip_index = Column(Integer, nullable=False)
+    sequence = Column(Integer, nullable=False)
+    location_id = Column(String, nullable=False)
+    latitude = Column(Float, nullable=False)
+    longitude = Column(Float, nullable=False)
+    estimated_arrival_time = Column(DateTime(timezone=True), nullable=False)
+    stop_type = Column(String, nullable=False)
+    request_id = Column(String, nullable=True)
 
 
 # -----------------------------------------------------------------------------
@@ -117,6 +227,20 @@ class OptimizationJob(Base):
         id (str): Unique job identifier.
         status (str): Current status (e.g., "pending", "completed", "failed").
         result (dict): JSON-serialized optimization result.
+        result_blob (bytes): gzip-compressed response body of the final result.
+        result_etag (str): Content hash of the response body, served as its ETag.
+        result_msgpack_blob (bytes): gzip-compressed MessagePack body of the final result.
+        request_payload (dict): JSON-serialized input the job was run with.
+        base_job_id (str): Job this one was derived from (local repairs only).
+        queued_at (datetime): When the job entered the solver queue.
+        priority_at (datetime): Claim-order key: ``queued_at`` pushed back by the
+            job's estimated cost under SCHEDULER_POLICY="sjf".
+        estimated_seconds (float): Estimated solve time at submission.
+        estimated_memory_mb (int): Estimated peak solver memory at submission.
+        claimed_by (str): Worker currently holding the job's lease, if any.
+        lease_expires_at (datetime): When the claim lapses unless renewed by a heartbeat.
+        heartbeat_at (datetime): Last heartbeat from the claiming worker.
+        attempts (int): Number of times the job has been claimed.
         created_at (datetime): Timestamp when job was created.
         updated_at (datetime): Timestamp when job was last updated.
     """
@@ -124,6 +248,19 @@ class OptimizationJob(Base):
 
     id = Column(String, primary_key=True, index=True)
     status = Column(String, nullable=False, default="pending", index=True)
-    result = Column(JSON, nullable=True)
+    result = Column(JSONType, nullable=True)
+    result_blob = Column(LargeBinary, nullable=True)
+    result_etag = Column(String, nullable=True)
+    result_msgpack_blob = Column(LargeBinary, nullable=True)
+    request_payload = Column(JSONType, nullable=True)
+    base_job_id = Column(String, nullable=True)
+    queued_at = Column(DateTime(timezone=True), nullable=True, index=True)
+    priority_at = Column(DateTime(timezone=True), nullable=True, index=True)
+    estimated_seconds = Column(Float, nullable=True)
+    estimated_memory_mb = Column(Integer, nullable=True)
+    claimed_by = Column(String, nullable=True, index=True)
+    lease_expires_at = Column(DateTime(timezone=True), nullable=True)
+    heartbeat_at = Column(DateTime(timezone=True), nullable=True)
+    attempts = Column(Integer, nullable=True, default=0)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
@@ -2,7 +2,7 @@
 app/dependencies.py
 
 FastAPI dependency functions:
-- Provides a database session per request.
+- Provides a database session (blocking or asyncio) per request.
 - Validates incoming API keys for protected routes.
 """
 
@@ -12,7 +12,7 @@ from fastapi.security import APIKeyHeader
 
 # Local application imports
 from app.core.config import settings
-from app.db.session import SessionLocal
+from app.db.session import AsyncSessionLocal, SessionLocal
 
 
 # -----------------------------------------------------------------------------
@@ -41,6 +41,19 @@ def get_db():
         db.close()
 
 
+async def get_async_db():
+    """
+    Provide an asyncio database session for a request.
+
+    Used by ``async def`` read routes, which must never block the event loop.
+
+    Yields:
+        AsyncSession: SQLAlchemy async session instance.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
 # -----------------------------------------------------------------------------
 # API Key Dependency
 # -----------------------------------------------------------------------------
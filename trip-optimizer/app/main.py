@@ -14,8 +14,12 @@ Author: Phan Nhat Minh - WAO Team - RMIT University Vietnam
 """
 
 # Standard Library Imports
+import asyncio
+import time
 from contextlib import asynccontextmanager
 
+_IMPORT_STARTED = time.perf_counter()
+
 # Third-Party Imports
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles  # Optional: only if you serve static assets
@@ -24,6 +28,11 @@ from fastapi.staticfiles import StaticFiles  # Optional: only if you serve stati
 from app.api.routes import public_router, optimizer_router
 from app.core.config import settings
 from app.db.session import create_db_and_tables
+from app.utils.startup_utils import startup_monitor
+from app.workers.solver_pool import solver_pool
+
+# Import cost of the app itself; OR-Tools and friends load lazily on the solve path
+startup_monitor.app_import_ms = round((time.perf_counter() - _IMPORT_STARTED) * 1000, 1)
 
 
 # Lifespan Event Handler
@@ -33,8 +42,10 @@ async def lifespan(app: FastAPI):
     Application lifespan context manager.
 
     Called once on startup and once on shutdown.
-    - On startup: Ensures database and tables are created before handling requests.
-    - On shutdown: Allows cleanup logic if necessary (e.g., closing DB connections).
+    - On startup: Ensures database and tables are created before handling requests,
+      then starts the solver worker pool and the solver warmup that gates
+      GET /ready (in each worker, or in this process without a pool).
+    - On shutdown: Waits for running solves before the worker pool exits.
 
     Args:
         app (FastAPI): The FastAPI application instance.
@@ -43,9 +54,19 @@ async def lifespan(app: FastAPI):
         None
     """
     print("Application starting up...")
+    print(f"[STARTUP] app.main imported in {startup_monitor.app_import_ms} ms")
     create_db_and_tables()
+    if solver_pool is not None:
+        # Jobs solve in the workers, so they warm up there rather than here
+        solver_pool.start(warmup=settings.SOLVER_WARMUP_ENABLED)
+        startup_monitor.start(settings.SOLVER_WARMUP_ENABLED, solver_pool.warmup_reports())
+    else:
+        startup_monitor.start(settings.SOLVER_WARMUP_ENABLED)
     yield
     print("Application shutting down...")
+    if solver_pool is not None:
+        # Joining the workers blocks; keep the event loop responsive meanwhile
+        await asyncio.to_thread(solver_pool.shutdown)
 
 
 # FastAPI Application Instance
@@ -5,11 +5,13 @@ Pydantic models (schemas) for request and response validation in the API.
 """
 
 # Standard library imports
-from datetime import datetime, date as date_type
-from typing import List, Optional
+import hashlib
+from datetime import datetime, date as date_type, timezone
+from typing import Any, Dict, List, Literal, Optional, Tuple, Union
 
 # Third-party imports
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Discriminator, Field, HttpUrl, Tag, TypeAdapter, computed_field, model_validator
+from typing_extensions import Annotated
 
 
 # -----------------------------------------------------------------------------
@@ -56,6 +58,23 @@ class Vehicle(BaseModel):
 # -----------------------------------------------------------------------------
 # Booking Request Schema
 # -----------------------------------------------------------------------------
+def _as_utc(value: datetime) -> datetime:
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+
+def _check_pickup_window(
+    request_id: str,
+    earliest: Optional[datetime],
+    latest: Optional[datetime],
+    dropoff_time: datetime,
+) -> None:
+    """Reject pickup windows that are empty or open after the dropoff deadline."""
+    if earliest is not None and latest is not None and _as_utc(earliest) > _as_utc(latest):
+        raise ValueError(f"Request {request_id}: earliest_pickup is after latest_pickup")
+    if earliest is not None and _as_utc(earliest) > _as_utc(dropoff_time):
+        raise ValueError(f"Request {request_id}: earliest_pickup is after dropoff_time")
+
+
 class BookingRequest(BaseModel):
     """Represents a request that needs to be fulfilled by a vehicle trip."""
     id: str = Field(..., json_schema_extra={"example": "REQ-1"})
@@ -63,6 +82,27 @@ class BookingRequest(BaseModel):
     dropoff_location: Location
     dropoff_time: datetime = Field(..., json_schema_extra={"example": "2025-08-20T09:00:00Z"})
     capacity_demand: int = Field(..., json_schema_extra={"example": 4})
+    earliest_pickup: Optional[datetime] = Field(
+        default=None,
+        json_schema_extra={"example": "2025-08-20T07:30:00Z", "description": "Pickup starts no earlier"}
+    )
+    latest_pickup: Optional[datetime] = Field(
+        default=None,
+        json_schema_extra={"example": "2025-08-20T08:00:00Z", "description": "Pickup starts no later"}
+    )
+    pickup_service_minutes: Optional[float] = Field(
+        default=None, ge=0,
+        json_schema_extra={"example": 2, "description": "Boarding time; defaults to SOLVER_DEFAULT_SERVICE_MINUTES"}
+    )
+    dropoff_service_minutes: Optional[float] = Field(
+        default=None, ge=0,
+        json_schema_extra={"example": 1, "description": "Alighting time; defaults to SOLVER_DEFAULT_SERVICE_MINUTES"}
+    )
+
+    @model_validator(mode="after")
+    def _check_times(self) -> "BookingRequest":
+        _check_pickup_window(self.id, self.earliest_pickup, self.latest_pickup, self.dropoff_time)
+        return self
 
 
 # -----------------------------------------------------------------------------
@@ -72,6 +112,310 @@ class OptimizationRequest(BaseModel):
     """Encapsulates all data required to run an optimization."""
     vehicles: List[Vehicle]
     requests: List[BookingRequest]
+    solver_mode: Optional[Literal["ortools", "heuristic"]] = Field(
+        default=None,
+        json_schema_extra={
+            "example": "heuristic",
+            "description": "Solver engine; defaults to SOLVER_DEFAULT_MODE"
+        }
+    )
+    callback_url: Optional[HttpUrl] = Field(
+        default=None,
+        json_schema_extra={
+            "example": "https://booking.example.com/hooks/optimizer",
+            "description": "Receives a signed POST when the job completes or fails"
+        }
+    )
+    previous_job_id: Optional[str] = Field(
+        default=None,
+        json_schema_extra={
+            "example": "OPT-1234",
+            "description": "Plan this job re-optimizes; GET /optimize/{id}/delta diffs against it"
+        }
+    )
+
+    def request_ids(self) -> List[str]:
+        """IDs of all booking requests, in input order."""
+        return [r.id for r in self.requests]
+
+    def solver_input(self) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Vehicles and requests as the plain dictionaries the solvers consume."""
+        return (
+            [v.model_dump(mode="json") for v in self.vehicles],
+            [r.model_dump(mode="json") for r in self.requests],
+        )
+
+
+# -----------------------------------------------------------------------------
+# Compact (Columnar) Optimization Request Schema
+# -----------------------------------------------------------------------------
+class CompactLocations(BaseModel):
+    """Location table; other columns refer to locations by position."""
+    id: List[str] = Field(..., json_schema_extra={"example": ["PLANT-A", "STOP-1"]})
+    latitude: List[float] = Field(..., json_schema_extra={"example": [10.7769, 10.8231]})
+    longitude: List[float] = Field(..., json_schema_extra={"example": [106.7009, 106.6297]})
+
+
+class CompactVehicles(BaseModel):
+    """Vehicle columns; ``base_location`` holds location indexes (null for the depot)."""
+    id: List[str] = Field(..., json_schema_extra={"example": ["VEH-1", "VEH-2"]})
+    capacity: List[int] = Field(..., json_schema_extra={"example": [7, 16]})
+    base_location: Optional[List[Optional[int]]] = None
+    unavailability: Optional[List[List[VehicleUnavailability]]] = None
+
+
+class CompactRequests(BaseModel):
+    """Booking request columns; ``pickup`` and ``dropoff`` hold location indexes."""
+    id: List[str] = Field(..., json_schema_extra={"example": ["REQ-1"]})
+    pickup: List[int] = Field(..., json_schema_extra={"example": [1]})
+    dropoff: List[int] = Field(..., json_schema_extra={"example": [0]})
+    dropoff_time: List[datetime] = Field(..., json_schema_extra={"example": ["2025-08-20T09:00:00Z"]})
+    capacity_demand: List[int] = Field(..., json_schema_extra={"example": [4]})
+    earliest_pickup: Optional[List[Optional[datetime]]] = None
+    latest_pickup: Optional[List[Optional[datetime]]] = None
+    pickup_service_minutes: Optional[List[Optional[float]]] = None
+    dropoff_service_minutes: Optional[List[Optional[float]]] = None
+
+
+# Request columns that may be omitted (all null)
+_OPTIONAL_REQUEST_COLUMNS = ("earliest_pickup", "latest_pickup", "pickup_service_minutes", "dropoff_service_minutes")
+
+
+class CompactOptimizationRequest(BaseModel):
+    """
+    Columnar form of OptimizationRequest.
+
+    Each location is sent once; vehicles and requests are parallel arrays
+    referring to it by index, so repeated plants or stops cost one integer.
+    """
+    format: Literal["compact"] = "compact"
+    locations: CompactLocations
+    vehicles: CompactVehicles
+    requests: CompactRequests
+    solver_mode: Optional[Literal["ortools", "heuristic"]] = None
+    callback_url: Optional[HttpUrl] = None
+    previous_job_id: Optional[str] = None
+
+    @model_validator(mode="after")
+    def _check_columns(self) -> "CompactOptimizationRequest":
+        """Require equal column lengths and in-range location indexes."""
+        def check_lengths(table: str, columns: Dict[str, Optional[list]]) -> None:
+            lengths = {name: len(col) for name, col in columns.items() if col is not None}
+            if len(set(lengths.values())) > 1:
+                raise ValueError(f"{table} columns must have equal lengths, got {lengths}")
+
+        def check_indexes(column: str, indexes: List[Optional[int]]) -> None:
+            bad = next((i for i in indexes if i is not None and not 0 <= i < num_locations), None)
+            if bad is not None:
+                raise ValueError(f"{column} refers to location {bad}, but only {num_locations} are defined")
+
+        loc, veh, req = self.locations, self.vehicles, self.requests
+        num_locations = len(loc.id)
+        check_lengths("locations", {"id": loc.id, "latitude": loc.latitude, "longitude": loc.longitude})
+        check_lengths("vehicles", {
+            "id": veh.id, "capacity": veh.capacity,
+            "base_location": veh.base_location, "unavailability": veh.unavailability,
+        })
+        check_lengths("requests", {
+            "id": req.id, "pickup": req.pickup, "dropoff": req.dropoff,
+            "dropoff_time": req.dropoff_time, "capacity_demand": req.capacity_demand,
+            **{name: getattr(req, name) for name in _OPTIONAL_REQUEST_COLUMNS},
+        })
+        check_indexes("requests.pickup", req.pickup)
+        check_indexes("requests.dropoff", req.dropoff)
+        check_indexes("vehicles.base_location", veh.base_location or [])
+        if req.earliest_pickup or req.latest_pickup:
+            nulls = [None] * len(req.id)
+            for request_id, earliest, latest, dropoff_time in zip(
+                req.id, req.earliest_pickup or nulls, req.latest_pickup or nulls, req.dropoff_time
+            ):
+                _check_pickup_window(request_id, earliest, latest, dropoff_time)
+        for name in ("pickup_service_minutes", "dropoff_service_minutes"):
+            if any(m is not None and m < 0 for m in getattr(req, name) or []):
+                raise ValueError(f"requests.{name} must not be negative")
+        return self
+
+    def request_ids(self) -> List[str]:
+        """IDs of all booking requests, in input order."""
+        return list(self.requests.id)
+
+    def solver_input(self) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Vehicles and requests for the solvers, built straight from the columns.
+
+        Location dictionaries are shared between all requests that use them,
+        and dropoff times stay parsed datetimes.
+        """
+        loc, veh, req = self.locations, self.vehicles, self.requests
+        locations = [
+            {"id": loc_id, "latitude": lat, "longitude": lng}
+            for loc_id, lat, lng in zip(loc.id, loc.latitude, loc.longitude)
+        ]
+        bases = veh.base_location or [None] * len(veh.id)
+        unavailability = veh.unavailability or [[] for _ in veh.id]
+        vehicles = [
+            {
+                "id": vehicle_id,
+                "capacity": capacity,
+                "base_location": locations[base] if base is not None else None,
+                "unavailability": [u.model_dump(mode="json") for u in periods],
+            }
+            for vehicle_id, capacity, base, periods in zip(veh.id, veh.capacity, bases, unavailability)
+        ]
+        requests = [
+            {
+                "id": request_id,
+                "pickup_location": locations[pickup],
+                "dropoff_location": locations[dropoff],
+                "dropoff_time": dropoff_time,
+                "capacity_demand": demand,
+            }
+            for request_id, pickup, dropoff, dropoff_time, demand in zip(
+                req.id, req.pickup, req.dropoff, req.dropoff_time, req.capacity_demand
+            )
+        ]
+        for name in _OPTIONAL_REQUEST_COLUMNS:
+            column = getattr(req, name)
+            if column is not None:
+                for request, value in zip(requests, column):
+                    request[name] = value
+        return vehicles, requests
+
+
+def _request_format(payload: Any) -> str:
+    """Discriminate request formats: compact payloads carry ``format`` (or a location table)."""
+    if isinstance(payload, dict):
+        return "compact" if payload.get("format") == "compact" or "locations" in payload else "full"
+    return "compact" if isinstance(payload, CompactOptimizationRequest) else "full"
+
+
+AnyOptimizationRequest = Annotated[
+    Union[
+        Annotated[OptimizationRequest, Tag("full")],
+        Annotated[CompactOptimizationRequest, Tag("compact")],
+    ],
+    Discriminator(_request_format),
+]
+
+_any_request_adapter = TypeAdapter(AnyOptimizationRequest)
+
+
+def parse_optimization_request(payload: Dict[str, Any]) -> Union[OptimizationRequest, CompactOptimizationRequest]:
+    """
+    Validate a stored or incoming request payload in either format.
+
+    Args:
+        payload (dict): Full or compact request payload.
+
+    Returns:
+        OptimizationRequest | CompactOptimizationRequest: Validated request.
+    """
+    return _any_request_adapter.validate_python(payload)
+
+
+def expand_payload(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Convert a validated compact payload (JSON mode) to the full format.
+
+    Full-format payloads are returned unchanged. Used where code reads the
+    nested format directly, e.g. staging and local repair.
+
+    Args:
+        payload (dict): Stored request payload.
+
+    Returns:
+        dict: Payload in the full (nested) format.
+    """
+    if _request_format(payload) != "compact":
+        return payload
+    loc, veh, req = payload["locations"], payload["vehicles"], payload["requests"]
+    locations = [
+        {"id": loc_id, "latitude": lat, "longitude": lng}
+        for loc_id, lat, lng in zip(loc["id"], loc["latitude"], loc["longitude"])
+    ]
+    bases = veh.get("base_location") or [None] * len(veh["id"])
+    unavailability = veh.get("unavailability") or [[] for _ in veh["id"]]
+    expanded = {
+        "vehicles": [
+            {
+                "id": vehicle_id,
+                "capacity": capacity,
+                "base_location": locations[base] if base is not None else None,
+                "unavailability": periods,
+            }
+            for vehicle_id, capacity, base, periods in zip(veh["id"], veh["capacity"], bases, unavailability)
+        ],
+        "requests": [
+            {
+                "id": request_id,
+                "pickup_location": locations[pickup],
+                "dropoff_location": locations[dropoff],
+                "dropoff_time": dropoff_time,
+                "capacity_demand": demand,
+            }
+            for request_id, pickup, dropoff, dropoff_time, demand in zip(
+                req["id"], req["pickup"], req["dropoff"], req["dropoff_time"], req["capacity_demand"]
+            )
+        ],
+    }
+    for name in _OPTIONAL_REQUEST_COLUMNS:
+        if req.get(name) is not None:
+            for request, value in zip(expanded["requests"], req[name]):
+                request[name] = value
+    for key in ("solver_mode", "callback_url", "previous_job_id"):
+        if payload.get(key) is not None:
+            expanded[key] = payload[key]
+    return expanded
+
+
+def compact_payload(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Convert a full-format payload to the compact format (e.g. for clients and tests).
+
+    Args:
+        payload (dict): Payload in the full (nested) format.
+
+    Returns:
+        dict: Equivalent compact payload.
+    """
+    index: Dict[str, int] = {}
+    loc_cols: Dict[str, list] = {"id": [], "latitude": [], "longitude": []}
+
+    def loc_index(location: Optional[Dict[str, Any]]) -> Optional[int]:
+        if location is None:
+            return None
+        if location["id"] not in index:
+            index[location["id"]] = len(loc_cols["id"])
+            for key in loc_cols:
+                loc_cols[key].append(location[key])
+        return index[location["id"]]
+
+    vehicles, requests = payload["vehicles"], payload["requests"]
+    compact = {
+        "format": "compact",
+        "vehicles": {
+            "id": [v["id"] for v in vehicles],
+            "capacity": [v["capacity"] for v in vehicles],
+            "base_location": [loc_index(v.get("base_location")) for v in vehicles],
+            "unavailability": [v.get("unavailability") or [] for v in vehicles],
+        },
+        "requests": {
+            "id": [r["id"] for r in requests],
+            "pickup": [loc_index(r["pickup_location"]) for r in requests],
+            "dropoff": [loc_index(r["dropoff_location"]) for r in requests],
+            "dropoff_time": [r["dropoff_time"] for r in requests],
+            "capacity_demand": [r["capacity_demand"] for r in requests],
+        },
+        "locations": loc_cols,
+    }
+    for name in _OPTIONAL_REQUEST_COLUMNS:
+        column = [r.get(name) for r in requests]
+        if any(value is not None for value in column):
+            compact["requests"][name] = column
+    for key in ("solver_mode", "callback_url", "previous_job_id"):
+        if payload.get(key) is not None:
+            compact[key] = payload[key]
+    return compact
 
 
 # -----------------------------------------------------------------------------
@@ -90,11 +434,36 @@ class TripStop(BaseModel):
             "description": "start, pickup, dropoff, end"
         }
     )
+    request_id: Optional[str] = Field(
+        default=None,
+        json_schema_extra={
+            "example": "REQ-1",
+            "description": "Booking request served at this stop (pickup/dropoff only)"
+        }
+    )
 
 
 # -----------------------------------------------------------------------------
 # Scheduled Trip Schema
 # -----------------------------------------------------------------------------
+def trip_key(vehicle_id: str, request_ids: List[str]) -> str:
+    """
+    Stable key of a trip: its vehicle and the set of requests it serves.
+
+    Re-optimizations that keep a vehicle's requests together produce the
+    same key, whatever the trip's position, times or stop order.
+
+    Args:
+        vehicle_id (str): Vehicle driving the trip.
+        request_ids (list[str]): Requests served, in any order.
+
+    Returns:
+        str: 16 hex characters.
+    """
+    identity = "\x1f".join([vehicle_id, *sorted(request_ids)])
+    return hashlib.sha1(identity.encode("utf-8")).hexdigest()[:16]
+
+
 class ScheduledTrip(BaseModel):
     """Represents a scheduled trip result from the optimization."""
     vehicle_id: str = Field(..., json_schema_extra={"example": "VEH-1"})
@@ -105,10 +474,33 @@ class ScheduledTrip(BaseModel):
     total_distance_meters: int = Field(..., json_schema_extra={"example": 24500})
     route: List[TripStop]
 
+    @computed_field(json_schema_extra={"example": "3f9a0c1d2b4e5f60"})
+    @property
+    def trip_key(self) -> str:
+        """Stable key (vehicle and request set) for matching trips across jobs."""
+        return trip_key(self.vehicle_id, self.combined_request_ids)
+
 
 # -----------------------------------------------------------------------------
 # Optimization Result Schema
 # -----------------------------------------------------------------------------
+class SolverStats(BaseModel):
+    """Plan objective against the instance lower bound."""
+    objective: int = Field(
+        ...,
+        json_schema_extra={"example": 41520, "description": "Travel seconds plus unassigned penalties"}
+    )
+    lower_bound: int = Field(..., json_schema_extra={"example": 37800})
+    optimality_gap: float = Field(
+        ...,
+        json_schema_extra={"example": 0.0896, "description": "(objective - lower_bound) / objective"}
+    )
+    stopped_early: bool = Field(
+        default=False,
+        json_schema_extra={"description": "Search stopped at SOLVER_GAP_STOP_THRESHOLD"}
+    )
+
+
 class OptimizationResult(BaseModel):
     """Represents the full output from the optimizer."""
     job_id: str
@@ -116,6 +508,65 @@ class OptimizationResult(BaseModel):
     message: Optional[str] = None
     scheduled_trips: List[ScheduledTrip] = Field(default_factory=list)
     unassigned_requests: List[str] = Field(default_factory=list)
+    solver_stats: Optional[SolverStats] = None
+
+
+# -----------------------------------------------------------------------------
+# Local Repair Schemas
+# -----------------------------------------------------------------------------
+class RepairRequest(BaseModel):
+    """Requests and vehicles to remove from an existing job's plan."""
+    remove_request_ids: List[str] = Field(default_factory=list, json_schema_extra={"example": ["REQ-2"]})
+    remove_vehicle_ids: List[str] = Field(default_factory=list, json_schema_extra={"example": ["VEH-3"]})
+    time_limit_seconds: Optional[float] = Field(
+        default=None,
+        gt=0,
+        json_schema_extra={
+            "example": 2.0,
+            "description": "Re-insertion time budget; defaults to REPAIR_TIME_LIMIT_SECONDS"
+        }
+    )
+
+
+class RepairResponse(BaseModel):
+    """Outcome of a local repair, listing only the trips that changed."""
+    job_id: str = Field(..., json_schema_extra={"example": "OPT-5678"})
+    base_job_id: str = Field(..., json_schema_extra={"example": "OPT-1234"})
+    status: str = Field(..., json_schema_extra={"example": "completed"})
+    changed_trips: List[ScheduledTrip] = Field(default_factory=list)
+    removed_trip_vehicle_ids: List[str] = Field(default_factory=list, json_schema_extra={"example": ["VEH-3"]})
+    unassigned_requests: List[str] = Field(default_factory=list)
+    elapsed_ms: int = Field(..., json_schema_extra={"example": 42})
+
+
+# -----------------------------------------------------------------------------
+# Plan Delta Schema
+# -----------------------------------------------------------------------------
+class PlanDelta(BaseModel):
+    """Trips that changed between a previous job's plan and this job's, matched by trip key."""
+    job_id: str = Field(..., json_schema_extra={"example": "OPT-5678"})
+    previous_job_id: str = Field(..., json_schema_extra={"example": "OPT-1234"})
+    added: List[ScheduledTrip] = Field(
+        default_factory=list,
+        json_schema_extra={"description": "Trips whose key is not in the previous plan"}
+    )
+    modified: List[ScheduledTrip] = Field(
+        default_factory=list,
+        json_schema_extra={"description": "Same vehicle and requests, but new times, stop order or distances"}
+    )
+    removed_trip_keys: List[str] = Field(
+        default_factory=list,
+        json_schema_extra={"example": ["3f9a0c1d2b4e5f60"], "description": "Previous trips not in this plan"}
+    )
+    unchanged_count: int = Field(..., json_schema_extra={"example": 412})
+    newly_unassigned: List[str] = Field(
+        default_factory=list,
+        json_schema_extra={"example": ["REQ-9"], "description": "Served in the previous plan, unassigned now"}
+    )
+    newly_assigned: List[str] = Field(
+        default_factory=list,
+        json_schema_extra={"example": ["REQ-4"], "description": "Unassigned in the previous plan, served now"}
+    )
 
 
 # -----------------------------------------------------------------------------
@@ -126,10 +577,41 @@ class JobCreationResponse(BaseModel):
     job_id: str = Field(..., json_schema_extra={"example": "OPT-1234"})
 
 
+class JobCostEstimate(BaseModel):
+    """Estimated size, solve time and memory of an optimization job."""
+    solver_mode: str = Field(..., json_schema_extra={"example": "ortools"})
+    nodes: int = Field(..., json_schema_extra={"example": 81, "description": "Depot plus a pickup and dropoff per request"})
+    vehicles: int = Field(..., json_schema_extra={"example": 12})
+    windows: int = Field(..., json_schema_extra={"example": 1, "description": "Models solved (rolling-horizon windows)"})
+    matrix_elements: int = Field(
+        ..., json_schema_extra={"example": 6561, "description": "Distance matrix elements fetched over all models"}
+    )
+    time_limit_seconds: int = Field(..., json_schema_extra={"example": 30})
+    estimated_seconds: float = Field(..., json_schema_extra={"example": 9.8})
+    estimated_memory_mb: int = Field(..., json_schema_extra={"example": 61})
+
+
+class OptimizationEstimateResponse(BaseModel):
+    """Dry-run answer for POST /optimize/estimate; no job is created."""
+    estimate: JobCostEstimate
+    queue_full: bool = Field(..., json_schema_extra={"example": False, "description": "POST /optimize would return 429"})
+    queue_ahead: int = Field(
+        ..., json_schema_extra={"example": 3, "description": "Waiting jobs a worker would claim before this one"}
+    )
+    estimated_wait_seconds: float = Field(
+        ..., json_schema_extra={"example": 42.5, "description": "Estimated solve time of those jobs per worker"}
+    )
+
+
 class JobStatusResponse(BaseModel):
     """Response schema for job status."""
     job_id: str = Field(..., json_schema_extra={"example": "OPT-1234"})
     status: str = Field(..., json_schema_extra={"example": "pending"})
+    queue_position: Optional[int] = Field(
+        None,
+        description="0 while solving, 1..n while waiting for a solver worker; null otherwise",
+        json_schema_extra={"example": 2},
+    )
 
 
 class JobResultResponse(BaseModel):
@@ -145,3 +627,32 @@ class AppConfigResponse(BaseModel):
     project_name: str
     solver_time_limit: int
     solver_strategy: str
+
+
+# -----------------------------------------------------------------------------
+# Admin Schemas
+# -----------------------------------------------------------------------------
+class TableStorage(BaseModel):
+    """Row count and on-disk size of one table."""
+    name: str = Field(..., json_schema_extra={"example": "optimization_jobs"})
+    rows: int = Field(..., json_schema_extra={"example": 1200})
+    bytes: Optional[int] = Field(
+        None,
+        description="Table plus index size; null when the backend cannot report it",
+        json_schema_extra={"example": 52_428_800},
+    )
+
+
+class StorageReport(BaseModel):
+    """Database storage usage and retention settings."""
+    backend: str = Field(..., json_schema_extra={"example": "sqlite"})
+    database_bytes: Optional[int] = Field(None, json_schema_extra={"example": 73_400_320})
+    free_bytes: Optional[int] = Field(
+        None,
+        description="SQLite: space held by free pages, reclaimed by incremental vacuum",
+        json_schema_extra={"example": 4_194_304},
+    )
+    auto_vacuum: Optional[str] = Field(None, json_schema_extra={"example": "incremental"})
+    tables: List[TableStorage]
+    retention_days: int
+    retention_max_jobs: int
@@ -0,0 +1,76 @@
+"""
+app/services/artifact_writer.py
+
+Asynchronous persistence of job artifacts for the direct pipeline:
+- Writes staging rows (locations, vehicles, booking requests) and trips
+  after the job result is already stored, off the job's critical path.
+- Uses one background thread per process so writes never compete with
+  each other for the database.
+"""
+
+# Standard library imports
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, List
+
+# Local application imports
+from app.db.session import SessionLocal
+from app.models import schemas
+from app.services.data_manager import DataManager
+
+
+# -----------------------------------------------------------------------------
+# Artifact Writer
+# -----------------------------------------------------------------------------
+class ArtifactWriter:
+    """
+    Background writer for staging rows and trips of finished jobs.
+
+    Failures are logged and never affect the job, whose result is already
+    committed when the write is scheduled.
+    """
+
+    def __init__(self):
+        """Initialize the writer with a single-threaded executor."""
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="artifact-writer")
+        self._pending: List[Future] = []
+
+    def submit(self, job_id: str, request_data: Dict[str, Any], result: schemas.OptimizationResult) -> Future:
+        """
+        Schedule the artifacts of one job for writing.
+
+        Args:
+            job_id (str): Job the rows belong to.
+            request_data (dict): JSON-mode request payload to stage.
+            result (OptimizationResult): Result whose trips are saved.
+
+        Returns:
+            Future: Completes when the rows are committed.
+        """
+        future = self._executor.submit(self._write, job_id, request_data, result)
+        self._pending = [f for f in self._pending if not f.done()] + [future]
+        return future
+
+    def flush(self, timeout: float = None) -> None:
+        """Wait for all scheduled writes to finish."""
+        for future in list(self._pending):
+            future.result(timeout)
+
+    @staticmethod
+    def _write(job_id: str, request_data: Dict[str, Any], result: schemas.OptimizationResult) -> None:
+        db = SessionLocal()
+        try:
+            dm = DataManager(db)
+            dm.clear_job_staging(job_id)
+            dm.load_and_save_payload(request_data, job_id)
+            dm.save_trips(result.scheduled_trips, job_id)
+        except Exception as e:
+            db.rollback()
+            print(f"[{job_id}] Artifact persistence failed (result unaffected): {e}")
+        finally:
+            db.close()
+
+
+# -----------------------------------------------------------------------------
+# Global writer instance
+# -----------------------------------------------------------------------------
+artifact_writer = ArtifactWriter()
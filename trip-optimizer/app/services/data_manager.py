@@ -7,16 +7,17 @@ locations, booking requests, optimization results, and trips.
 
 # Standard library imports
 from typing import List, Optional, Dict, Any
-from datetime import datetime, date
+from datetime import datetime, date, timedelta, timezone
 
 # Third-party imports
 from sqlalchemy.orm import Session
-from sqlalchemy import delete
+from sqlalchemy import delete, func, insert, or_, select, update
 
 # Local application imports
 from app.db import models
 from app.core.config import settings
 from app.models import schemas
+from app.services.result_cache import result_bodies
 
 
 # -----------------------------------------------------------------------------
@@ -29,10 +30,19 @@ class DataManager:
     Responsibilities:
         - Load input payloads (vehicles, requests, locations) into DB tables.
         - Save trips and optimization results.
-        - Clear tables between runs.
+        - Remove a job's staging rows, and expire old ones by TTL.
         - Fetch optimization job details.
+
+    Staging rows are scoped by job ID, so any number of jobs can stage
+    concurrently.
     """
 
+    # Staging models, children first so deletes respect foreign keys
+    STAGING_MODELS = [
+        models.TripStop, models.TripRequest, models.Trip,
+        models.BookingRequest, models.Vehicle, models.Location,
+    ]
+
     def __init__(self, db_session: Session):
         """
         Initialize a DataManager with an active database session.
@@ -42,60 +52,81 @@ class DataManager:
         """
         self.db = db_session
 
+    # -------------------------------------------------------------------------
+    # Bulk write helpers
+    # -------------------------------------------------------------------------
+    def _upsert(self, model, rows: List[Dict[str, Any]], conflict_cols: List[str]) -> None:
+        """
+        Insert rows in one executemany, updating rows whose key already exists.
+
+        Uses ON CONFLICT on SQLite and PostgreSQL; other dialects fall back to
+        a plain bulk insert.
+
+        Args:
+            model: ORM model whose table receives the rows.
+            rows (list[dict]): Column values per row.
+            conflict_cols (list[str]): Columns of the unique key to upsert on.
+        """
+        if not rows:
+            return
+        table = model.__table__
+        dialect = self.db.get_bind().dialect.name
+        if dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        elif dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        else:
+            self.db.execute(insert(table), rows)
+            return
+
+        stmt = dialect_insert(table)
+        updates = {
+            name: stmt.excluded[name]
+            for name in rows[0]
+            if name not in conflict_cols
+        }
+        self.db.execute(stmt.on_conflict_do_update(index_elements=conflict_cols, set_=updates), rows)
+
     # -------------------------------------------------------------------------
     # Load and Save Payload
     # -------------------------------------------------------------------------
-    def load_and_save_payload(self, request_data: Dict[str, Any]) -> None:
+    def load_and_save_payload(self, request_data: Dict[str, Any], job_id: str) -> None:
         """
         Load vehicles, locations, and requests from the request payload
         and save them into their respective database tables.
 
+        Rows are written with one bulk upsert per table inside a single
+        transaction, so re-staging the same job (e.g. on retry) is idempotent.
+
         Args:
             request_data (dict): Raw request data containing vehicles and requests.
+            job_id (str): Job the staged rows belong to.
         """
-        processed_locations: Dict[str, models.Location] = {}
-
-        # Ensure central depot exists in locations (used as default base)
+        request_data = schemas.expand_payload(request_data)
+        # Unique locations; the central depot is the default vehicle base and
+        # the first occurrence of an ID wins
         depot_loc_id = "DEPOT"
-        depot_lat = str(settings.DEPOT_LATITUDE)
-        depot_lon = str(settings.DEPOT_LONGITUDE)
-        if depot_loc_id not in processed_locations:
-            depot = self.db.query(models.Location).filter_by(location_id=depot_loc_id).first()
-            if not depot:
-                depot = models.Location(location_id=depot_loc_id, latitude=depot_lat, longitude=depot_lon)
-                self.db.add(depot)
-            processed_locations[depot_loc_id] = depot
-
-        # Save unique base locations for vehicles (if provided)
-        for vehicle in request_data.get("vehicles", []):
-            loc = vehicle.get("base_location")
-            if loc:
-                if loc["id"] not in processed_locations:
-                    location = models.Location(
-                        location_id=loc["id"],
-                        latitude=str(loc["latitude"]),
-                        longitude=str(loc["longitude"]),
-                    )
-                    self.db.add(location)
-                    processed_locations[loc["id"]] = location
-
-        # Save unique pickup and dropoff locations for requests
+        locations: Dict[str, Dict[str, Any]] = {
+            depot_loc_id: {
+                "job_id": job_id,
+                "location_id": depot_loc_id,
+                "latitude": str(settings.DEPOT_LATITUDE),
+                "longitude": str(settings.DEPOT_LONGITUDE),
+            }
+        }
+        payload_locations = [v["base_location"] for v in request_data.get("vehicles", []) if v.get("base_location")]
         for req in request_data.get("requests", []):
-            for loc_key in ["pickup_location", "dropoff_location"]:
-                loc = req[loc_key]
-                if loc["id"] not in processed_locations:
-                    location = models.Location(
-                        location_id=loc["id"],
-                        latitude=str(loc["latitude"]),
-                        longitude=str(loc["longitude"]),
-                    )
-                    self.db.add(location)
-                    processed_locations[loc["id"]] = location
-
-        # Flush to assign IDs before referencing them in other tables
-        self.db.flush()
-
-        # Save vehicles with their unavailability periods
+            payload_locations.extend((req["pickup_location"], req["dropoff_location"]))
+        for loc in payload_locations:
+            locations.setdefault(loc["id"], {
+                "job_id": job_id,
+                "location_id": loc["id"],
+                "latitude": str(loc["latitude"]),
+                "longitude": str(loc["longitude"]),
+            })
+
+        # Vehicles with their unavailability periods
+        vehicles = []
         for vehicle_data in request_data.get("vehicles", []):
             unavailable_dates = []
             for unavail in vehicle_data.get("unavailability", []) or []:
@@ -105,79 +136,141 @@ class DataManager:
                 unavailable_dates.append({**unavail, "date": unavail_date})
 
             # Use provided base_location when present; otherwise, default to central depot
-            base_loc_id = depot_loc_id
-            if vehicle_data.get("base_location"):
-                base_loc_id = vehicle_data["base_location"]["id"]
-
-            vehicle = models.Vehicle(
-                vehicle_id=vehicle_data["id"],
-                capacity=vehicle_data["capacity"],
-                base_location_id=base_loc_id,
-                unavailable_dates=unavailable_dates,
-            )
-            self.db.add(vehicle)
+            base_loc = vehicle_data.get("base_location")
+            vehicles.append({
+                "job_id": job_id,
+                "vehicle_id": vehicle_data["id"],
+                "capacity": vehicle_data["capacity"],
+                "base_location_id": base_loc["id"] if base_loc else depot_loc_id,
+                "unavailable_dates": unavailable_dates,
+            })
 
-        # Save booking requests
+        # Booking requests
+        requests = []
         for req_data in request_data.get("requests", []):
             dropoff_raw = req_data["dropoff_time"]
-            dropoff_dt = (
-                datetime.fromisoformat(dropoff_raw.replace("Z", "+00:00"))
-                if isinstance(dropoff_raw, str)
-                else dropoff_raw
-            )
-            request = models.BookingRequest(
-                request_id=req_data["id"],
-                pickup_location_id=req_data["pickup_location"]["id"],
-                dropoff_location_id=req_data["dropoff_location"]["id"],
-                dropoff_time=dropoff_dt,
-                capacity_demand=req_data["capacity_demand"],
-            )
-            self.db.add(request)
+            requests.append({
+                "job_id": job_id,
+                "request_id": req_data["id"],
+                "pickup_location_id": req_data["pickup_location"]["id"],
+                "dropoff_location_id": req_data["dropoff_location"]["id"],
+                "dropoff_time": (
+                    datetime.fromisoformat(dropoff_raw.replace("Z", "+00:00"))
+                    if isinstance(dropoff_raw, str)
+                    else dropoff_raw
+                ),
+                "capacity_demand": req_data["capacity_demand"],
+            })
 
+        # Parents first so composite foreign keys resolve
+        self._upsert(models.Location, list(locations.values()), ["job_id", "location_id"])
+        self._upsert(models.Vehicle, vehicles, ["job_id", "vehicle_id"])
+        self._upsert(models.BookingRequest, requests, ["job_id", "request_id"])
         self.db.commit()
 
     # -------------------------------------------------------------------------
     # Save Results and Trips
     # -------------------------------------------------------------------------
-    def save_optimization_result(self, job_id: str, result: schemas.OptimizationResult) -> None:
+    def save_optimization_result(
+        self,
+        job_id: str,
+        result: schemas.OptimizationResult,
+        commit: bool = True,
+    ) -> None:
         """
-        Save the result of an optimization job.
+        Save the result of an optimization job with its pre-serialized body.
+
+        Status, result, bodies (JSON and MessagePack) and ETag are written
+        together, so a finished job is never visible without the body GET
+        /result serves.
 
         Args:
             job_id (str): ID of the job to update.
             result (OptimizationResult): Result to store.
+            commit (bool): Commit immediately; pass False to batch with other writes.
         """
-        job = self.db.get(models.OptimizationJob, job_id)
-        if job:
-            job.status = result.status
-            job.result = result.model_dump(mode="json")
+        self.db.execute(
+            update(models.OptimizationJob)
+            .where(models.OptimizationJob.id == job_id)
+            .values(
+                status=result.status,
+                result=result.model_dump(mode="json"),
+                **result_bodies(result),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        if commit:
             self.db.commit()
 
-    def save_trips(self, scheduled_trips: List[schemas.ScheduledTrip]) -> None:
+    def save_trips(
+        self,
+        scheduled_trips: List[schemas.ScheduledTrip],
+        job_id: str,
+        commit: bool = True,
+    ) -> None:
         """
-        Save scheduled trips into the Trip table.
+        Save scheduled trips into the Trip, TripRequest and TripStop tables.
 
-        Each ScheduledTrip may cover multiple requests, resulting in
-        one Trip record per request ID.
+        Each ScheduledTrip becomes one Trip row, one TripRequest row per
+        combined request and one TripStop row per route stop, all keyed by the
+        trip's position in the result (``trip_index``). Trips from an earlier
+        attempt of the job are replaced, and each table gets one bulk insert.
 
         Args:
             scheduled_trips (list[ScheduledTrip]): List of scheduled trip results.
+            job_id (str): Job that produced the trips.
+            commit (bool): Commit immediately; pass False to batch with other writes.
         """
-        for trip_data in scheduled_trips:
-            for request_id in trip_data.combined_request_ids:
-                trip = models.Trip(
-                    vehicle_id=trip_data.vehicle_id,
-                    booking_request_id=request_id,
-                    trip_start_time=trip_data.trip_start_time,
-                    trip_end_time=trip_data.trip_end_time,
-                    total_duration=trip_data.total_duration_minutes,
-                    total_distance=trip_data.total_distance_meters,
-                    trip_stop_sequence=[
-                        stop.model_dump(mode="json") for stop in trip_data.route
-                    ],
-                )
-                self.db.add(trip)
+        trip_rows, request_rows, stop_rows = [], [], []
+        for trip_index, trip_data in enumerate(scheduled_trips):
+            trip_rows.append({
+                "job_id": job_id,
+                "trip_index": trip_index,
+                "vehicle_id": trip_data.vehicle_id,
+                "trip_start_time": trip_data.trip_start_time,
+                "trip_end_time": trip_data.trip_end_time,
+                "total_duration": trip_data.total_duration_minutes,
+                "total_distance": trip_data.total_distance_meters,
+            })
+            request_rows.extend(
+                {"job_id": job_id, "trip_index": trip_index, "request_id": request_id}
+                for request_id in trip_data.combined_request_ids
+            )
+            stop_rows.extend(
+                {
+                    "job_id": job_id,
+                    "trip_index": trip_index,
+                    "sequence": sequence,
+                    "location_id": stop.location_id,
+                    "latitude": stop.latitude,
+                    "longitude": stop.longitude,
+                    "estimated_arrival_time": stop.estimated_arrival_time,
+                    "stop_type": stop.type,
+                    "request_id": stop.request_id,
+                }
+                for sequence, stop in enumerate(trip_data.route)
+            )
+
+        for model in (models.TripStop, models.TripRequest, models.Trip):
+            self.db.execute(delete(model).where(model.job_id == job_id))
+        for model, rows in (
+            (models.Trip, trip_rows), (models.TripRequest, request_rows), (models.TripStop, stop_rows)
+        ):
+            if rows:
+                self.db.execute(insert(model.__table__), rows)
+        if commit:
+            self.db.commit()
 
+    def save_result_and_trips(self, job_id: str, result: schemas.OptimizationResult) -> None:
+        """
+        Store a job's result and its trips in one transaction.
+
+        Args:
+            job_id (str): ID of the job to update.
+            result (OptimizationResult): Result to store.
+        """
+        self.save_optimization_result(job_id, result, commit=False)
+        self.save_trips(result.scheduled_trips, job_id, commit=False)
         self.db.commit()
 
     # -------------------------------------------------------------------------
@@ -195,6 +288,51 @@ class DataManager:
             self.db.execute(delete(model))
             self.db.commit()
 
+    def clear_job_staging(self, job_id: str) -> None:
+        """
+        Remove every staging row of one job.
+
+        Each delete is bounded by the job_id index, so cost scales with the
+        job's own rows rather than with the whole table.
+
+        Args:
+            job_id (str): Job whose rows should be removed.
+        """
+        for model in self.STAGING_MODELS:
+            self.db.execute(delete(model).where(model.job_id == job_id))
+        self.db.commit()
+
+    def purge_expired_staging(self, ttl_hours: Optional[int] = None) -> int:
+        """
+        Remove staging rows of jobs that finished more than ``ttl_hours`` ago.
+
+        Rows whose job no longer exists are removed as well.
+
+        Args:
+            ttl_hours (int | None): Retention in hours (defaults to STAGING_TTL_HOURS).
+
+        Returns:
+            int: Number of rows deleted.
+        """
+        ttl = settings.STAGING_TTL_HOURS if ttl_hours is None else ttl_hours
+        cutoff = datetime.now(timezone.utc) - timedelta(hours=ttl)
+        job = models.OptimizationJob
+        expired_jobs = select(job.id).where(
+            job.status != "pending",
+            func.coalesce(job.updated_at, job.created_at) < cutoff,
+        )
+        all_jobs = select(job.id)
+
+        deleted = 0
+        for model in self.STAGING_MODELS:
+            deleted += self.db.execute(
+                delete(model).where(
+                    or_(model.job_id.in_(expired_jobs), model.job_id.not_in(all_jobs))
+                )
+            ).rowcount
+        self.db.commit()
+        return deleted
+
     def get_optimization_job(self, job_id: str) -> Optional[models.OptimizationJob]:
         """
         Retrieve an optimization job by its ID.
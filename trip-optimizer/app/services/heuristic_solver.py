@@ -0,0 +1,145 @@
+"""
+app/services/heuristic_solver.py
+
+OR-Tools-free construction heuristic for the Trip Optimizer service.
+Sweeps requests in dropoff-deadline order and places each window of requests
+with regret insertion. Produces a plan in milliseconds for previews and
+what-if checks, and can seed OR-Tools with an initial solution.
+"""
+
+# Standard library imports
+from typing import Any, Dict, List, Tuple
+
+# Local application imports
+from app.core.config import settings
+from app.services.lower_bound import LowerBound
+from app.services.route_insertion import RouteInsertion
+from app.services.routing_problem import RoutingProblem
+
+
+# -----------------------------------------------------------------------------
+# Construction
+# -----------------------------------------------------------------------------
+def construct_routes(
+    problem: RoutingProblem,
+    insertion: RouteInsertion,
+) -> Tuple[Dict[int, List[int]], List[int]]:
+    """
+    Build vehicle routes with a deadline-sorted sweep plus regret insertion.
+
+    Requests are sorted by dropoff deadline and processed in windows of
+    ``HEURISTIC_REGRET_WINDOW``. Within a window, the request whose best and
+    second-best vehicle differ most in added time is inserted first, so
+    requests with few good options are not crowded out.
+
+    Args:
+        problem (RoutingProblem): Prepared problem data.
+        insertion (RouteInsertion): Insertion helper bound to the problem's matrices.
+
+    Returns:
+        tuple: (routes keyed by vehicle index, indices of unassigned requests).
+    """
+    num_vehicles = len(problem.vehicles)
+    routes: Dict[int, List[int]] = {v: [] for v in range(num_vehicles)}
+    unassigned: List[int] = []
+
+    order = sorted(range(len(problem.requests)), key=lambda r: problem._dropoff_deadlines_abs[r])
+    window = max(1, settings.HEURISTIC_REGRET_WINDOW)
+
+    # Best insertion per vehicle and request; a vehicle's entries are dropped
+    # whenever its route changes
+    cache: Dict[int, Dict[int, Tuple[int, List[int]] | None]] = {v: {} for v in range(num_vehicles)}
+
+    # Idle vehicles are interchangeable only if they agree on everything an
+    # insertion depends on; eligibility is added per request below
+    def _base(vehicle: Dict) -> Tuple | None:
+        base = vehicle.get("base_location")
+        return (base["latitude"], base["longitude"]) if base else None
+
+    idle_keys = [
+        (insertion.capacities[v], insertion.start_times[v], _base(problem.vehicles[v]))
+        for v in range(num_vehicles)
+    ]
+
+    for start in range(0, len(order), window):
+        pending = order[start:start + window]
+        while pending:
+            choice = None  # (regret, -rank, request, vehicle, move)
+            for rank, ridx in enumerate(pending):
+                moves = []
+                tried_idle = set()
+                for v in range(num_vehicles):
+                    # Try one idle vehicle per equivalence class
+                    if not routes[v]:
+                        key = (idle_keys[v], problem.vehicle_allowed(v, ridx))
+                        if key in tried_idle:
+                            continue
+                        tried_idle.add(key)
+                    if ridx not in cache[v]:
+                        cache[v][ridx] = insertion.best_insertion(v, routes[v], ridx)
+                    move = cache[v][ridx]
+                    if move is not None:
+                        moves.append((move[0], v, move))
+                if not moves:
+                    continue
+                # Ties go to the larger vehicle so later requests can share it
+                moves.sort(key=lambda m: (m[0], -insertion.capacities[m[1]], m[1]))
+                regret = moves[1][0] - moves[0][0] if len(moves) > 1 else float("inf")
+                candidate = (regret, -rank, ridx, moves[0][1], moves[0][2])
+                if choice is None or candidate[:2] > choice[:2]:
+                    choice = candidate
+
+            if choice is None:
+                # Nothing left in this window fits any vehicle
+                unassigned.extend(pending)
+                break
+
+            _, _, ridx, vehicle, move = choice
+            routes[vehicle] = move[1]
+            cache[vehicle] = {}
+            pending.remove(ridx)
+
+    return routes, unassigned
+
+
+# -----------------------------------------------------------------------------
+# Heuristic Solver
+# -----------------------------------------------------------------------------
+class HeuristicSolver(RoutingProblem):
+    """
+    Fast, OR-Tools-free solver sharing the OptimizationSolver interface.
+
+    Respects the same constraints as the OR-Tools model (capacity,
+    pickup-before-dropoff on one vehicle, dropoff deadlines and
+    SOLVER_MAX_VEHICLE_TIME_MINUTES) but performs no local search.
+    """
+
+    def solve(self) -> Dict[str, Any]:
+        """
+        Run the construction heuristic and return results.
+
+        Returns:
+            dict: Same shape as ``OptimizationSolver.solve()``.
+        """
+        dist_matrix, time_matrix = self.build_matrices()
+        insertion = RouteInsertion(self, dist_matrix, time_matrix)
+        routes, unassigned = construct_routes(self, insertion)
+
+        results: Dict[str, Any] = {"assigned": [], "unassigned_requests": []}
+        for v_idx in range(len(self.vehicles)):
+            if not routes[v_idx]:
+                continue
+            assignment = self.summarize_route(
+                v_idx, [self.depot_index] + routes[v_idx], dist_matrix, time_matrix
+            )
+            if assignment:
+                results["assigned"].append(assignment)
+
+        unassigned_set = set(unassigned)
+        results["unassigned_requests"] = [
+            r["id"] for idx, r in enumerate(self.requests) if idx in unassigned_set
+        ]
+
+        self.lower_bound = LowerBound(self, time_matrix)
+        results.update(self.lower_bound.stats(results))
+        return results
@@ -0,0 +1,211 @@
+"""
+app/services/instance_capture.py
+
+Capture and offline replay of solver inputs:
+- Saves a job's full solver input to one gzip-compressed MessagePack file
+  under CAPTURE_DIR: the normalized vehicles and requests of every model
+  (one per rolling-horizon window), the distance and time matrices as
+  fetched (packed 32-bit integers), solver settings and the code version.
+- Captures every job (CAPTURE_MODE=always) or only jobs whose solve took
+  longer than CAPTURE_SLOW_SECONDS (CAPTURE_MODE=slow).
+- Rebuilds each captured model with its matrices, so replays never call the
+  distance matrix API.
+
+Replay from the command line with ``python -m benchmarks.replay_capture``.
+"""
+
+# Standard library imports
+import gzip
+import platform
+import subprocess
+import sys
+from array import array
+from datetime import datetime, timezone
+from importlib import metadata
+from itertools import chain
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+# Local application imports
+from app.core.config import settings
+from app.services.routing_problem import RoutingProblem
+from app.utils.info_utils import InfoUtils
+from app.utils.msgpack_utils import packb, unpackb
+
+CAPTURE_FORMAT_VERSION = 1
+
+# Settings that shape a solve; captured with every instance and restored on replay
+_CAPTURED_SETTING_PREFIXES = ("SOLVER_", "HEURISTIC_", "DEPOT_")
+_IGNORED_SETTINGS = {"SOLVER_WORKER_PROCESSES", "SOLVER_QUEUE_MAXSIZE", "SOLVER_WARMUP_ENABLED"}
+
+
+def should_capture(solve_seconds: float) -> bool:
+    """
+    Decide whether a finished solve is captured.
+
+    Args:
+        solve_seconds (float): Wall time spent solving the job.
+
+    Returns:
+        bool: True under CAPTURE_MODE=always, or =slow past CAPTURE_SLOW_SECONDS.
+    """
+    mode = settings.CAPTURE_MODE
+    return mode == "always" or (mode == "slow" and solve_seconds > settings.CAPTURE_SLOW_SECONDS)
+
+
+def solver_settings() -> Dict[str, Any]:
+    """Current values of the settings that shape a solve."""
+    return {
+        name: getattr(settings, name)
+        for name in type(settings).model_fields
+        if name.startswith(_CAPTURED_SETTING_PREFIXES) and name not in _IGNORED_SETTINGS
+    }
+
+
+def code_version() -> Dict[str, Optional[str]]:
+    """API version, git commit (when run from a checkout) and solver library versions."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=Path(__file__).resolve().parent,
+            capture_output=True,
+            text=True,
+            timeout=2,
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    try:
+        ortools_version = metadata.version("ortools")
+    except metadata.PackageNotFoundError:
+        ortools_version = None
+    return {
+        "api_version": InfoUtils().get_version(),
+        "commit": commit,
+        "python": platform.python_version(),
+        "ortools": ortools_version,
+    }
+
+
+def _pack_matrix(matrix: List[List[int]]) -> bytes:
+    """Row-major little-endian int32 bytes of a square matrix."""
+    packed = array("i", chain.from_iterable(matrix))
+    if sys.byteorder != "little":
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def _unpack_matrix(data: bytes, size: int) -> List[List[int]]:
+    """Inverse of ``_pack_matrix``."""
+    packed = array("i")
+    packed.frombytes(data)
+    if sys.byteorder != "little":
+        packed.byteswap()
+    return [packed[i * size:(i + 1) * size].tolist() for i in range(size)]
+
+
+# -----------------------------------------------------------------------------
+# Capture
+# -----------------------------------------------------------------------------
+def capture_instance(
+    job_id: str,
+    solver_mode: str,
+    windows: List[Tuple[RoutingProblem, Dict]],
+    solve_seconds: float,
+) -> Path:
+    """
+    Write the solver input of a job to CAPTURE_DIR.
+
+    Args:
+        job_id (str): Job identifier (used as the file name).
+        solver_mode (str): "ortools" or "heuristic".
+        windows (list[tuple]): (solver, result) pairs, one per solved model;
+            solvers must have built their matrices.
+        solve_seconds (float): Wall time spent solving.
+
+    Returns:
+        Path: The capture file.
+    """
+    models = []
+    for solver, result in windows:
+        dist_matrix, time_matrix = solver.build_matrices()
+        models.append({
+            "vehicles": solver.vehicles,
+            "requests": solver.requests,
+            "depot_location": solver._depot_location,
+            "vehicle_ready_times": solver._vehicle_ready_times,
+            "size": len(time_matrix),
+            "distance_matrix": _pack_matrix(dist_matrix),
+            "time_matrix": _pack_matrix(time_matrix),
+            "outcome": {
+                "trips": len(result.get("assigned", [])),
+                "unassigned": len(result.get("unassigned_requests", [])),
+                "objective": result.get("objective"),
+                "lower_bound": result.get("lower_bound"),
+            },
+        })
+
+    record = {
+        "format_version": CAPTURE_FORMAT_VERSION,
+        "job_id": job_id,
+        "captured_at": datetime.now(timezone.utc),
+        "solver_mode": solver_mode,
+        "solve_seconds": round(solve_seconds, 3),
+        "settings": solver_settings(),
+        "code_version": code_version(),
+        "models": models,
+    }
+    capture_dir = Path(settings.CAPTURE_DIR)
+    capture_dir.mkdir(parents=True, exist_ok=True)
+    path = capture_dir / f"{job_id}.msgpack.gz"
+    path.write_bytes(gzip.compress(packb(record), compresslevel=6))
+    print(f"[CAPTURE] Job {job_id}: {len(models)} model(s), {solve_seconds:.1f}s solve -> {path}")
+    return path
+
+
+# -----------------------------------------------------------------------------
+# Replay
+# -----------------------------------------------------------------------------
+def load_capture(path: str | Path) -> Dict[str, Any]:
+    """
+    Read a capture file, unpacking its matrices.
+
+    Args:
+        path (str | Path): File written by ``capture_instance``.
+
+    Returns:
+        dict: The capture record; each model has "matrices" as a
+        (distance, time) pair of lists.
+
+    Raises:
+        ValueError: If the file has an unsupported format version.
+    """
+    record = unpackb(gzip.decompress(Path(path).read_bytes()))
+    if record.get("format_version") != CAPTURE_FORMAT_VERSION:
+        raise ValueError(f"Unsupported capture format: {record.get('format_version')}")
+    for model in record["models"]:
+        size = model["size"]
+        model["matrices"] = (
+            _unpack_matrix(model.pop("distance_matrix"), size),
+            _unpack_matrix(model.pop("time_matrix"), size),
+        )
+    return record
+
+
+def build_solver(model: Dict[str, Any], solver_cls: Type[RoutingProblem]) -> RoutingProblem:
+    """
+    Rebuild a captured model with its own matrices (no distance matrix API calls).
+
+    Args:
+        model (dict): One entry of ``load_capture(path)["models"]``.
+        solver_cls (type[RoutingProblem]): Solver to replay with.
+
+    Returns:
+        RoutingProblem: Prepared solver; reads settings at construction.
+    """
+    return solver_cls(
+        model["vehicles"],
+        model["requests"],
+        depot_location=model["depot_location"],
+        matrices=model["matrices"],
+        vehicle_ready_times=model["vehicle_ready_times"] or None,
+    )
@@ -0,0 +1,126 @@
+"""
+app/services/job_cost.py
+
+Cost estimates for queued optimization jobs:
+- Estimates a job's solve time and peak memory at submission from its node
+  count, fleet size, distance matrix elements, rolling-horizon windows and
+  the solver time limit. Coefficients were measured with
+  ``python -m benchmarks.bench_scheduling --calibrate`` on the haversine
+  fallback; only the ordering of jobs and the memory scale need to be right.
+- Turns the estimate into the job's claim-order key (``priority_at``):
+  under SCHEDULER_POLICY="sjf" a job is delayed in the queue in proportion
+  to its cost, capped by SCHEDULER_MAX_DELAY_SECONDS, so cheap interactive
+  jobs overtake batch jobs while no job is overtaken for longer than the cap.
+"""
+
+# Standard library imports
+import math
+from bisect import bisect_left
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+# Local application imports
+from app.core.config import settings
+from app.models import schemas
+from app.services.rolling_horizon import use_rolling_horizon
+from app.services.routing_problem import dropoff_time_utc
+
+# Matrix fetch per element: Distance Matrix API round trips vs. haversine fallback
+MATRIX_SECONDS_PER_ELEMENT_API = 2e-3
+MATRIX_SECONDS_PER_ELEMENT_FALLBACK = 2.2e-6
+# OR-Tools model construction per node and vehicle
+MODEL_SECONDS_PER_NODE_VEHICLE = 9e-6
+# OR-Tools exhausts small search spaces before the time limit
+SEARCH_SECONDS_PER_NODE = 0.12
+# Heuristic insertion per matrix element
+HEURISTIC_SECONDS_PER_ELEMENT = 2e-6
+# Peak resident memory: interpreter and solver libraries, plus both matrices and model data
+MEMORY_BASE_MB = 80
+MEMORY_BYTES_PER_ELEMENT = 100
+
+
+def window_sizes(requests: List[Dict]) -> List[int]:
+    """
+    Requests per solved model: one model, or one per rolling-horizon window.
+
+    Windows are split like RollingHorizon splits them, without the look-ahead
+    requests a window hands on to the next.
+    """
+    if not requests or not use_rolling_horizon(requests):
+        return [len(requests)]
+    window = timedelta(hours=settings.SOLVER_HORIZON_WINDOW_HOURS)
+    overlap = timedelta(hours=settings.SOLVER_HORIZON_OVERLAP_HOURS)
+    dropoffs = sorted(dropoff_time_utc(r) for r in requests)
+    sizes, start = [], 0
+    while start < len(dropoffs):
+        commit_end = dropoffs[start] + window
+        sizes.append(bisect_left(dropoffs, commit_end + overlap) - start)
+        start = bisect_left(dropoffs, commit_end)
+    return sizes
+
+
+def estimate_job_cost(
+    vehicles: List[Dict],
+    requests: List[Dict],
+    solver_mode: Optional[str] = None,
+) -> schemas.JobCostEstimate:
+    """
+    Estimate the solve time and peak memory of a job.
+
+    Args:
+        vehicles (list[dict]): Vehicle input data.
+        requests (list[dict]): Booking request input data.
+        solver_mode (str | None): "ortools" or "heuristic" (defaults to SOLVER_DEFAULT_MODE).
+
+    Returns:
+        JobCostEstimate: Size figures and the estimated seconds and megabytes.
+    """
+    mode = solver_mode or settings.SOLVER_DEFAULT_MODE
+    time_limit = settings.SOLVER_TIME_LIMIT_SECONDS
+    # Matrices are fetched per model (they are cached per solver, not across jobs)
+    per_element = MATRIX_SECONDS_PER_ELEMENT_API if settings.GOOGLE_MAPS_API_KEY else MATRIX_SECONDS_PER_ELEMENT_FALLBACK
+
+    sizes = window_sizes(requests)
+    seconds, peak_elements, matrix_elements = 0.0, 0, 0
+    for size in sizes:
+        nodes = 2 * size + 1
+        elements = nodes * nodes
+        seconds += elements * per_element
+        if mode == "heuristic":
+            seconds += elements * HEURISTIC_SECONDS_PER_ELEMENT
+        else:
+            seconds += nodes * len(vehicles) * MODEL_SECONDS_PER_NODE_VEHICLE
+            seconds += min(time_limit, nodes * SEARCH_SECONDS_PER_NODE)
+        matrix_elements += elements
+        # Windows are solved one after another, so memory peaks with the largest
+        peak_elements = max(peak_elements, elements)
+
+    return schemas.JobCostEstimate(
+        solver_mode=mode,
+        nodes=2 * len(requests) + 1,
+        vehicles=len(vehicles),
+        windows=len(sizes),
+        matrix_elements=matrix_elements,
+        time_limit_seconds=time_limit,
+        estimated_seconds=round(seconds, 2),
+        estimated_memory_mb=math.ceil(MEMORY_BASE_MB + peak_elements * MEMORY_BYTES_PER_ELEMENT / 2**20),
+    )
+
+
+def priority_at(queued_at: datetime, estimated_seconds: float) -> datetime:
+    """
+    Claim-order key of a job queued at ``queued_at``.
+
+    Args:
+        queued_at (datetime): When the job entered the queue.
+        estimated_seconds (float): Estimated solve time.
+
+    Returns:
+        datetime: ``queued_at`` under "fifo"; under "sjf", delayed by
+        SCHEDULER_COST_WEIGHT seconds per estimated second, at most
+        SCHEDULER_MAX_DELAY_SECONDS.
+    """
+    if settings.SCHEDULER_POLICY != "sjf":
+        return queued_at
+    delay = min(settings.SCHEDULER_MAX_DELAY_SECONDS, estimated_seconds * settings.SCHEDULER_COST_WEIGHT)
+    return queued_at + timedelta(seconds=delay)
@@ -0,0 +1,317 @@
+"""
+app/services/job_queue.py
+
+Durable job queue on the optimization_jobs table:
+- Workers claim pending jobs atomically with a conditional UPDATE, in
+  order of ``priority_at`` (arrival time pushed back by estimated cost)
+- Claims respect SOLVER_MEMORY_BUDGET_MB: a job whose estimated memory does
+  not fit next to the running jobs waits for them, and nothing overtakes it.
+  Memory-checked claims are serialized (an advisory lock on PostgreSQL;
+  SQLite's single writer already serializes them)
+- Claims are leases renewed by heartbeats; expired leases are re-queued
+- Jobs that keep losing their worker fail after JOB_MAX_ATTEMPTS claims
+
+Jobs keep the "pending" status while queued or running, so clients that
+only know pending/completed/failed are unaffected.
+"""
+
+# Standard library imports
+import math
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Tuple
+
+# Third-party imports
+from sqlalchemy import Select, and_, func, or_, select, true, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, aliased
+
+# Local application imports
+from app.core.config import settings
+from app.db import models
+
+Job = models.OptimizationJob
+
+# PostgreSQL advisory lock key serializing memory-checked claims
+MEMORY_CLAIM_LOCK_ID = 0x74726970
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+# -----------------------------------------------------------------------------
+# Job Queue
+# -----------------------------------------------------------------------------
+class JobQueue:
+    """
+    Queue operations shared by the API and solver workers.
+
+    Every state change is a single conditional UPDATE, so any number of
+    workers (in one process, several processes or several hosts sharing the
+    database) can use the queue concurrently.
+    """
+
+    # Candidates fetched per claim attempt; losers of a race try the next one
+    CLAIM_BATCH = 5
+
+    def __init__(self, db_session: Session):
+        """
+        Initialize the JobQueue with a database session.
+
+        Args:
+            db_session (Session): Active SQLAlchemy session.
+        """
+        self.db = db_session
+
+    # -------------------------------------------------------------------------
+    # Queue state
+    # -------------------------------------------------------------------------
+    @staticmethod
+    def _waiting():
+        """Filter for pending jobs no worker holds."""
+        return and_(Job.status == "pending", Job.claimed_by.is_(None))
+
+    @staticmethod
+    def _queue_order():
+        """Claim order: earliest priority key first (older rows fall back to queued_at, created_at)."""
+        return func.coalesce(Job.priority_at, Job.queued_at, Job.created_at)
+
+    @staticmethod
+    def _running_memory():
+        """Scalar subquery: estimated memory (MB) of the jobs workers hold."""
+        running = aliased(Job)
+        return (
+            select(func.coalesce(func.sum(running.estimated_memory_mb), 0))
+            .where(running.status == "pending", running.claimed_by.is_not(None))
+            .scalar_subquery()
+        )
+
+    @classmethod
+    def _memory_fits(cls, memory_mb: Optional[int]):
+        """Filter admitting a job of ``memory_mb`` next to the running jobs (alone if larger than the budget)."""
+        budget = settings.SOLVER_MEMORY_BUDGET_MB
+        if budget <= 0 or not memory_mb:
+            return true()
+        running = cls._running_memory()
+        return or_(running == 0, running + memory_mb <= budget)
+
+    def _serialize_memory_claim(self) -> None:
+        """
+        Hold the memory-admission lock until the claim transaction ends.
+
+        Under READ COMMITTED, two workers claiming at once could each see
+        the other's job as not yet running, and both be admitted past the
+        budget. On PostgreSQL a transaction-scoped advisory lock orders the
+        claims, so the second one's UPDATE sees the first's committed claim.
+        SQLite allows one writer at a time, so its UPDATEs are already serialized.
+        """
+        if self.db.get_bind().dialect.name == "postgresql":
+            self.db.execute(select(func.pg_advisory_xact_lock(MEMORY_CLAIM_LOCK_ID)))
+
+    def waiting_count(self) -> int:
+        """Number of pending jobs waiting for a worker."""
+        return self.db.scalar(select(func.count()).select_from(Job).where(self._waiting())) or 0
+
+    def is_full(self) -> bool:
+        """Whether a new job should be rejected with 429."""
+        return self.waiting_count() >= settings.SOLVER_QUEUE_MAXSIZE
+
+    def retry_after(self) -> int:
+        """Estimated seconds until a queue slot frees up."""
+        waiting = self.db.scalar(
+            select(func.sum(func.coalesce(Job.estimated_seconds, settings.SOLVER_TIME_LIMIT_SECONDS)))
+            .where(self._waiting())
+        ) or 0
+        return max(1, math.ceil(waiting / max(1, settings.SOLVER_WORKER_PROCESSES)))
+
+    def ahead_of(self, key: datetime) -> Tuple[int, float]:
+        """
+        Waiting jobs a worker would claim before a new job with claim-order ``key``.
+
+        Args:
+            key (datetime): The new job's ``priority_at``.
+
+        Returns:
+            tuple: (number of such jobs, their estimated solve seconds in total).
+        """
+        row = self.db.execute(
+            select(
+                func.count(),
+                func.sum(func.coalesce(Job.estimated_seconds, settings.SOLVER_TIME_LIMIT_SECONDS)),
+            ).where(self._waiting(), self._queue_order() <= key)
+        ).one()
+        return row[0] or 0, float(row[1] or 0)
+
+    def queue_position(self, job: models.OptimizationJob) -> Optional[int]:
+        """
+        Position of a pending job in the queue.
+
+        Args:
+            job (OptimizationJob): The job to locate.
+
+        Returns:
+            int | None: 0 while a worker holds it, 1..n while waiting, None once finished.
+        """
+        if job.status != "pending":
+            return None
+        if job.claimed_by is not None:
+            return 0
+        return (self.db.scalar(self.ahead_count(job)) or 0) + 1
+
+    @classmethod
+    async def queue_position_async(cls, db: AsyncSession, job: models.OptimizationJob) -> Optional[int]:
+        """Same as ``queue_position``, on an async session (for async routes)."""
+        if job.status != "pending":
+            return None
+        if job.claimed_by is not None:
+            return 0
+        return ((await db.scalar(cls.ahead_count(job))) or 0) + 1
+
+    @classmethod
+    def ahead_count(cls, job: models.OptimizationJob) -> Select:
+        """
+        Query counting the waiting jobs a worker will claim before ``job``.
+
+        Args:
+            job (OptimizationJob): A waiting job (any row with its queue columns).
+
+        Returns:
+            Select: Scalar count query, usable from sync and async sessions.
+        """
+        key = job.priority_at or job.queued_at or job.created_at
+        return select(func.count()).select_from(Job).where(
+            cls._waiting(),
+            or_(
+                cls._queue_order() < key,
+                and_(cls._queue_order() == key, Job.id < job.id),
+            ),
+        )
+
+    # -------------------------------------------------------------------------
+    # Worker operations
+    # -------------------------------------------------------------------------
+    def claim(self, worker_id: str, job_id: Optional[str] = None) -> Optional[str]:
+        """
+        Atomically claim the next waiting job in claim order (or a specific one).
+
+        A queued job is only claimed if its estimated memory fits the
+        SOLVER_MEMORY_BUDGET_MB next to the running jobs; otherwise the worker
+        claims nothing, so later jobs cannot overtake it indefinitely. A
+        specific job (in-process runs, with no other claimant) skips the check.
+
+        Args:
+            worker_id (str): Identifier of the claiming worker.
+            job_id (str | None): Claim only this job when given.
+
+        Returns:
+            str | None: ID of the claimed job, or None if nothing was claimable.
+        """
+        if job_id is not None:
+            candidates = [(job_id, None)]
+        else:
+            candidates = self.db.execute(
+                select(Job.id, Job.estimated_memory_mb).where(self._waiting())
+                .order_by(self._queue_order(), Job.id)
+                .limit(self.CLAIM_BATCH)
+            ).all()
+
+        for candidate, memory_mb in candidates:
+            if job_id is None and settings.SOLVER_MEMORY_BUDGET_MB > 0 and memory_mb:
+                self._serialize_memory_claim()
+            now = _utcnow()
+            claimed = self.db.execute(
+                update(Job)
+                .where(Job.id == candidate, self._waiting(), self._memory_fits(memory_mb))
+                .values(
+                    claimed_by=worker_id,
+                    heartbeat_at=now,
+                    lease_expires_at=now + timedelta(seconds=settings.JOB_LEASE_SECONDS),
+                    attempts=func.coalesce(Job.attempts, 0) + 1,
+                )
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            self.db.commit()
+            if claimed == 1:
+                return candidate
+            if job_id is None and self.db.scalar(
+                select(func.count()).select_from(Job).where(Job.id == candidate, self._waiting())
+            ):
+                # Still waiting, so it lost on memory rather than to another worker
+                return None
+        return None
+
+    def heartbeat(self, job_id: str, worker_id: str) -> bool:
+        """
+        Renew a worker's lease on a job.
+
+        Returns:
+            bool: False if the worker no longer holds the job (lease expired and re-queued).
+        """
+        now = _utcnow()
+        renewed = self.db.execute(
+            update(Job)
+            .where(Job.id == job_id, Job.claimed_by == worker_id, Job.status == "pending")
+            .values(heartbeat_at=now, lease_expires_at=now + timedelta(seconds=settings.JOB_LEASE_SECONDS))
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        self.db.commit()
+        return renewed == 1
+
+    def release(self, job_id: str, worker_id: str, error: Optional[str] = None) -> None:
+        """
+        Give up a claim once the worker is done with the job.
+
+        A finished job keeps its final status. A job that is still pending
+        (the worker hit an unexpected error) goes back to the queue, or fails
+        if it has used up its attempts.
+
+        Args:
+            job_id (str): ID of the job.
+            worker_id (str): Worker that holds the claim.
+            error (str | None): Error message if the run did not finish.
+        """
+        job = self.db.get(Job, job_id)
+        if job is None or job.claimed_by != worker_id:
+            return
+        if job.status == "pending" and (job.attempts or 0) >= settings.JOB_MAX_ATTEMPTS:
+            job.status = "failed"
+            job.result = {"message": f"Job failed after {job.attempts} attempts: {error}"}
+        job.claimed_by = None
+        job.lease_expires_at = None
+        self.db.commit()
+
+    def requeue_expired(self) -> Tuple[List[str], List[str]]:
+        """
+        Re-queue jobs whose worker stopped heartbeating.
+
+        Returns:
+            tuple: (IDs put back in the queue, IDs failed for exceeding JOB_MAX_ATTEMPTS).
+        """
+        now = _utcnow()
+        expired = and_(Job.status == "pending", Job.claimed_by.is_not(None), Job.lease_expires_at < now)
+        exhausted = func.coalesce(Job.attempts, 0) >= settings.JOB_MAX_ATTEMPTS
+
+        failed = self.db.scalars(select(Job.id).where(expired, exhausted)).all()
+        if failed:
+            self.db.execute(
+                update(Job)
+                .where(Job.id.in_(failed), expired)
+                .values(
+                    status="failed",
+                    claimed_by=None,
+                    lease_expires_at=None,
+                    result={"message": f"Worker lease expired {settings.JOB_MAX_ATTEMPTS} times"},
+                )
+                .execution_options(synchronize_session=False)
+            )
+
+        requeued = self.db.scalars(select(Job.id).where(expired, ~exhausted)).all()
+        if requeued:
+            self.db.execute(
+                update(Job)
+                .where(Job.id.in_(requeued), expired)
+                .values(claimed_by=None, lease_expires_at=None)
+                .execution_options(synchronize_session=False)
+            )
+        self.db.commit()
+        return list(requeued), list(failed)
@@ -0,0 +1,186 @@
+"""
+app/services/lower_bound.py
+
+Fast lower bound on the routing objective and the optimality gap of a plan.
+The objective is the one OR-Tools minimizes: travel time over all arcs plus
+SOLVER_UNASSIGNED_PENALTY for each dropped pickup and dropoff node.
+
+The bound combines:
+- Requests that no vehicle can serve on its own (capacity, eligibility,
+  pickup window, deadline or route duration), which pay their penalty in
+  every plan.
+- For every other request, the cheapest arc into (or out of) its pickup
+  and dropoff nodes, since every visited node has exactly one of each.
+- A minimum vehicle count from packing that work into routes of at most
+  SOLVER_MAX_VEHICLE_TIME_MINUTES, each paying the cheapest return arc.
+- A minimum spanning tree over the depot and those nodes: all routes meet
+  at the depot, so together they connect every visited node.
+
+Each part is one or a few passes over the time matrix.
+"""
+
+# Standard library imports
+import heapq
+import math
+from operator import itemgetter
+from typing import Dict, Iterable, List, Optional
+
+# Local application imports
+from app.core.config import settings
+from app.services.routing_problem import RoutingProblem
+
+
+def _second_smallest(values: Iterable[int]) -> int:
+    """Smallest entry of a matrix row or column other than its zero diagonal."""
+    smallest = heapq.nsmallest(2, values)
+    return smallest[-1] if len(smallest) > 1 else 0
+
+
+def optimality_gap(objective: int, bound: int) -> float:
+    """Relative gap (objective - bound) / objective, 0.0 for an empty plan."""
+    if objective <= 0:
+        return 0.0
+    return max(0.0, (objective - bound) / objective)
+
+
+# -----------------------------------------------------------------------------
+# Lower Bound
+# -----------------------------------------------------------------------------
+class LowerBound:
+    """
+    Lower bound on the objective of a prepared problem, for all requests or a subset.
+
+    Valid as long as a request's penalty exceeds the travel time it saves,
+    which the default SOLVER_UNASSIGNED_PENALTY guarantees.
+    """
+
+    def __init__(self, problem: RoutingProblem, time_matrix: List[List[int]]):
+        """
+        Precompute per-node arc minima and per-request servability.
+
+        Args:
+            problem (RoutingProblem): Problem whose data has been prepared.
+            time_matrix (list[list[int]]): Time matrix in seconds.
+        """
+        self.problem = problem
+        self.time_matrix = time_matrix
+        self.penalty = 2 * settings.SOLVER_UNASSIGNED_PENALTY
+        self.max_route_time = int(settings.SOLVER_MAX_VEHICLE_TIME_MINUTES * 60)
+
+        self.min_in = [_second_smallest(column) for column in zip(*time_matrix)]
+        self.min_out = [_second_smallest(row) for row in time_matrix]
+        self.servable = [self._servable(ridx) for ridx in range(len(problem.requests))]
+
+    def _servable(self, request_idx: int) -> bool:
+        """Whether some vehicle can serve the request alone, straight from the depot."""
+        problem, t = self.problem, self.time_matrix
+        depot = problem.depot_index
+        pickup, dropoff = problem.pickup_drop_pairs[request_idx]
+        earliest, latest = problem.time_windows[pickup]
+        deadline = problem.time_windows[dropoff][1]
+        service_p, service_d = problem.service_times[pickup], problem.service_times[dropoff]
+        duration = t[depot][pickup] + service_p + t[pickup][dropoff] + service_d + t[dropoff][depot]
+        if duration > self.max_route_time:
+            return False
+        for v_idx, vehicle in enumerate(problem.vehicles):
+            if vehicle["capacity"] < problem.demands[pickup] or not problem.vehicle_allowed(v_idx, request_idx):
+                continue
+            begin = max(problem._vehicle_start_abs[v_idx] + t[depot][pickup], earliest)
+            if begin <= latest and begin + service_p + t[pickup][dropoff] <= deadline:
+                return True
+        return False
+
+    def value(self, request_indices: Optional[Iterable[int]] = None) -> int:
+        """
+        Lower bound on the objective of any plan for a set of requests.
+
+        Args:
+            request_indices (iterable[int] | None): Requests to cover; all by default.
+
+        Returns:
+            int: Bound in objective units (seconds plus penalties).
+        """
+        problem = self.problem
+        if request_indices is None:
+            request_indices = range(len(problem.requests))
+
+        penalties, arcs_in, arcs_out, work = 0, 0, 0, 0
+        nodes: List[int] = []
+        for ridx in request_indices:
+            if not self.servable[ridx]:
+                penalties += self.penalty
+                continue
+            nodes.extend(problem.pickup_drop_pairs[ridx])
+            for node in problem.pickup_drop_pairs[ridx]:
+                arcs_in += self.min_in[node]
+                arcs_out += self.min_out[node]
+                work += self.min_in[node] + problem.service_times[node]
+        if not nodes:
+            return penalties
+
+        depot = problem.depot_index
+        vehicles = max(1, math.ceil(work / self.max_route_time)) if self.max_route_time > 0 else 1
+        vehicles = min(vehicles, max(1, len(problem.vehicles)))
+        travel = max(
+            arcs_in + vehicles * self.min_in[depot],
+            arcs_out + vehicles * self.min_out[depot],
+            self._spanning_tree(nodes),
+        )
+        return penalties + travel
+
+    def _spanning_tree(self, nodes: List[int]) -> int:
+        """
+        Weight of a minimum spanning tree over the depot and the given nodes.
+
+        Edges weigh the faster of both directions. Nodes sharing a location
+        (e.g. a plant) have the same travel times and are joined at no cost,
+        so one of them stands for all.
+        Prim's algorithm with row-wise updates, O(n^2) over distinct locations.
+        """
+        t = self.time_matrix
+        locations = self.problem.locations
+        distinct = {}
+        for node in [self.problem.depot_index] + nodes:
+            distinct.setdefault((locations[node]["latitude"], locations[node]["longitude"]), node)
+        nodes = list(distinct.values())
+        if len(nodes) < 2:
+            return 0
+        pick = itemgetter(*nodes)
+        rows = [t[u] for u in nodes]
+        inf = float("inf")
+        dist = [inf] * len(nodes)
+        closed = [0] * len(nodes)  # inf once a node joins the tree
+        total, current = 0, 0
+        for _ in range(len(nodes) - 1):
+            closed[current] = inf
+            u = nodes[current]
+            dist = list(map(min, dist, pick(t[u]), map(itemgetter(u), rows)))
+            candidates = list(map(max, dist, closed))
+            current = min(range(len(nodes)), key=candidates.__getitem__)
+            total += dist[current]
+        return total
+
+    def objective(self, assigned: List[Dict], unassigned_count: int) -> int:
+        """
+        Objective of a plan in the same units as the bound.
+
+        Args:
+            assigned (list[dict]): Assignment records (``route_nodes`` start at the depot).
+            unassigned_count (int): Number of requests left unassigned.
+
+        Returns:
+            int: Travel seconds over all routes plus unassigned penalties.
+        """
+        t = self.time_matrix
+        depot = self.problem.depot_index
+        travel = 0
+        for assignment in assigned:
+            nodes = list(assignment["route_nodes"]) + [depot]
+            travel += sum(t[a][b] for a, b in zip(nodes, nodes[1:]))
+        return travel + unassigned_count * self.penalty
+
+    def stats(self, result: Dict, request_indices: Optional[Iterable[int]] = None) -> Dict[str, float]:
+        """Objective, bound and gap of a solver result."""
+        objective = self.objective(result["assigned"], len(result["unassigned_requests"]))
+        bound = self.value(request_indices)
+        return {"objective": objective, "lower_bound": bound, "optimality_gap": optimality_gap(objective, bound)}
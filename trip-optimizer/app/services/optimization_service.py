@@ -5,20 +5,25 @@ Service layer for running optimization workflows:
 - Groups requests by date
 - Filters available vehicles
 - Executes the solver
-- Persists results to the database
+- Builds the job result (the caller persists it)
 """
 
 # Standard library imports
-from datetime import datetime, timezone
-from typing import List, Dict, Any
+import time
+from datetime import datetime, timedelta, timezone
+from typing import List, Dict, Any, Union
 
 # Third-party imports
 from sqlalchemy.orm import Session
 
 # Local application imports
+from app.core.config import settings
 from app.models import schemas
-from app.services.data_manager import DataManager
-from app.services.optimization_solver import OptimizationSolver
+from app.services.heuristic_solver import HeuristicSolver
+from app.services.instance_capture import capture_instance, should_capture
+from app.services.lower_bound import optimality_gap
+from app.services.rolling_horizon import RollingHorizon, use_rolling_horizon
+from app.services.routing_problem import RoutingProblem
 
 
 # -----------------------------------------------------------------------------
@@ -32,7 +37,7 @@ class OptimizationService:
         - Preprocess and group booking requests by date
         - Filter vehicles based on availability
         - Run the optimization solver
-        - Save and return scheduled trips
+        - Return scheduled trips
     """
 
     def __init__(self, db_session: Session):
@@ -43,7 +48,6 @@ class OptimizationService:
             db_session (Session): Active SQLAlchemy session.
         """
         self.db = db_session
-        self.data_manager = DataManager(db_session)
 
     # -------------------------------------------------------------------------
     # Utility helpers
@@ -51,63 +55,59 @@ class OptimizationService:
     # Legacy helpers removed: grouping/availability handled upstream
 
     # -------------------------------------------------------------------------
-    # Main workflow
+    # Result translation
     # -------------------------------------------------------------------------
-    def run_optimization(
-        self,
-        job_id: str,
-        optimization_request: schemas.OptimizationRequest
-    ) -> schemas.OptimizationResult:
+    @staticmethod
+    def build_scheduled_trips(
+        solver: RoutingProblem,
+        solve_result: Dict[str, Any]
+    ) -> List[schemas.ScheduledTrip]:
         """
-        Execute the optimization process and persist results.
-
-        Steps:
-            1. Convert Pydantic schemas to dictionaries.
-            2. Group requests by date.
-            3. Filter vehicles by availability for each date.
-            4. Run the solver for each date and collect trips.
-            5. Save results and trips to the database.
+        Convert raw solver assignments into ScheduledTrip schemas.
 
         Args:
-            job_id (str): Unique job identifier.
-            optimization_request (OptimizationRequest): Input data for optimization.
+            solver (RoutingProblem): Solver instance that produced the result.
+            solve_result (dict): Output of ``solver.solve()`` (or an equivalent
+                dict with an "assigned" list).
 
         Returns:
-            OptimizationResult: Final result containing scheduled trips.
+            list[ScheduledTrip]: One scheduled trip per assigned vehicle route.
         """
-        # Convert input schemas to raw dictionaries
-        vehicles = [v.model_dump(mode="json") for v in optimization_request.vehicles]
-        requests = [r.model_dump(mode="json") for r in optimization_request.requests]
-
-        all_scheduled_trips: List[schemas.ScheduledTrip] = []
-        all_unassigned: List[str] = []
-
-        # Solve once with provided vehicles and booking requests
-        solver = OptimizationSolver(vehicles, requests)
-        solve_result = solver.solve()
+        scheduled_trips: List[schemas.ScheduledTrip] = []
 
-        # Build ScheduledTrip objects from solver output
         for assigned in solve_result.get("assigned", []):
             stops: List[schemas.TripStop] = []
 
-            # Construct stop sequence with basic type inference
+            # Service start per stop (seconds since the solver anchor), end depot last
+            stop_times = assigned.get("stop_times") or []
+
+            def eta(position: int) -> datetime:
+                if position < len(stop_times):
+                    return solver.anchor_dt_utc + timedelta(seconds=stop_times[position])
+                return datetime.now(timezone.utc)
+
+            # Construct stop sequence; each pickup/dropoff is tagged with its request
             for i, node_idx in enumerate(assigned["route_nodes"]):
                 loc = solver.locations[node_idx]
+                location_id = "DEPOT"
+                request_id = None
                 if node_idx == solver.depot_index and i == 0:
                     stop_type = "start"
+                elif node_idx in solver.node_to_request:
+                    ridx, stop_type = solver.node_to_request[node_idx]
+                    req = solver.requests[ridx]
+                    request_id = req["id"]
+                    location_id = req[f"{stop_type}_location"]["id"]
                 else:
                     stop_type = "pickup"
-                    for pair in solver.pickup_drop_pairs:
-                        if node_idx == pair[1]:
-                            stop_type = "dropoff"
-                            break
                 stops.append(
                     schemas.TripStop(
-                        location_id="",
+                        location_id=location_id,
                         latitude=loc["latitude"],
                         longitude=loc["longitude"],
-                        estimated_arrival_time=datetime.now(timezone.utc),  # TODO: refine with cumul times
+                        estimated_arrival_time=eta(i),
                         type=stop_type,
+                        request_id=request_id,
                     )
                 )
 
@@ -115,10 +115,10 @@ class OptimizationService:
             dep = solver.locations[solver.depot_index]
             stops.append(
                 schemas.TripStop(
-                    location_id="",
+                    location_id="DEPOT",
                     latitude=dep["latitude"],
                     longitude=dep["longitude"],
-                    estimated_arrival_time=datetime.now(timezone.utc),
+                    estimated_arrival_time=eta(len(assigned["route_nodes"])),
                     type="end",
                 )
             )
@@ -135,19 +135,113 @@ class OptimizationService:
                 else datetime.now()
             )
 
-            scheduled_trip = schemas.ScheduledTrip(
-                vehicle_id=assigned["vehicle_id"],
-                combined_request_ids=assigned["requests"],
-                trip_start_time=start_dt,
-                trip_end_time=end_dt,
-                total_duration_minutes=int((assigned.get("total_time_s") or 0) / 60),
-                total_distance_meters=assigned.get("total_distance_m", 0),
-                route=stops,
+            scheduled_trips.append(
+                schemas.ScheduledTrip(
+                    vehicle_id=assigned["vehicle_id"],
+                    combined_request_ids=assigned["requests"],
+                    trip_start_time=start_dt,
+                    trip_end_time=end_dt,
+                    total_duration_minutes=int((assigned.get("total_time_s") or 0) / 60),
+                    total_distance_meters=assigned.get("total_distance_m", 0),
+                    route=stops,
+                )
             )
-            all_scheduled_trips.append(scheduled_trip)
 
-        # Collect unassigned requests
-        all_unassigned.extend(solve_result.get("unassigned_requests", []))
+        return scheduled_trips
+
+    @staticmethod
+    def solver_stats(solve_results: List[Dict[str, Any]]) -> schemas.SolverStats | None:
+        """
+        Combine per-window objectives and lower bounds into one gap.
+
+        Args:
+            solve_results (list[dict]): Solver outputs with "objective" and "lower_bound".
+
+        Returns:
+            SolverStats | None: Totals and gap, or None when a result has no bound.
+        """
+        if not solve_results or any("lower_bound" not in r for r in solve_results):
+            return None
+        objective = sum(r["objective"] for r in solve_results)
+        bound = sum(r["lower_bound"] for r in solve_results)
+        stats = schemas.SolverStats(
+            objective=objective,
+            lower_bound=bound,
+            optimality_gap=round(optimality_gap(objective, bound), 4),
+            stopped_early=any(r.get("stopped_early") for r in solve_results),
+        )
+        print(
+            f"[SOLVER] Objective {stats.objective}, lower bound {stats.lower_bound}, "
+            f"gap {stats.optimality_gap:.1%}{' (stopped early)' if stats.stopped_early else ''}"
+        )
+        return stats
+
+    # -------------------------------------------------------------------------
+    # Main workflow
+    # -------------------------------------------------------------------------
+    def run_optimization(
+        self,
+        job_id: str,
+        optimization_request: Union[schemas.OptimizationRequest, schemas.CompactOptimizationRequest],
+    ) -> schemas.OptimizationResult:
+        """
+        Execute the optimization process and build the job result.
+
+        Nothing is written to the database here; the worker stores the result
+        (and trips) with its serialized body in a single commit.
+
+        Steps:
+            1. Convert Pydantic schemas to dictionaries.
+            2. Group requests by date.
+            3. Filter vehicles by availability for each date.
+            4. Run the selected solver (OR-Tools or heuristic) and collect trips,
+               window by window for multi-day payloads (rolling horizon).
+            5. Capture the solver input when CAPTURE_MODE asks for it.
+
+        Args:
+            job_id (str): Unique job identifier.
+            optimization_request (OptimizationRequest | CompactOptimizationRequest):
+                Input data for optimization, in either payload format.
+
+        Returns:
+            OptimizationResult: Final result containing scheduled trips.
+        """
+        # Convert input schemas to raw dictionaries
+        vehicles, requests = optimization_request.solver_input()
+
+        all_scheduled_trips: List[schemas.ScheduledTrip] = []
+        all_unassigned: List[str] = []
+
+        # Solve once with provided vehicles and booking requests
+        mode = optimization_request.solver_mode or settings.SOLVER_DEFAULT_MODE
+        if mode == "heuristic":
+            solver_cls = HeuristicSolver
+        else:
+            # Imported here so OR-Tools is only loaded on the solve path
+            from app.services.optimization_solver import OptimizationSolver
+            solver_cls = OptimizationSolver
+        started = time.perf_counter()
+        if use_rolling_horizon(requests):
+            # Multi-day payloads: one model per window, committed in order
+            windows = RollingHorizon(solver_cls, vehicles, requests).solve()
+        else:
+            solver = solver_cls(vehicles, requests)
+            windows = [(solver, solver.solve())]
+        solve_seconds = time.perf_counter() - started
+
+        # Opt-in capture of the solver input for offline replay; never fails the job
+        if should_capture(solve_seconds):
+            try:
+                capture_instance(job_id, mode, windows, solve_seconds)
+            except Exception as e:
+                print(f"[CAPTURE] Failed to capture job {job_id}: {e}")
+
+        for solver, solve_result in windows:
+            # Build ScheduledTrip objects from solver output
+            all_scheduled_trips.extend(self.build_scheduled_trips(solver, solve_result))
+
+            # Collect unassigned requests
+            all_unassigned.extend(solve_result.get("unassigned_requests", []))
 
         # Compile final result
         result = schemas.OptimizationResult(
@@ -155,10 +249,6 @@ class OptimizationService:
             status="completed",
             scheduled_trips=all_scheduled_trips,
             unassigned_requests=all_unassigned,
+            solver_stats=self.solver_stats([solve_result for _, solve_result in windows]),
         )
-
-        # Persist results
-        self.data_manager.save_optimization_result(job_id, result)
-        self.data_manager.save_trips(result.scheduled_trips)
-
         return result
@@ -0,0 +1,82 @@
+"""
+app/services/plan_delta.py
+
+Plan deltas between two jobs:
+- Matches trips of a previous plan and a new one by trip key (vehicle plus
+  the set of requests served), so a re-optimization that keeps most trips
+  reports only the trips that were added, modified or removed.
+- A trip with the same key whose times, stop order or distances differ is
+  "modified"; a vehicle whose request set changed has its old trip removed
+  and its new one added.
+- Lets the booking server apply a re-optimization with writes proportional
+  to the change instead of deleting and rewriting every trip.
+"""
+
+# Standard library imports
+from typing import Any, Dict, Optional
+
+# Local application imports
+from app.models import schemas
+
+
+def _trips_by_key(result: Optional[Dict[str, Any]]) -> Dict[str, schemas.ScheduledTrip]:
+    """Trips of a stored result, keyed by trip key (plan order preserved)."""
+    trips = (schemas.ScheduledTrip(**data) for data in (result or {}).get("scheduled_trips", []))
+    return {trip.trip_key: trip for trip in trips}
+
+
+def _schedule(trip: schemas.ScheduledTrip) -> Dict[str, Any]:
+    """What a modification compares: everything but the listing order of request IDs."""
+    data = trip.model_dump(mode="json")
+    data["combined_request_ids"] = sorted(data["combined_request_ids"])
+    return data
+
+
+def diff_plans(
+    job_id: str,
+    previous_job_id: str,
+    result: Optional[Dict[str, Any]],
+    previous_result: Optional[Dict[str, Any]],
+) -> schemas.PlanDelta:
+    """
+    Compute the delta from a previous job's plan to this job's.
+
+    Args:
+        job_id (str): Job whose plan is the new state.
+        previous_job_id (str): Job whose plan is replaced.
+        result (dict | None): Stored result of ``job_id``.
+        previous_result (dict | None): Stored result of ``previous_job_id``.
+
+    Returns:
+        PlanDelta: Added and modified trips (in this plan's order), keys of
+        removed trips, the unchanged count and requests whose assignment
+        status flipped.
+    """
+    trips = _trips_by_key(result)
+    previous_trips = _trips_by_key(previous_result)
+
+    added, modified, unchanged = [], [], 0
+    for key, trip in trips.items():
+        previous = previous_trips.get(key)
+        if previous is None:
+            added.append(trip)
+        elif _schedule(previous) != _schedule(trip):
+            modified.append(trip)
+        else:
+            unchanged += 1
+
+    unassigned = set((result or {}).get("unassigned_requests", []))
+    previous_unassigned = set((previous_result or {}).get("unassigned_requests", []))
+    served = {rid for trip in trips.values() for rid in trip.combined_request_ids}
+    previously_served = {rid for trip in previous_trips.values() for rid in trip.combined_request_ids}
+
+    return schemas.PlanDelta(
+        job_id=job_id,
+        previous_job_id=previous_job_id,
+        added=added,
+        modified=modified,
+        removed_trip_keys=[key for key in previous_trips if key not in trips],
+        unchanged_count=unchanged,
+        newly_unassigned=sorted(unassigned & previously_served),
+        newly_assigned=sorted(previous_unassigned & served),
+    )
@@ -0,0 +1,264 @@
+"""
+app/services/repair_service.py
+
+Service layer for local plan repair:
+- Removes cancelled requests and unavailable vehicles from an existing plan
+- Re-inserts orphaned requests into the remaining vehicles
+- Persists the repaired plan as a new job, reporting only the changed trips
+"""
+
+# Standard library imports
+import time
+from typing import Dict, List, Set, Tuple
+
+# Third-party imports
+from sqlalchemy.orm import Session
+
+# Local application imports
+from app.core.config import settings
+from app.db import models
+from app.models import schemas
+from app.services.optimization_service import OptimizationService
+from app.services.result_cache import result_bodies
+from app.services.route_insertion import RouteInsertion
+from app.services.routing_problem import RoutingProblem
+
+
+# -----------------------------------------------------------------------------
+# Repair Service
+# -----------------------------------------------------------------------------
+class RepairService:
+    """
+    Repairs a finished plan locally instead of re-running the full solver.
+
+    Responsibilities:
+        - Rebuild solver node routes from a stored result
+        - Drop removed requests and vehicles, collecting orphaned requests
+        - Re-insert orphans by cheapest insertion within a time budget
+        - Store the repaired plan and report which trips changed
+    """
+
+    def __init__(self, db_session: Session):
+        """
+        Initialize the RepairService with a database session.
+
+        Args:
+            db_session (Session): Active SQLAlchemy session.
+        """
+        self.db = db_session
+
+    # -------------------------------------------------------------------------
+    # Route reconstruction
+    # -------------------------------------------------------------------------
+    @staticmethod
+    def _route_from_trip(
+        solver: RoutingProblem,
+        insertion: RouteInsertion,
+        vehicle_idx: int,
+        trip: schemas.ScheduledTrip,
+        request_index: Dict[str, int],
+    ) -> Tuple[List[int], List[int]]:
+        """
+        Convert a stored trip back into a solver node route.
+
+        Stops tagged with ``request_id`` are mapped directly. Results stored
+        before stops were tagged are rebuilt by inserting the trip's requests
+        one by one into an empty route.
+
+        Returns:
+            tuple: (route nodes, indices of requests that could not be placed).
+        """
+        stops = [s for s in trip.route if s.type in ("pickup", "dropoff")]
+        if stops and all(s.request_id in request_index for s in stops):
+            route = []
+            for stop in stops:
+                pickup, dropoff = solver.pickup_drop_pairs[request_index[stop.request_id]]
+                route.append(pickup if stop.type == "pickup" else dropoff)
+            return route, []
+
+        route: List[int] = []
+        leftover: List[int] = []
+        for rid in trip.combined_request_ids:
+            if rid not in request_index:
+                continue
+            best = insertion.best_insertion(vehicle_idx, route, request_index[rid])
+            if best is None:
+                leftover.append(request_index[rid])
+            else:
+                route = best[1]
+        return route, leftover
+
+    # -------------------------------------------------------------------------
+    # Main workflow
+    # -------------------------------------------------------------------------
+    def repair(
+        self,
+        base_job: models.OptimizationJob,
+        repair_request: schemas.RepairRequest,
+        new_job_id: str,
+    ) -> schemas.RepairResponse:
+        """
+        Repair a completed job's plan and store the result as a new job.
+
+        Args:
+            base_job (OptimizationJob): Completed job with a stored request payload.
+            repair_request (RepairRequest): Requests and vehicles to remove.
+            new_job_id (str): ID for the job that records the repaired plan.
+
+        Returns:
+            RepairResponse: Changed trips, emptied vehicles and unassigned requests.
+
+        Raises:
+            ValueError: If the repair references unknown requests or vehicles, or
+                the base plan has several trips for one vehicle.
+        """
+        started = time.perf_counter()
+        time_limit = repair_request.time_limit_seconds or settings.REPAIR_TIME_LIMIT_SECONDS
+
+        payload = schemas.expand_payload(base_job.request_payload)
+        base_result = schemas.OptimizationResult(
+            **{**(base_job.result or {}), "job_id": base_job.id, "status": base_job.status}
+        )
+
+        # Local repair edits one route per vehicle; rolling-horizon plans may hold several
+        trip_vehicles = [trip.vehicle_id for trip in base_result.scheduled_trips]
+        if len(trip_vehicles) != len(set(trip_vehicles)):
+            raise ValueError("Plans with several trips per vehicle (rolling horizon) cannot be repaired locally.")
+
+        request_index = {r["id"]: idx for idx, r in enumerate(payload["requests"])}
+        vehicle_index = {v["id"]: idx for idx, v in enumerate(payload["vehicles"])}
+        removed_requests: Set[str] = set(repair_request.remove_request_ids)
+        removed_vehicles: Set[str] = set(repair_request.remove_vehicle_ids)
+
+        unknown = sorted((removed_requests - request_index.keys()) | (removed_vehicles - vehicle_index.keys()))
+        if unknown:
+            raise ValueError(f"Unknown request or vehicle IDs: {', '.join(unknown)}")
+
+        # Rebuild the problem from the original payload so node indices and
+        # deadlines match the stored plan
+        solver = RoutingProblem(payload["vehicles"], payload["requests"])
+        dist_matrix, time_matrix = solver.build_matrices()
+        insertion = RouteInsertion(solver, dist_matrix, time_matrix)
+
+        routes: Dict[int, List[int]] = {}
+        base_trips: Dict[str, schemas.ScheduledTrip] = {}
+        changed: Set[int] = set()
+        orphans: List[int] = []
+
+        for trip in base_result.scheduled_trips:
+            v_idx = vehicle_index.get(trip.vehicle_id)
+            if v_idx is None:
+                continue
+            base_trips[trip.vehicle_id] = trip
+            route, leftover = self._route_from_trip(solver, insertion, v_idx, trip, request_index)
+            if leftover:
+                changed.add(v_idx)
+                orphans.extend(leftover)
+
+            if trip.vehicle_id in removed_vehicles:
+                # Every request the vehicle carried is orphaned
+                orphans.extend(
+                    solver.node_to_request[node][0]
+                    for node in route
+                    if solver.node_to_request[node][1] == "pickup"
+                )
+                changed.add(v_idx)
+                continue
+
+            kept = [
+                node for node in route
+                if solver.requests[solver.node_to_request[node][0]]["id"] not in removed_requests
+            ]
+            if len(kept) != len(route):
+                changed.add(v_idx)
+            routes[v_idx] = kept
+
+        # Re-insert orphans, most urgent first, under the time budget
+        orphans = [r for r in dict.fromkeys(orphans) if solver.requests[r]["id"] not in removed_requests]
+        orphans.sort(key=lambda r: solver._dropoff_deadlines_abs[r])
+        candidates = [
+            v_idx for v_idx, v in enumerate(solver.vehicles)
+            if v["id"] not in removed_vehicles
+        ]
+        still_unassigned: List[str] = []
+        for ridx in orphans:
+            if time.perf_counter() - started > time_limit:
+                still_unassigned.append(solver.requests[ridx]["id"])
+                continue
+            best_vehicle = None
+            best_move = None
+            for v_idx in candidates:
+                move = insertion.best_insertion(v_idx, routes.get(v_idx, []), ridx)
+                if move and (best_move is None or move[0] < best_move[0]):
+                    best_vehicle, best_move = v_idx, move
+            if best_move is None:
+                still_unassigned.append(solver.requests[ridx]["id"])
+                continue
+            routes[best_vehicle] = best_move[1]
+            changed.add(best_vehicle)
+
+        # Assemble the repaired plan, reusing untouched trips verbatim
+        rebuilt: Dict[str, schemas.ScheduledTrip] = {}
+        assigned = []
+        for v_idx in sorted(changed):
+            route = routes.get(v_idx)
+            if not route:
+                continue
+            assignment = solver.summarize_route(
+                v_idx, [solver.depot_index] + route, dist_matrix, time_matrix
+            )
+            if assignment:
+                assigned.append(assignment)
+        for trip in OptimizationService.build_scheduled_trips(solver, {"assigned": assigned}):
+            rebuilt[trip.vehicle_id] = trip
+
+        scheduled_trips: List[schemas.ScheduledTrip] = []
+        for vehicle_id, trip in base_trips.items():
+            if vehicle_id in rebuilt:
+                scheduled_trips.append(rebuilt.pop(vehicle_id))
+            elif vehicle_index[vehicle_id] not in changed:
+                scheduled_trips.append(trip)
+        scheduled_trips.extend(rebuilt.values())
+
+        changed_ids = {solver.vehicles[v_idx]["id"] for v_idx in changed}
+        changed_trips = [t for t in scheduled_trips if t.vehicle_id in changed_ids]
+        kept_vehicle_ids = {t.vehicle_id for t in scheduled_trips}
+        removed_trip_vehicle_ids = [vid for vid in base_trips if vid not in kept_vehicle_ids]
+
+        unassigned = [
+            rid for rid in base_result.unassigned_requests if rid not in removed_requests
+        ] + still_unassigned
+
+        result = schemas.OptimizationResult(
+            job_id=new_job_id,
+            status="completed",
+            message=f"Local repair of {base_job.id}",
+            scheduled_trips=scheduled_trips,
+            unassigned_requests=unassigned,
+        )
+
+        # Persist as a new job so it can be fetched or repaired again
+        reduced_payload = {
+            **payload,
+            "vehicles": [v for v in payload["vehicles"] if v["id"] not in removed_vehicles],
+            "requests": [r for r in payload["requests"] if r["id"] not in removed_requests],
+        }
+        self.db.add(models.OptimizationJob(
+            id=new_job_id,
+            status=result.status,
+            result=result.model_dump(mode="json"),
+            **result_bodies(result),
+            request_payload=reduced_payload,
+            base_job_id=base_job.id,
+        ))
+        self.db.commit()
+
+        return schemas.RepairResponse(
+            job_id=new_job_id,
+            base_job_id=base_job.id,
+            status=result.status,
+            changed_trips=changed_trips,
+            removed_trip_vehicle_ids=removed_trip_vehicle_ids,
+            unassigned_requests=unassigned,
+            elapsed_ms=int((time.perf_counter() - started) * 1000),
+        )
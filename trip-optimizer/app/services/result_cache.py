@@ -0,0 +1,194 @@
+"""
+app/services/result_cache.py
+
+Pre-serialized optimization results:
+- Serializes a finished result once into gzip-compressed JSON bytes plus a
+  content hash used as its ETag.
+- Keeps the hottest results in a small in-process LRU bounded by entries
+  and bytes, so repeated polls skip the database blob read entirely.
+- Serializes the same result as MessagePack for clients that ask for it;
+  that representation is stored next to the JSON body, has its own ETag and
+  is cached alongside.
+"""
+
+# Standard library imports
+import gzip
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+# Local application imports
+from app.core.config import settings
+from app.models import schemas
+from app.utils.msgpack_utils import header_qualities, packb
+
+
+# -----------------------------------------------------------------------------
+# Serialization
+# -----------------------------------------------------------------------------
+def serialize_result(result: schemas.OptimizationResult) -> Tuple[bytes, str]:
+    """
+    Serialize a result for storage and direct serving.
+
+    Args:
+        result (OptimizationResult): Final job result.
+
+    Returns:
+        tuple: (gzip-compressed JSON bytes, quoted strong ETag of the JSON).
+    """
+    body = result.model_dump_json().encode("utf-8")
+    etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+    # mtime=0 keeps the compressed bytes deterministic for identical results
+    return gzip.compress(body, compresslevel=settings.RESULT_GZIP_LEVEL, mtime=0), etag
+
+
+def serialize_result_msgpack(result: schemas.OptimizationResult) -> bytes:
+    """
+    Serialize a result as MessagePack, datetimes as timestamps.
+
+    Args:
+        result (OptimizationResult): Final job result.
+
+    Returns:
+        bytes: Gzip-compressed MessagePack body.
+    """
+    body = packb(result.model_dump())
+    return gzip.compress(body, compresslevel=settings.RESULT_GZIP_LEVEL, mtime=0)
+
+
+def result_bodies(result: schemas.OptimizationResult) -> Dict[str, Any]:
+    """
+    Every pre-serialized body of a result, as OptimizationJob column values.
+
+    Args:
+        result (OptimizationResult): Final job result.
+
+    Returns:
+        dict: ``result_blob``, ``result_etag`` and ``result_msgpack_blob``.
+    """
+    result_blob, result_etag = serialize_result(result)
+    return {
+        "result_blob": result_blob,
+        "result_etag": result_etag,
+        "result_msgpack_blob": serialize_result_msgpack(result),
+    }
+
+
+def serialize_stored_result(data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Validate a stored result dictionary and serialize it like ``result_bodies``.
+
+    Used once per job to backfill bodies of jobs that finished before results
+    were pre-serialized; CPU-bound, so async callers run it in a thread.
+
+    Args:
+        data (dict): Stored ``result`` column with ``job_id`` and ``status`` set.
+
+    Returns:
+        dict: ``result_blob``, ``result_etag`` and ``result_msgpack_blob``.
+    """
+    return result_bodies(schemas.OptimizationResult(**data))
+
+
+def msgpack_etag(etag: str) -> str:
+    """ETag of the MessagePack representation of the result with ``etag``."""
+    return f'"{etag.strip(chr(34))}-msgpack"'
+
+
+def msgpack_cache_key(job_id: str) -> str:
+    """Result cache key of a job's MessagePack representation."""
+    return f"{job_id}#msgpack"
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Check an If-None-Match header against an ETag (weak comparison).
+
+    Args:
+        if_none_match (str | None): Raw header value.
+        etag (str): Current quoted ETag.
+
+    Returns:
+        bool: True if the client's copy is current.
+    """
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+def accepts_gzip(accept_encoding: Optional[str]) -> bool:
+    """
+    Check whether an Accept-Encoding header allows a gzip body.
+
+    Codings are matched as whole tokens with their q-values: ``gzip;q=0``
+    refuses gzip, and ``*`` covers it only when gzip is not listed.
+
+    Args:
+        accept_encoding (str | None): Raw header value.
+
+    Returns:
+        bool: True if the stored gzip body can be sent as is.
+    """
+    quality = header_qualities(accept_encoding)
+    return quality.get("gzip", quality.get("*", 0.0)) > 0
+
+
+# -----------------------------------------------------------------------------
+# Result Cache
+# -----------------------------------------------------------------------------
+class ResultCache:
+    """
+    Thread-safe LRU of compressed results keyed by job ID.
+
+    Entries carry their ETag; a lookup with a different ETag is a miss, so a
+    stale entry is never served.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int):
+        """
+        Args:
+            max_entries (int): Maximum number of cached results.
+            max_bytes (int): Maximum total size of cached compressed bytes.
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, Tuple[str, bytes]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, job_id: str, etag: str) -> Optional[bytes]:
+        """Return the cached compressed bytes for ``job_id`` if its ETag matches."""
+        with self._lock:
+            entry = self._entries.get(job_id)
+            if entry is None or entry[0] != etag:
+                return None
+            self._entries.move_to_end(job_id)
+            return entry[1]
+
+    def put(self, job_id: str, etag: str, blob: bytes) -> None:
+        """Cache a compressed result, evicting least recently used entries."""
+        if len(blob) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(job_id, None)
+            if old is not None:
+                self._bytes -= len(old[1])
+            self._entries[job_id] = (etag, blob)
+            self._bytes += len(blob)
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+
+    def clear(self) -> None:
+        """Drop every cached result."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+
+# -----------------------------------------------------------------------------
+# Global cache instance
+# -----------------------------------------------------------------------------
+result_cache = ResultCache(settings.RESULT_CACHE_MAX_ENTRIES, settings.RESULT_CACHE_MAX_BYTES)
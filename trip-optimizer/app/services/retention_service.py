@@ -0,0 +1,243 @@
+"""
+app/services/retention_service.py
+
+Retention and compaction of finished jobs:
+- Removes finished jobs older than JOB_RETENTION_DAYS or beyond the newest
+  JOB_RETENTION_MAX_JOBS, together with their staging rows.
+- Archives each removed job (request payload and result) to gzip-compressed
+  JSON lines under JOB_ARCHIVE_DIR. The file is staged under a ``.partial``
+  name and renamed only once the deletion commits, so a failed batch leaves
+  no archive behind and is archived exactly once when it is retried.
+- Returns freed SQLite pages to the OS with incremental vacuum.
+- Reports per-table row counts and sizes.
+
+Work is done in batches of RETENTION_BATCH_SIZE jobs, one short transaction
+each, so live job traffic is never locked out for long.
+"""
+
+# Standard library imports
+import gzip
+import json
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Third-party imports
+from sqlalchemy import delete, func, or_, select, text
+from sqlalchemy.orm import Session
+
+# Local application imports
+from app.core.config import settings
+from app.db import models
+from app.db.session import Base
+from app.services.data_manager import DataManager
+
+Job = models.OptimizationJob
+
+# SQLite's PRAGMA auto_vacuum values
+_AUTO_VACUUM_MODES = {0: "none", 1: "full", 2: "incremental"}
+
+
+# -----------------------------------------------------------------------------
+# Retention Service
+# -----------------------------------------------------------------------------
+class RetentionService:
+    """
+    Applies the job retention policy and reports storage usage.
+
+    Pending jobs are never removed. Several workers may run retention at the
+    same time: a job is archived only by the worker whose DELETE removed it.
+    """
+
+    def __init__(self, db: Session):
+        """
+        Args:
+            db (Session): Database session.
+        """
+        self.db = db
+        self.backend = db.get_bind().dialect.name
+
+    # -------------------------------------------------------------------------
+    # Retention
+    # -------------------------------------------------------------------------
+    def _expired(self):
+        """Filter for finished jobs outside the retention window (None if unlimited)."""
+        conditions = []
+        if settings.JOB_RETENTION_DAYS > 0:
+            cutoff = datetime.now(timezone.utc) - timedelta(days=settings.JOB_RETENTION_DAYS)
+            conditions.append(Job.created_at < cutoff)
+        if settings.JOB_RETENTION_MAX_JOBS > 0:
+            newest = (
+                select(Job.id).order_by(Job.created_at.desc(), Job.id.desc())
+                .limit(settings.JOB_RETENTION_MAX_JOBS)
+            )
+            conditions.append(Job.id.not_in(newest.scalar_subquery()))
+        if not conditions:
+            return None
+        return (Job.status != "pending") & or_(*conditions)
+
+    def remove_expired_batch(self, batch_size: Optional[int] = None) -> int:
+        """
+        Archive and delete one batch of expired jobs in a single transaction.
+
+        Args:
+            batch_size (int | None): Jobs per batch (defaults to RETENTION_BATCH_SIZE).
+
+        Returns:
+            int: Number of jobs removed.
+        """
+        expired = self._expired()
+        if expired is None:
+            return 0
+        jobs = self.db.execute(
+            select(
+                Job.id, Job.status, Job.base_job_id, Job.attempts, Job.created_at, Job.updated_at,
+                Job.request_payload, Job.result,
+            )
+            .where(expired)
+            .order_by(Job.created_at, Job.id)
+            .limit(batch_size or settings.RETENTION_BATCH_SIZE)
+        ).all()
+        if not jobs:
+            return 0
+
+        ids = [job.id for job in jobs]
+        staged = None
+        try:
+            for model in DataManager.STAGING_MODELS:
+                self.db.execute(delete(model).where(model.job_id.in_(ids)))
+            # Archive only the jobs this session actually deleted
+            removed = set(self.db.scalars(delete(Job).where(Job.id.in_(ids)).returning(Job.id)).all())
+            if settings.JOB_ARCHIVE_DIR:
+                staged = self._archive([job for job in jobs if job.id in removed])
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            if staged is not None:
+                staged.unlink(missing_ok=True)
+            raise
+        if staged is not None:
+            # Published only now: the jobs are gone from the database for good
+            staged.rename(staged.with_suffix(""))
+        return len(removed)
+
+    def _archive(self, jobs: List) -> Optional[Path]:
+        """Write jobs to a new ``.jsonl.gz.partial`` file and return its path."""
+        if not jobs:
+            return None
+        archive_dir = Path(settings.JOB_ARCHIVE_DIR)
+        archive_dir.mkdir(parents=True, exist_ok=True)
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
+        path = archive_dir / f"jobs-{stamp}-{uuid.uuid4().hex[:8]}.jsonl.gz.partial"
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            for job in jobs:
+                record = {
+                    "id": job.id,
+                    "status": job.status,
+                    "base_job_id": job.base_job_id,
+                    "attempts": job.attempts,
+                    "created_at": job.created_at.isoformat() if job.created_at else None,
+                    "updated_at": job.updated_at.isoformat() if job.updated_at else None,
+                    "request_payload": job.request_payload,
+                    "result": job.result,
+                }
+                f.write(json.dumps(record, separators=(",", ":")) + "\n")
+        return path
+
+    def incremental_vacuum(self, pages: Optional[int] = None) -> int:
+        """
+        Return up to ``pages`` free pages to the OS (SQLite in incremental mode).
+
+        Other backends reclaim space with their own autovacuum; this is a no-op.
+
+        Args:
+            pages (int | None): Page budget (defaults to VACUUM_INCREMENTAL_PAGES).
+
+        Returns:
+            int: Number of pages released.
+        """
+        if self.backend != "sqlite":
+            return 0
+        budget = int(pages or settings.VACUUM_INCREMENTAL_PAGES)
+        # sqlite3's execute() steps a statement once, i.e. frees a single page;
+        # executescript() runs the pragma to completion in its own transaction
+        raw = self.db.get_bind().raw_connection()
+        try:
+            cursor = raw.cursor()
+            if cursor.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+                return 0
+            before = cursor.execute("PRAGMA freelist_count").fetchone()[0]
+            cursor.executescript(f"PRAGMA incremental_vacuum({budget});")
+            return before - cursor.execute("PRAGMA freelist_count").fetchone()[0]
+        finally:
+            raw.close()
+
+    def run(self) -> Dict[str, int]:
+        """
+        Remove all expired jobs batch by batch, then vacuum incrementally.
+
+        Returns:
+            dict: Number of ``removed`` jobs and ``vacuumed_pages``.
+        """
+        removed = 0
+        while True:
+            batch = self.remove_expired_batch()
+            removed += batch
+            if batch < settings.RETENTION_BATCH_SIZE:
+                break
+        return {"removed": removed, "vacuumed_pages": self.incremental_vacuum()}
+
+    # -------------------------------------------------------------------------
+    # Reporting
+    # -------------------------------------------------------------------------
+    def storage_report(self) -> Dict:
+        """
+        Row counts and sizes of every table, plus database-level usage.
+
+        Returns:
+            dict: Fields of schemas.StorageReport.
+        """
+        conn = self.db.connection()
+        sizes: Dict[str, int] = {}
+        database_bytes = free_bytes = auto_vacuum = None
+
+        if self.backend == "sqlite":
+            page_size = conn.execute(text("PRAGMA page_size")).scalar()
+            database_bytes = conn.execute(text("PRAGMA page_count")).scalar() * page_size
+            free_bytes = conn.execute(text("PRAGMA freelist_count")).scalar() * page_size
+            auto_vacuum = _AUTO_VACUUM_MODES.get(conn.execute(text("PRAGMA auto_vacuum")).scalar())
+            try:
+                # dbstat is optional in SQLite builds; indexes are attributed via sqlite_master
+                rows = conn.execute(text(
+                    "SELECT COALESCE(m.tbl_name, s.name), SUM(s.pgsize) FROM dbstat s "
+                    "LEFT JOIN sqlite_master m ON m.name = s.name GROUP BY 1"
+                )).all()
+                sizes = {name: size for name, size in rows}
+            except Exception:
+                self.db.rollback()
+                conn = self.db.connection()
+        elif self.backend == "postgresql":
+            database_bytes = conn.execute(text("SELECT pg_database_size(current_database())")).scalar()
+            for table in Base.metadata.sorted_tables:
+                sizes[table.name] = conn.execute(
+                    text("SELECT pg_total_relation_size(CAST(:name AS regclass))"), {"name": table.name}
+                ).scalar()
+
+        tables = [
+            {
+                "name": table.name,
+                "rows": conn.execute(select(func.count()).select_from(table)).scalar(),
+                "bytes": sizes.get(table.name),
+            }
+            for table in Base.metadata.sorted_tables
+        ]
+        return {
+            "backend": self.backend,
+            "database_bytes": database_bytes,
+            "free_bytes": free_bytes,
+            "auto_vacuum": auto_vacuum,
+            "tables": tables,
+            "retention_days": settings.JOB_RETENTION_DAYS,
+            "retention_max_jobs": settings.JOB_RETENTION_MAX_JOBS,
+        }
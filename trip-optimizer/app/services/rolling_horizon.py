@@ -0,0 +1,125 @@
+"""
+app/services/rolling_horizon.py
+
+Rolling-horizon solving for booking windows longer than a day:
+- Splits requests by dropoff time into consecutive windows of
+  SOLVER_HORIZON_WINDOW_HOURS, each solved together with a look-ahead of
+  SOLVER_HORIZON_OVERLAP_HOURS.
+- Commits the routes that serve the window's own requests; look-ahead
+  requests on routes that were not committed go back to the next window.
+- Carries each vehicle's end state into later windows: a vehicle leaves the
+  depot no earlier than its last committed trip returned there.
+
+Each window is a model of about one day of requests, so runtime grows
+linearly with the number of days rather than with the size of one model.
+"""
+
+# Standard library imports
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple, Type
+
+# Local application imports
+from app.core.config import settings
+from app.services.routing_problem import RoutingProblem, dropoff_time_utc
+
+
+def use_rolling_horizon(requests: List[Dict], mode: Optional[str] = None) -> bool:
+    """
+    Decide whether a request set is solved in rolling windows.
+
+    Args:
+        requests (list[dict]): Booking requests.
+        mode (str | None): "single", "rolling" or "auto" (defaults to SOLVER_HORIZON_MODE).
+
+    Returns:
+        bool: True to solve with RollingHorizon.
+    """
+    mode = mode or settings.SOLVER_HORIZON_MODE
+    if mode != "auto" or not requests:
+        return mode == "rolling"
+    dropoffs = [dropoff_time_utc(r) for r in requests]
+    span = max(dropoffs) - min(dropoffs)
+    return span > timedelta(hours=settings.SOLVER_HORIZON_WINDOW_HOURS + settings.SOLVER_HORIZON_OVERLAP_HOURS)
+
+
+# -----------------------------------------------------------------------------
+# Rolling Horizon
+# -----------------------------------------------------------------------------
+class RollingHorizon:
+    """
+    Solves a multi-day request set window by window with any RoutingProblem solver.
+
+    ``solve()`` returns one (solver, committed result) pair per window, since
+    route node indices are only meaningful for the solver that produced them.
+    """
+
+    def __init__(
+        self,
+        solver_cls: Type[RoutingProblem],
+        vehicles: List[Dict],
+        requests: List[Dict],
+        window_hours: Optional[int] = None,
+        overlap_hours: Optional[int] = None,
+    ):
+        """
+        Args:
+            solver_cls (type[RoutingProblem]): Solver run on every window.
+            vehicles (list[dict]): Vehicle input data.
+            requests (list[dict]): Booking request input data.
+            window_hours (int | None): Committed span per window
+                (defaults to SOLVER_HORIZON_WINDOW_HOURS).
+            overlap_hours (int | None): Look-ahead span per window
+                (defaults to SOLVER_HORIZON_OVERLAP_HOURS).
+        """
+        self.solver_cls = solver_cls
+        self.vehicles = vehicles
+        self.requests = requests
+        self.window = timedelta(hours=window_hours or settings.SOLVER_HORIZON_WINDOW_HOURS)
+        self.overlap = timedelta(hours=settings.SOLVER_HORIZON_OVERLAP_HOURS if overlap_hours is None else overlap_hours)
+
+    def solve(self) -> List[Tuple[RoutingProblem, Dict]]:
+        """
+        Solve all windows in dropoff order.
+
+        Returns:
+            list[tuple]: (window solver, result) pairs; each result has the shape
+            of ``RoutingProblem.solve()`` restricted to committed routes and to
+            requests finally left unassigned, with objective, bound and gap
+            over the requests the window settles.
+        """
+        pending = sorted(self.requests, key=dropoff_time_utc)
+        ready: Dict[str, datetime] = {}
+        windows: List[Tuple[RoutingProblem, Dict]] = []
+
+        while pending:
+            # Windows start at the next open dropoff, so gaps between bookings are skipped
+            commit_end = dropoff_time_utc(pending[0]) + self.window
+            lookahead_end = commit_end + self.overlap
+            batch = [r for r in pending if dropoff_time_utc(r) < lookahead_end]
+
+            solver = self.solver_cls(self.vehicles, batch, vehicle_ready_times=dict(ready))
+            result = solver.solve()
+
+            in_window = {r["id"] for r in batch if dropoff_time_utc(r) < commit_end}
+            committed = [a for a in result["assigned"] if in_window.intersection(a["requests"])]
+            unassigned = [rid for rid in result["unassigned_requests"] if rid in in_window]
+            for assignment in committed:
+                end = datetime.fromisoformat(assignment["end_time"].replace("Z", "+00:00"))
+                vehicle_id = assignment["vehicle_id"]
+                ready[vehicle_id] = max(ready.get(vehicle_id, end), end)
+
+            done = in_window.union(*(a["requests"] for a in committed))
+            pending = [r for r in pending if r["id"] not in done]
+            window_result = {"assigned": committed, "unassigned_requests": unassigned}
+            # Bound and gap over the requests this window settles
+            window_result.update(solver.lower_bound.stats(
+                window_result, [solver._request_index_by_id[rid] for rid in done]
+            ))
+            window_result["stopped_early"] = result.get("stopped_early", False)
+            windows.append((solver, window_result))
+            print(
+                f"[SOLVER] Rolling window to {commit_end:%Y-%m-%d %H:%M}: {len(batch)} requests, "
+                f"{len(committed)} trips committed, {len(unassigned)} unassigned, {len(pending)} left."
+            )
+
+        return windows
@@ -0,0 +1,229 @@
+"""
+app/services/route_insertion.py
+
+Route feasibility checks and cheapest-insertion moves.
+Mirrors the constraints of the OR-Tools model (capacity, pickup before dropoff,
+pickup windows, dropoff deadlines, service times, waiting limits, maximum route
+duration, vehicle eligibility) so routes can be edited without running the full solver.
+"""
+
+# Standard library imports
+from typing import List, Optional, Tuple
+
+# Local application imports
+from app.core.config import settings
+
+
+# -----------------------------------------------------------------------------
+# Route Insertion
+# -----------------------------------------------------------------------------
+class RouteInsertion:
+    """
+    Evaluates and edits vehicle routes expressed as solver node sequences.
+
+    Routes are lists of pickup/dropoff nodes **without** the depot; every route
+    implicitly starts and ends at the solver depot.
+
+    Responsibilities:
+        - Check whether a route is feasible for a given vehicle.
+        - Find the cheapest feasible position to insert a request.
+    """
+
+    def __init__(self, solver, dist_matrix: List[List[int]], time_matrix: List[List[int]]):
+        """
+        Initialize from a prepared solver instance and its matrices.
+
+        Args:
+            solver (RoutingProblem): Problem whose data has been prepared.
+            dist_matrix (list[list[int]]): Distance matrix in meters.
+            time_matrix (list[list[int]]): Time matrix in seconds.
+        """
+        self.solver = solver
+        self.dist_matrix = dist_matrix
+        self.time_matrix = time_matrix
+        # Travel plus service at the origin stop, as in the OR-Tools time dimension
+        service = solver.service_times
+        self.transit = [
+            [service[f] + row[t] for t in range(len(row))] for f, row in enumerate(time_matrix)
+        ]
+        self.depot = solver.depot_index
+        self.demands = solver.demands
+        self.capacities = [v["capacity"] for v in solver.vehicles]
+        self.max_route_time = int(settings.SOLVER_MAX_VEHICLE_TIME_MINUTES * 60)
+        # Departure from the depot (seconds since anchor) per vehicle
+        self.start_times = list(solver._vehicle_start_abs)
+
+        # Latest service start (seconds since anchor) keyed by pickup/dropoff node
+        self.latest_by_node = {
+            node: latest
+            for node, (_, latest) in enumerate(solver.time_windows)
+            if latest is not None
+        }
+        # Without earliest pickup times vehicles never wait before a stop
+        self.no_waiting = not solver.has_earliest_times
+
+    # -------------------------------------------------------------------------
+    # Feasibility
+    # -------------------------------------------------------------------------
+    def route_time(self, vehicle_idx: int, route: List[int]) -> Optional[int]:
+        """
+        Compute the duration of a route if it is feasible.
+
+        Args:
+            vehicle_idx (int): Index of the vehicle driving the route.
+            route (list[int]): Pickup/dropoff nodes in visiting order.
+
+        Returns:
+            int | None: Route duration in seconds (travel, service and waiting),
+            or None if any constraint is violated.
+        """
+        if not self._within_capacity(vehicle_idx, route):
+            return None
+        requests = {self.solver.node_to_request[node][0] for node in route}
+        if not all(self.solver.vehicle_allowed(vehicle_idx, ridx) for ridx in requests):
+            return None
+        times = self.solver.schedule_route(vehicle_idx, [self.depot] + route, self.time_matrix)
+        if times is None:
+            return None
+        return times[-1] - times[0]
+
+    def _within_capacity(self, vehicle_idx: int, route: List[int]) -> bool:
+        """Check that the load never exceeds the vehicle capacity along a route."""
+        capacity = self.capacities[vehicle_idx]
+        load = 0
+        for node in route:
+            load += self.demands[node]
+            if load > capacity:
+                return False
+        return True
+
+    # -------------------------------------------------------------------------
+    # Insertion
+    # -------------------------------------------------------------------------
+    def best_insertion(
+        self, vehicle_idx: int, route: List[int], request_idx: int
+    ) -> Optional[Tuple[int, List[int]]]:
+        """
+        Find the cheapest feasible insertion of a request into a route.
+
+        The cost of a position is the added travel and service time. Without
+        earliest pickup times vehicles never wait, so inserting a node delays
+        every later node by the same amount. With per-position slack and load
+        prefixes precomputed, each (pickup edge, dropoff edge) pair is checked
+        in constant time. With pickup windows a delay may be absorbed by a
+        later wait, so each candidate is scheduled with ``schedule_route``.
+
+        Args:
+            vehicle_idx (int): Index of the vehicle driving the route.
+            route (list[int]): Current route (pickup/dropoff nodes).
+            request_idx (int): Index of the request to insert.
+
+        Returns:
+            tuple | None: (added_time_seconds, new_route) for the best position,
+            or None if the request cannot be inserted feasibly.
+        """
+        if not self.solver.vehicle_allowed(vehicle_idx, request_idx):
+            return None
+        pickup, dropoff = self.solver.pickup_drop_pairs[request_idx]
+        demand = self.demands[pickup]
+        capacity = self.capacities[vehicle_idx]
+        if demand > capacity:
+            return None
+
+        if not self.no_waiting:
+            return self._scheduled_insertion(vehicle_idx, route, pickup, dropoff)
+
+        t = self.transit
+        inf = float("inf")
+        nodes = [self.depot] + route + [self.depot]
+        k = len(nodes)
+
+        # Arrival time, load after service, and slack (how much later the
+        # node may be reached) for every position of the closed route
+        arrival = [self.start_times[vehicle_idx]] * k
+        load = [0] * k
+        slack = [inf] * k
+        for m in range(1, k):
+            arrival[m] = arrival[m - 1] + t[nodes[m - 1]][nodes[m]]
+            load[m] = load[m - 1] + self.demands[nodes[m]]
+            deadline = self.latest_by_node.get(nodes[m])
+            if deadline is not None:
+                slack[m] = deadline - arrival[m]
+        slack[k - 1] = self.max_route_time - (arrival[k - 1] - arrival[0])
+        if min(slack) < 0 or max(load) > capacity:
+            return None
+
+        # suffix[m]: minimum slack over positions m..k-1
+        suffix = slack[:]
+        for m in range(k - 2, -1, -1):
+            suffix[m] = min(suffix[m], suffix[m + 1])
+
+        pickup_deadline = self.latest_by_node[pickup]
+        dropoff_deadline = self.latest_by_node[dropoff]
+        best: Optional[Tuple[int, int, int]] = None
+
+        # Pickup goes on edge e (between positions e and e+1)
+        for e in range(k - 1):
+            u, v = nodes[e], nodes[e + 1]
+            if load[e] + demand > capacity or arrival[e] + t[u][pickup] > pickup_deadline:
+                continue
+            pickup_delay = t[u][pickup] + t[pickup][v] - t[u][v]
+
+            # Dropoff directly after the pickup on the same edge
+            arrive_drop = arrival[e] + t[u][pickup] + t[pickup][dropoff]
+            delay = t[u][pickup] + t[pickup][dropoff] + t[dropoff][v] - t[u][v]
+            if arrive_drop <= dropoff_deadline and delay <= suffix[e + 1]:
+                if best is None or delay < best[0]:
+                    best = (delay, e, e)
+
+            # Dropoff on a later edge f: positions e+1..f are delayed by the
+            # pickup detour and carry the extra load
+            range_slack = inf
+            for f in range(e + 1, k - 1):
+                range_slack = min(range_slack, slack[f])
+                if pickup_delay > range_slack or load[f] + demand > capacity:
+                    break
+                w, x = nodes[f], nodes[f + 1]
+                if arrival[f] + pickup_delay + t[w][dropoff] > dropoff_deadline:
+                    continue
+                delay = pickup_delay + t[w][dropoff] + t[dropoff][x] - t[w][x]
+                if delay <= suffix[f + 1] and (best is None or delay < best[0]):
+                    best = (delay, e, f)
+
+        if best is None:
+            return None
+        delay, e, f = best
+        new_route = route[:e] + [pickup] + route[e:f] + [dropoff] + route[f:]
+        return delay, new_route
+
+    def _scheduled_insertion(
+        self, vehicle_idx: int, route: List[int], pickup: int, dropoff: int
+    ) -> Optional[Tuple[int, List[int]]]:
+        """
+        Cheapest feasible insertion when vehicles may wait for pickup windows.
+
+        Every (pickup edge, dropoff edge) pair is scheduled in full, so this is
+        quadratic in the route length times a route pass.
+        """
+        t = self.transit
+        nodes = [self.depot] + route + [self.depot]
+        k = len(nodes)
+        best: Optional[Tuple[int, List[int]]] = None
+        for e in range(k - 1):
+            u, v = nodes[e], nodes[e + 1]
+            for f in range(e, k - 1):
+                w, x = nodes[f], nodes[f + 1]
+                if e == f:
+                    delay = t[u][pickup] + t[pickup][dropoff] + t[dropoff][v] - t[u][v]
+                else:
+                    delay = (t[u][pickup] + t[pickup][v] - t[u][v]
+                             + t[w][dropoff] + t[dropoff][x] - t[w][x])
+                if best is not None and delay >= best[0]:
+                    continue
+                candidate = route[:e] + [pickup] + route[e:f] + [dropoff] + route[f:]
+                if not self._within_capacity(vehicle_idx, candidate):
+                    continue
+                if self.solver.schedule_route(vehicle_idx, [self.depot] + candidate, self.time_matrix) is None:
+                    continue
+                best = (delay, candidate)
+        return best
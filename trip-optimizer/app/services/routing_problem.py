@@ -0,0 +1,459 @@
+"""
+app/services/routing_problem.py
+
+Shared problem definition for the Trip Optimizer solvers.
+Turns vehicles and requests into depot/pickup/dropoff nodes, demands,
+dropoff deadlines and vehicle eligibility, fetches matrices, and summarizes
+routes. Free of OR-Tools so lightweight engines can reuse it.
+"""
+
+# Standard library imports
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Any, Dict, List, Tuple
+
+# Local application imports
+from app.clients.distance_matrix_client import DistanceMatrixClient
+from app.core.config import settings
+
+
+def to_utc(value: str | datetime) -> datetime:
+    """
+    Parse a request time as an aware UTC datetime.
+
+    Args:
+        value (str | datetime): ISO string (JSON payloads) or datetime
+            (compact payloads); naive values are taken as UTC.
+
+    Returns:
+        datetime: Time in UTC.
+    """
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def dropoff_time_utc(request: Dict) -> datetime:
+    """Dropoff deadline of a request dictionary as an aware UTC datetime."""
+    return to_utc(request["dropoff_time"])
+
+
+def unavailable_intervals(vehicle: Dict) -> List[Tuple[datetime, datetime]]:
+    """
+    Unavailability periods of a vehicle dictionary as UTC intervals.
+
+    Every period blocks its whole local day (SOLVER_LOCAL_UTC_OFFSET_HOURS);
+    ``period`` 0 is the only value clients send today.
+
+    Args:
+        vehicle (dict): Vehicle input data; ``unavailability`` entries have a
+            ``date`` (ISO string or date) and a ``period``.
+
+    Returns:
+        list[tuple]: (start, end) UTC datetimes, end exclusive.
+    """
+    local_tz = timezone(timedelta(hours=settings.SOLVER_LOCAL_UTC_OFFSET_HOURS))
+    intervals = []
+    for period in vehicle.get("unavailability") or []:
+        day = period["date"]
+        if isinstance(day, str):
+            day = date.fromisoformat(day)
+        start = datetime.combine(day, time(), tzinfo=local_tz).astimezone(timezone.utc)
+        intervals.append((start, start + timedelta(days=1)))
+    return intervals
+
+
+# -----------------------------------------------------------------------------
+# Routing Problem
+# -----------------------------------------------------------------------------
+class RoutingProblem:
+    """
+    Solver-independent view of a pickup-and-delivery problem.
+
+    Node layout:
+        - Node 0 is the depot.
+        - Request i uses node 2i+1 for its pickup and 2i+2 for its dropoff.
+
+    Subclasses implement ``solve()`` and return::
+
+        {
+            "assigned": [ { vehicle_id, start_time, end_time, requests, route_nodes, stop_times, total_distance_m, total_time_s } ],
+            "unassigned_requests": [request_ids]
+        }
+    """
+
+    def __init__(
+        self,
+        vehicles: List[Dict],
+        requests: List[Dict],
+        depot_location: Dict[str, float] | None = None,
+        matrices: Tuple[List[List[int]], List[List[int]]] | None = None,
+        time_limit_seconds: int | None = None,
+        vehicle_ready_times: Dict[str, datetime] | None = None,
+    ):
+        """
+        Initialize the problem from raw vehicle and request dictionaries.
+
+        Args:
+            vehicles (list[dict]): Vehicle input data.
+            requests (list[dict]): Booking request input data.
+            depot_location (dict | None): Depot coordinates; defaults to the configured depot.
+            matrices (tuple | None): Precomputed (distance, time) matrices; skips the
+                distance matrix client when given (e.g. replaying a captured instance).
+            time_limit_seconds (int | None): Search time limit; defaults to
+                SOLVER_TIME_LIMIT_SECONDS.
+            vehicle_ready_times (dict | None): Earliest departure from the depot
+                (UTC) by vehicle ID, e.g. the end of a trip already committed;
+                other vehicles may leave at the anchor.
+        """
+        self.vehicles = vehicles
+        self.requests = requests
+        self.locations: List[Dict[str, float]] = []
+        self.pickup_drop_pairs: List[tuple] = []
+        self.demands: List[int] = []
+        self.depot_index: int = 0
+        self._depot_location = depot_location or {
+            "latitude": settings.DEPOT_LATITUDE,
+            "longitude": settings.DEPOT_LONGITUDE,
+        }
+
+        self._matrices = matrices
+        self.time_limit_seconds = time_limit_seconds or settings.SOLVER_TIME_LIMIT_SECONDS
+
+        # Timeline anchor allowing cross-midnight handling (up to ~48h horizon)
+        self.anchor_dt_utc: datetime | None = None
+        self._dropoff_deadlines_abs: List[int] = []
+        self._vehicle_ready_times = vehicle_ready_times or {}
+        self._vehicle_start_abs: List[int] = []
+
+        # Per node: service duration (s) and (earliest, latest) service start since anchor
+        self.service_times: List[int] = []
+        self.time_windows: List[Tuple[int, int | None]] = []
+        self.has_earliest_times = False
+
+        # Per request: indexes of the vehicles that may serve it (None: all);
+        # settled on first use of allowed_vehicles, once travel times are known
+        self._allowed_vehicles: List[List[int] | None] | None = None
+        self._earliest_pickups_abs: List[int | None] = []
+        self._unavailable_abs: List[List[Tuple[int, int]]] = []
+
+        # Objective lower bound (LowerBound), set by solve() once matrices are built
+        self.lower_bound = None
+
+        # Prepare internal data structures
+        self._prepare_data()
+
+        # Distance matrix client
+        self.distance_client = DistanceMatrixClient()
+
+    # -------------------------------------------------------------------------
+    # Data preparation
+    # -------------------------------------------------------------------------
+    def _prepare_data(self) -> None:
+        """Prepare location list, single depot index, demands, time windows, eligibility, and pickup/drop pairs."""
+        self.locations = []
+        # Single depot at index 0
+        self.depot_index = 0
+        self.locations.append({
+            "latitude": self._depot_location["latitude"],
+            "longitude": self._depot_location["longitude"],
+        })
+
+        # Determine a timeline anchor in UTC from request dropoff datetimes
+        dropoff_dts_utc: List[datetime] = [dropoff_time_utc(req) for req in self.requests]
+
+        if dropoff_dts_utc:
+            earliest_drop = min(dropoff_dts_utc)
+            # Anchor 12 hours before earliest drop to allow evening → next morning
+            self.anchor_dt_utc = earliest_drop - timedelta(hours=12)
+        else:
+            self.anchor_dt_utc = datetime.now(timezone.utc)
+
+        def seconds_since_anchor(value) -> int:
+            return max(0, int((to_utc(value) - self.anchor_dt_utc).total_seconds()))
+
+        def service_seconds(minutes) -> int:
+            if minutes is None:
+                minutes = settings.SOLVER_DEFAULT_SERVICE_MINUTES
+            return int(round(minutes * 60))
+
+        self.service_times = [0]
+        self.time_windows = [(0, None)]
+        self._earliest_pickups_abs = []
+        self._allowed_vehicles = None
+
+        # Process pickup and dropoff pairs
+        for idx, req in enumerate(self.requests):
+            p = req["pickup_location"]
+            d = req["dropoff_location"]
+
+            p_idx = len(self.locations)
+            self.locations.append({"latitude": p["latitude"], "longitude": p["longitude"]})
+
+            # Ensure pickup and dropoff are distinct in coordinate list
+            if p["latitude"] == d["latitude"] and p["longitude"] == d["longitude"]:
+                # Create a slightly offset dropoff to avoid identical coordinates
+                shadow = {"latitude": d["latitude"], "longitude": d["longitude"] + 0.000001}
+                d_idx = len(self.locations)
+                self.locations.append(shadow)
+            else:
+                d_idx = len(self.locations)
+                self.locations.append({"latitude": d["latitude"], "longitude": d["longitude"]})
+
+            self.pickup_drop_pairs.append((p_idx, d_idx))
+            demand = req["capacity_demand"]
+            self.demands.extend([demand, -demand])
+
+            # Absolute deadline seconds relative to anchor
+            drop_dt = dropoff_dts_utc[idx]
+            deadline = int((drop_dt - self.anchor_dt_utc).total_seconds())
+            self._dropoff_deadlines_abs.append(deadline)
+
+            # Optional pickup window; the pickup can never start after the deadline
+            earliest = req.get("earliest_pickup")
+            latest = req.get("latest_pickup")
+            # Unclamped: a window opening before the anchor still bounds eligibility
+            self._earliest_pickups_abs.append(
+                int((to_utc(earliest) - self.anchor_dt_utc).total_seconds()) if earliest is not None else None
+            )
+            pickup_window = (
+                seconds_since_anchor(earliest) if earliest is not None else 0,
+                min(deadline, seconds_since_anchor(latest)) if latest is not None else deadline,
+            )
+            self.has_earliest_times = self.has_earliest_times or pickup_window[0] > 0
+            self.time_windows.extend([pickup_window, (0, deadline)])
+            self.service_times.extend([
+                service_seconds(req.get("pickup_service_minutes")),
+                service_seconds(req.get("dropoff_service_minutes")),
+            ])
+
+        # Prepend depot demand (0)
+        self.demands = [0] + self.demands
+
+        # Departure of each vehicle from the depot, seconds since anchor
+        self._vehicle_start_abs = [
+            max(0, int((self._vehicle_ready_times[v["id"]] - self.anchor_dt_utc).total_seconds()))
+            if v["id"] in self._vehicle_ready_times else 0
+            for v in self.vehicles
+        ]
+
+        # Unavailable periods of each vehicle, seconds since anchor (see allowed_vehicles)
+        self._unavailable_abs = [
+            [
+                (int((start - self.anchor_dt_utc).total_seconds()), int((end - self.anchor_dt_utc).total_seconds()))
+                for start, end in unavailable_intervals(v)
+            ]
+            for v in self.vehicles
+        ]
+
+        # Reverse lookups used when translating routes back into requests
+        self._request_index_by_id = {req["id"]: idx for idx, req in enumerate(self.requests)}
+        self.node_to_request: Dict[int, Tuple[int, str]] = {}
+        for ridx, (p_idx, d_idx) in enumerate(self.pickup_drop_pairs):
+            self.node_to_request[p_idx] = (ridx, "pickup")
+            self.node_to_request[d_idx] = (ridx, "dropoff")
+
+    @property
+    def allowed_vehicles(self) -> List[List[int] | None]:
+        """
+        Indexes of the vehicles that may serve each request (None: all).
+
+        A request spans from its pickup window opening to its dropoff
+        deadline. Without a pickup window the span starts at the latest
+        feasible pickup: the deadline less the direct ride and the pickup's
+        service time. Vehicles unavailable at any point of the span never
+        serve the request. Computed on first use, from the time matrix.
+        """
+        if self._allowed_vehicles is None:
+            _, time_matrix = self.build_matrices()
+            self._allowed_vehicles = []
+            for ridx, (p, d) in enumerate(self.pickup_drop_pairs):
+                deadline = self._dropoff_deadlines_abs[ridx]
+                begin = self._earliest_pickups_abs[ridx]
+                if begin is None:
+                    begin = deadline - time_matrix[p][d] - self.service_times[p]
+                allowed = [
+                    v_idx for v_idx, periods in enumerate(self._unavailable_abs)
+                    if not any(start <= deadline and begin < end for start, end in periods)
+                ]
+                self._allowed_vehicles.append(None if len(allowed) == len(self.vehicles) else allowed)
+        return self._allowed_vehicles
+
+    def vehicle_allowed(self, vehicle_idx: int, request_idx: int) -> bool:
+        """Whether a vehicle is available for the whole span of a request."""
+        allowed = self.allowed_vehicles[request_idx]
+        return allowed is None or vehicle_idx in allowed
+
+    # -------------------------------------------------------------------------
+    # Matrices and route summaries
+    # -------------------------------------------------------------------------
+    def build_matrices(self) -> Tuple[List[List[int]], List[List[int]]]:
+        """
+        Fetch distance and time matrices for all prepared locations.
+
+        Returns:
+            tuple: (distance_matrix in meters, time_matrix in seconds).
+        """
+        if self._matrices is not None:
+            return self._matrices
+        origin_strs = [f"{loc['latitude']},{loc['longitude']}" for loc in self.locations]
+        # Kept so the lower bound and instance capture see the matrices as fetched
+        self._matrices = self.distance_client.get_matrices(origin_strs, origin_strs)
+        return self._matrices
+
+    def timeline(
+        self,
+        vehicle_idx: int,
+        route_nodes: List[int],
+        time_matrix: List[List[int]],
+    ) -> Tuple[List[int], List[int]]:
+        """
+        Service start times of a route, with the vehicle leaving as late as possible.
+
+        The vehicle first leaves at its ready time; every stop starts at its
+        arrival or its earliest time, whichever is later (waiting). Departure
+        is then postponed by the route's forward time slack, the largest delay
+        every latest time still absorbs. Leaving later only shortens waits and
+        the route's duration. It also picks riders up as late as the
+        deadlines allow.
+
+        Args:
+            vehicle_idx (int): Index of the vehicle in ``self.vehicles``.
+            route_nodes (list[int]): Visited nodes, starting with the depot and
+                excluding the closing return to the depot.
+            time_matrix (list[list[int]]): Time matrix in seconds.
+
+        Returns:
+            tuple: (service start per node including the closing depot, waits
+            before each of them), in seconds since anchor. Latest times are
+            not checked; see ``schedule_route``.
+        """
+        nodes = list(route_nodes) + [self.depot_index]
+
+        def forward(departure: int) -> Tuple[List[int], List[int]]:
+            times, waits = [departure], [0]
+            for prev, node in zip(nodes, nodes[1:]):
+                arrival = times[-1] + self.service_times[prev] + time_matrix[prev][node]
+                begin = max(arrival, self.time_windows[node][0])
+                times.append(begin)
+                waits.append(begin - arrival)
+            return times, waits
+
+        times, waits = forward(self._vehicle_start_abs[vehicle_idx])
+        slack, waited = None, 0
+        for m in range(1, len(nodes)):
+            waited += waits[m]
+            latest = self.time_windows[nodes[m]][1]
+            if latest is not None:
+                node_slack = waited + latest - times[m]
+                slack = node_slack if slack is None else min(slack, node_slack)
+        if slack is not None and slack > 0:
+            times, waits = forward(times[0] + slack)
+        return times, waits
+
+    def schedule_route(
+        self,
+        vehicle_idx: int,
+        route_nodes: List[int],
+        time_matrix: List[List[int]],
+    ) -> List[int] | None:
+        """
+        Service start times of a route if it meets every time constraint.
+
+        Checks latest times (pickup windows and dropoff deadlines), waits of
+        at most SOLVER_MAX_WAITING_TIME_MINUTES and a route duration of at
+        most SOLVER_MAX_VEHICLE_TIME_MINUTES, as the OR-Tools time dimension does.
+
+        Args:
+            vehicle_idx (int): Index of the vehicle in ``self.vehicles``.
+            route_nodes (list[int]): Visited nodes, starting with the depot.
+            time_matrix (list[list[int]]): Time matrix in seconds.
+
+        Returns:
+            list[int] | None: Service start per node including the closing depot
+            (seconds since anchor), or None if infeasible.
+        """
+        times, waits = self.timeline(vehicle_idx, route_nodes, time_matrix)
+        nodes = list(route_nodes) + [self.depot_index]
+        if any(
+            window[1] is not None and time > window[1]
+            for time, window in zip(times, (self.time_windows[n] for n in nodes))
+        ):
+            return None
+        if max(waits) > settings.SOLVER_MAX_WAITING_TIME_MINUTES * 60:
+            return None
+        if times[-1] - times[0] > settings.SOLVER_MAX_VEHICLE_TIME_MINUTES * 60:
+            return None
+        return times
+
+    def summarize_route(
+        self,
+        vehicle_idx: int,
+        route_nodes: List[int],
+        dist_matrix: List[List[int]],
+        time_matrix: List[List[int]],
+        stop_times: List[int] | None = None,
+    ) -> Dict[str, Any] | None:
+        """
+        Translate a vehicle's node sequence into an assignment record.
+
+        Args:
+            vehicle_idx (int): Index of the vehicle in ``self.vehicles``.
+            route_nodes (list[int]): Visited nodes, starting with the depot and
+                excluding the closing return to the depot.
+            dist_matrix (list[list[int]]): Distance matrix in meters.
+            time_matrix (list[list[int]]): Time matrix in seconds.
+            stop_times (list[int] | None): Service start per node including the
+                closing depot, in seconds since anchor (e.g. solver cumul
+                values); derived with ``timeline`` when omitted.
+
+        Returns:
+            dict | None: Assignment record (same shape as ``solve()["assigned"]``),
+            or None when the route serves no request.
+        """
+        n = len(self.locations)
+        route_distance = 0
+        closed_route = list(route_nodes) + [self.depot_index]
+        for from_n, to_n in zip(closed_route, closed_route[1:]):
+            if 0 <= from_n < n and 0 <= to_n < n:
+                route_distance += dist_matrix[from_n][to_n]
+            else:
+                # Defensive: break on invalid index mapping
+                break
+
+        # Determine which requests were serviced
+        visited = set(route_nodes)
+        route_reqs: List[str] = [
+            self.requests[ridx]["id"]
+            for ridx, (p, d) in enumerate(self.pickup_drop_pairs)
+            if p in visited or d in visited
+        ]
+        if not route_reqs:
+            return None
+
+        # Absolute times from the schedule (seconds since anchor)
+        if stop_times is None:
+            stop_times, _ = self.timeline(vehicle_idx, route_nodes, time_matrix)
+        start_dt = self.anchor_dt_utc + timedelta(seconds=stop_times[0])
+        end_dt = self.anchor_dt_utc + timedelta(seconds=stop_times[-1])
+
+        return {
+            "vehicle_id": self.vehicles[vehicle_idx]["id"],
+            # ISO with 'Z'
+            "start_time": start_dt.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "end_time": end_dt.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "requests": route_reqs,
+            "route_nodes": list(route_nodes),
+            "stop_times": list(stop_times),
+            "total_distance_m": route_distance,
+            # Includes service and waiting time
+            "total_time_s": stop_times[-1] - stop_times[0],
+        }
+
+    # -------------------------------------------------------------------------
+    # Solver execution
+    # -------------------------------------------------------------------------
+    def solve(self) -> Dict[str, Any]:
+        """Run the solver and return assignments (implemented by subclasses)."""
+        raise NotImplementedError
@@ -0,0 +1,252 @@
+"""
+app/services/trip_stream.py
+
+Streaming of a job's scheduled trips as newline-delimited JSON (NDJSON):
+- Reads the job's persisted trips in batches of TRIP_STREAM_BATCH_SIZE
+  (keyset pages of ``trips``, then the batch's ``trip_requests`` and
+  ``trip_stops``) and emits one ScheduledTrip per line, so neither side
+  ever holds the whole plan in memory.
+- Supports filtering by vehicle and trip start time, and keyset pagination
+  on the trip's position in the result (``trip_index``).
+- Jobs whose trips were not persisted (direct pipeline without artifacts,
+  repairs, or rows already purged) fall back to the stored result, which is
+  read once per request: the page computed for the cursor is what streams.
+"""
+
+# Standard library imports
+import json
+from collections import defaultdict
+from datetime import datetime, timezone
+from itertools import islice
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# Third-party imports
+from sqlalchemy import exists, select
+from sqlalchemy.orm import Session
+
+# Local application imports
+from app.core.config import settings
+from app.db import models
+from app.db.session import SessionLocal
+from app.models import schemas
+
+
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Interpret naive datetimes as UTC, as trip times are stored in UTC."""
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+# -----------------------------------------------------------------------------
+# Trip Stream
+# -----------------------------------------------------------------------------
+class TripStream:
+    """
+    One page of a job's trips, filtered and serialized line by line.
+
+    Each line is a ScheduledTrip with its ``trip_index`` added; pass the
+    last index seen as ``after`` to fetch the next page.
+    """
+
+    def __init__(
+        self,
+        job_id: str,
+        vehicle_ids: Optional[List[str]] = None,
+        start_from: Optional[datetime] = None,
+        start_to: Optional[datetime] = None,
+        after: int = -1,
+        limit: Optional[int] = None,
+    ):
+        """
+        Args:
+            job_id (str): Job whose trips are streamed.
+            vehicle_ids (list[str] | None): Only trips of these vehicles.
+            start_from (datetime | None): Only trips starting at or after this time.
+            start_to (datetime | None): Only trips starting before this time.
+            after (int): Only trips whose ``trip_index`` is greater (page cursor).
+            limit (int | None): Maximum number of trips (None for all).
+        """
+        self.job_id = job_id
+        self.vehicle_ids = vehicle_ids or None
+        self.start_from = _as_utc(start_from)
+        self.start_to = _as_utc(start_to)
+        self.after = after
+        self.limit = limit
+        # Fallback page, kept by next_cursor() so iter_lines() needn't re-read the result
+        self._result_page: Optional[List[Tuple[int, schemas.ScheduledTrip]]] = None
+
+    # -------------------------------------------------------------------------
+    # Persisted trips
+    # -------------------------------------------------------------------------
+    def _conditions(self) -> list:
+        Trip = models.Trip
+        conditions = [Trip.job_id == self.job_id]
+        if self.vehicle_ids:
+            conditions.append(Trip.vehicle_id.in_(self.vehicle_ids))
+        if self.start_from is not None:
+            conditions.append(Trip.trip_start_time >= self.start_from)
+        if self.start_to is not None:
+            conditions.append(Trip.trip_start_time < self.start_to)
+        return conditions
+
+    def has_persisted_trips(self, db: Session) -> bool:
+        """Whether the job's trips are stored as rows (rather than only in its result)."""
+        return db.scalar(select(exists().where(models.Trip.job_id == self.job_id)))
+
+    def next_cursor(self, db: Session) -> Optional[int]:
+        """
+        Cursor for the page after this one.
+
+        For persisted trips only the trips table is read, one row per trip.
+        Otherwise the page is cut from the stored result and kept for
+        :meth:`iter_lines`.
+
+        Args:
+            db (Session): Database session.
+
+        Returns:
+            int | None: ``after`` value of the next page, or None on the last page.
+        """
+        if self.limit is None:
+            return None
+        if not self.has_persisted_trips(db):
+            page = list(islice(self._matching_result_trips(self._stored_result(db)), self.limit + 1))
+            self._result_page = page[:self.limit]
+            return page[self.limit - 1][0] if len(page) > self.limit else None
+        indexes = db.scalars(
+            select(models.Trip.trip_index).where(*self._conditions(), models.Trip.trip_index > self.after)
+            .order_by(models.Trip.trip_index)
+            .offset(self.limit - 1).limit(2)
+        ).all()
+        return indexes[0] if len(indexes) == 2 else None
+
+    def _iter_persisted(self, db: Session) -> Iterator[bytes]:
+        Trip = models.Trip
+        remaining, after = self.limit, self.after
+        while remaining is None or remaining > 0:
+            batch_size = settings.TRIP_STREAM_BATCH_SIZE
+            if remaining is not None:
+                batch_size = min(batch_size, remaining)
+            trips = db.execute(
+                select(
+                    Trip.trip_index, Trip.vehicle_id, Trip.trip_start_time, Trip.trip_end_time,
+                    Trip.total_duration, Trip.total_distance,
+                )
+                .where(*self._conditions(), Trip.trip_index > after)
+                .order_by(Trip.trip_index)
+                .limit(batch_size)
+            ).all()
+            if not trips:
+                return
+            request_ids, stops = self._children(db, [trip.trip_index for trip in trips])
+            for trip in trips:
+                yield self._line(trip, request_ids[trip.trip_index], stops[trip.trip_index])
+            after = trips[-1].trip_index
+            if remaining is not None:
+                remaining -= len(trips)
+            if len(trips) < batch_size:
+                return
+
+    def _children(self, db: Session, trip_indexes: List[int]) -> Tuple[Dict[int, List[str]], Dict[int, List[dict]]]:
+        """Request IDs and ordered stops of a batch of trips, keyed by ``trip_index``."""
+        TripRequest, TripStop = models.TripRequest, models.TripStop
+        request_ids: Dict[int, List[str]] = defaultdict(list)
+        for row in db.execute(
+            select(TripRequest.trip_index, TripRequest.request_id)
+            .where(TripRequest.job_id == self.job_id, TripRequest.trip_index.in_(trip_indexes))
+            .order_by(TripRequest.id)
+        ):
+            request_ids[row.trip_index].append(row.request_id)
+
+        stops: Dict[int, List[dict]] = defaultdict(list)
+        for row in db.execute(
+            select(
+                TripStop.trip_index, TripStop.location_id, TripStop.latitude, TripStop.longitude,
+                TripStop.estimated_arrival_time, TripStop.stop_type, TripStop.request_id,
+            )
+            .where(TripStop.job_id == self.job_id, TripStop.trip_index.in_(trip_indexes))
+            .order_by(TripStop.trip_index, TripStop.sequence)
+        ):
+            stops[row.trip_index].append({
+                "location_id": row.location_id,
+                "latitude": row.latitude,
+                "longitude": row.longitude,
+                "estimated_arrival_time": _as_utc(row.estimated_arrival_time),
+                "type": row.stop_type,
+                "request_id": row.request_id,
+            })
+        return request_ids, stops
+
+    @staticmethod
+    def _line(row, request_ids: List[str], stops: List[dict]) -> bytes:
+        trip = schemas.ScheduledTrip(
+            vehicle_id=row.vehicle_id,
+            combined_request_ids=request_ids,
+            trip_start_time=_as_utc(row.trip_start_time),
+            trip_end_time=_as_utc(row.trip_end_time),
+            total_duration_minutes=row.total_duration,
+            total_distance_meters=row.total_distance,
+            route=stops,
+        )
+        return _encode(row.trip_index, trip)
+
+    # -------------------------------------------------------------------------
+    # Fallback: stored result
+    # -------------------------------------------------------------------------
+    def _stored_result(self, db: Session) -> Optional[dict]:
+        """The job's stored result (only that column, not the row's payload or blob)."""
+        Job = models.OptimizationJob
+        return db.scalar(select(Job.result).where(Job.id == self.job_id))
+
+    def _matching_result_trips(self, result: Optional[dict]) -> Iterator[Tuple[int, schemas.ScheduledTrip]]:
+        for trip_index, data in enumerate((result or {}).get("scheduled_trips", [])):
+            if trip_index <= self.after:
+                continue
+            trip = schemas.ScheduledTrip(**data)
+            start = _as_utc(trip.trip_start_time)
+            if (
+                (self.vehicle_ids and trip.vehicle_id not in self.vehicle_ids)
+                or (self.start_from is not None and start < self.start_from)
+                or (self.start_to is not None and start >= self.start_to)
+            ):
+                continue
+            yield trip_index, trip
+
+    def _iter_result(self, db: Session) -> Iterator[bytes]:
+        page = self._result_page
+        if page is None:
+            page = islice(self._matching_result_trips(self._stored_result(db)), self.limit)
+        for trip_index, trip in page:
+            yield _encode(trip_index, trip)
+
+    # -------------------------------------------------------------------------
+    # Entry point
+    # -------------------------------------------------------------------------
+    def iter_lines(self) -> Iterator[bytes]:
+        """
+        Yield the page as NDJSON lines, reading with its own session.
+
+        The session lives as long as the stream, independent of the request
+        that started it.
+
+        Yields:
+            bytes: One JSON-encoded trip followed by a newline.
+        """
+        db = SessionLocal()
+        try:
+            if self.has_persisted_trips(db):
+                yield from self._iter_persisted(db)
+            else:
+                yield from self._iter_result(db)
+        finally:
+            db.close()
+
+
+def _encode(trip_index: int, trip: schemas.ScheduledTrip) -> bytes:
+    """Serialize one trip as an NDJSON line."""
+    return json.dumps(
+        {"trip_index": trip_index, **trip.model_dump(mode="json")}, separators=(",", ":")
+    ).encode("utf-8") + b"\n"
@@ -0,0 +1,171 @@
+"""
+app/utils/msgpack_utils.py
+
+MessagePack encoding and content negotiation:
+- Packs and unpacks values with datetimes as MessagePack timestamps
+  (epoch seconds plus nanoseconds) instead of ISO 8601 strings.
+- Picks MessagePack or JSON from an Accept header; JSON stays the default.
+- Route class that lets request bodies sent as MessagePack go through the
+  same validation as JSON bodies.
+"""
+
+# Standard library imports
+from datetime import date, datetime, timezone
+from typing import Any, Callable, Dict, Optional
+
+# Third-party imports
+import msgpack
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+from pydantic import AnyUrl
+
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+
+# Registered type plus the names clients commonly use
+_MSGPACK_MEDIA_TYPES = {MSGPACK_MEDIA_TYPE, "application/x-msgpack", "application/vnd.msgpack"}
+
+
+# -----------------------------------------------------------------------------
+# Encoding
+# -----------------------------------------------------------------------------
+def _default(value: Any) -> Any:
+    """Encode types MessagePack has no native form for."""
+    if isinstance(value, datetime):
+        # Naive datetimes are UTC throughout the service
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return msgpack.Timestamp.from_datetime(value)
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, AnyUrl):
+        return str(value)
+    raise TypeError(f"Cannot encode {type(value).__name__} as MessagePack")
+
+
+def packb(value: Any) -> bytes:
+    """
+    Encode a value as MessagePack.
+
+    Args:
+        value (Any): Python value (e.g. a ``model_dump()``); datetimes become timestamps.
+
+    Returns:
+        bytes: MessagePack bytes.
+    """
+    return msgpack.packb(value, default=_default, use_bin_type=True)
+
+
+def unpackb(data: bytes) -> Any:
+    """
+    Decode MessagePack bytes; timestamps become timezone-aware UTC datetimes.
+
+    Args:
+        data (bytes): MessagePack bytes.
+
+    Returns:
+        Any: Decoded value.
+    """
+    return msgpack.unpackb(data, raw=False, timestamp=3)
+
+
+# -----------------------------------------------------------------------------
+# Content negotiation
+# -----------------------------------------------------------------------------
+def _media_type(header_value: str) -> str:
+    return header_value.split(";", 1)[0].strip().lower()
+
+
+def is_msgpack(content_type: Optional[str]) -> bool:
+    """
+    Check whether a Content-Type header names MessagePack.
+
+    Args:
+        content_type (str | None): Raw header value.
+
+    Returns:
+        bool: True for MessagePack bodies.
+    """
+    return bool(content_type) and _media_type(content_type) in _MSGPACK_MEDIA_TYPES
+
+
+def header_qualities(value: Optional[str]) -> Dict[str, float]:
+    """
+    Parse a list header with q-values (Accept, Accept-Encoding).
+
+    Args:
+        value (str | None): Raw header value.
+
+    Returns:
+        dict: Highest q-value per lower-cased token (1.0 when omitted,
+        0.0 when malformed).
+    """
+    quality: Dict[str, float] = {}
+    for item in (value or "").split(","):
+        token, *params = [part.strip() for part in item.split(";")]
+        q = 1.0
+        for param in params:
+            name, _, raw = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(raw)
+                except ValueError:
+                    q = 0.0
+        if token:
+            quality[token.lower()] = max(q, quality.get(token.lower(), 0.0))
+    return quality
+
+
+def prefers_msgpack(accept: Optional[str]) -> bool:
+    """
+    Check whether an Accept header ranks MessagePack above JSON.
+
+    Ties, wildcards and missing headers resolve to JSON.
+
+    Args:
+        accept (str | None): Raw header value.
+
+    Returns:
+        bool: True if the response should be MessagePack.
+    """
+    if not accept:
+        return False
+    quality = header_qualities(accept)
+    msgpack_q = max((quality.get(t, 0.0) for t in _MSGPACK_MEDIA_TYPES), default=0.0)
+    json_q = max(quality.get("application/json", 0.0), quality.get("application/*", 0.0), quality.get("*/*", 0.0))
+    return msgpack_q > json_q
+
+
+# -----------------------------------------------------------------------------
+# Request bodies
+# -----------------------------------------------------------------------------
+class MessagePackRequest(Request):
+    """Request whose MessagePack body is decoded where FastAPI reads JSON."""
+
+    async def json(self) -> Any:
+        if not hasattr(self, "_json"):
+            self._json = unpackb(await self.body())
+        return self._json
+
+
+class MessagePackRoute(APIRoute):
+    """
+    Route accepting ``application/msgpack`` wherever it accepts a JSON body.
+
+    FastAPI only parses bodies labelled as JSON, so MessagePack requests are
+    relabelled and decoded by MessagePackRequest; validation, error
+    responses and OpenAPI are unchanged. Undecodable bodies get a 400.
+    """
+
+    def get_route_handler(self) -> Callable:
+        original_route_handler = super().get_route_handler()
+
+        async def route_handler(request: Request) -> Response:
+            if is_msgpack(request.headers.get("content-type")):
+                headers = [
+                    (name, b"application/json" if name == b"content-type" else value)
+                    for name, value in request.scope["headers"]
+                ]
+                request = MessagePackRequest({**request.scope, "headers": headers}, request.receive)
+            return await original_route_handler(request)
+
+        return route_handler
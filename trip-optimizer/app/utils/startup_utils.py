@@ -0,0 +1,189 @@
+"""
+app/utils/startup_utils.py
+
+Startup diagnostics and solver warmup:
+- Measures how long heavy modules take to import.
+- Runs a tiny solve so the first real job does not pay one-time initialization,
+  in each solver worker process when the pool is on (otherwise in the API process).
+- Tracks readiness so probes only succeed once warmup has finished.
+"""
+
+# Standard library imports
+import importlib
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Modules deliberately kept off the import path of app.main
+HEAVY_MODULES: List[str] = [
+    "ortools.constraint_solver.pywrapcp",
+    "app.services.optimization_solver",
+    "requests",
+]
+
+# Two-request instance used for the warmup solve (matrices are synthetic)
+_WARMUP_VEHICLES = [{"id": "WARMUP-VEH", "capacity": 4}]
+_WARMUP_REQUESTS = [
+    {
+        "id": f"WARMUP-REQ-{i}",
+        "pickup_location": {"id": f"WARMUP-P{i}", "latitude": 10.80 + i / 100, "longitude": 106.70},
+        "dropoff_location": {"id": f"WARMUP-D{i}", "latitude": 10.85 + i / 100, "longitude": 106.75},
+        "dropoff_time": "2025-01-01T09:00:00Z",
+        "capacity_demand": 1,
+    }
+    for i in range(2)
+]
+
+
+def warmup_solve() -> Tuple[Dict[str, float], float]:
+    """
+    Import the heavy modules and run a tiny solve in the calling process.
+
+    Returns:
+        tuple: (import time in ms by module, warmup solve time in ms).
+    """
+    import_times_ms: Dict[str, float] = {}
+    for module in HEAVY_MODULES:
+        started = time.perf_counter()
+        importlib.import_module(module)
+        import_times_ms[module] = round((time.perf_counter() - started) * 1000, 1)
+
+    from app.services.optimization_solver import OptimizationSolver
+
+    # Straight-line matrices keep warmup off the network
+    nodes = 1 + 2 * len(_WARMUP_REQUESTS)
+    matrix = [[0 if i == j else 600 for j in range(nodes)] for i in range(nodes)]
+    started = time.perf_counter()
+    OptimizationSolver(
+        _WARMUP_VEHICLES,
+        _WARMUP_REQUESTS,
+        matrices=(matrix, matrix),
+        time_limit_seconds=1,
+    ).solve()
+    return import_times_ms, round((time.perf_counter() - started) * 1000, 1)
+
+
+# -----------------------------------------------------------------------------
+# Startup Monitor
+# -----------------------------------------------------------------------------
+class StartupMonitor:
+    """
+    Collects startup timings and gates readiness on solver warmup.
+
+    Responsibilities:
+        - Record the import time of app.main and of lazily loaded modules.
+        - Run the warmup solve in a background thread, or wait for the
+          solver workers to report theirs.
+        - Report readiness and a timing summary.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty, not-yet-ready monitor."""
+        self._ready = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.app_import_ms: Optional[float] = None
+        self.import_times_ms: Dict[str, float] = {}
+        self.warmup_ms: Optional[float] = None
+        self.warmup_error: Optional[str] = None
+        self.worker_warmups: List[Dict[str, Any]] = []
+
+    # -------------------------------------------------------------------------
+    # Lifecycle
+    # -------------------------------------------------------------------------
+    def start(self, warmup_enabled: bool, worker_reports: Optional[Iterable[Dict[str, Any]]] = None) -> None:
+        """
+        Begin background warmup, or mark ready immediately when disabled.
+
+        With a solver pool, jobs never solve in the API process, so it loads
+        no OR-Tools; readiness waits for every worker's own warmup instead.
+
+        Args:
+            warmup_enabled (bool): Whether to import heavy modules and run a warmup solve.
+            worker_reports (iterable | None): Warmup reports of the solver
+                workers (SolverPool.warmup_reports()), or None to warm up here.
+        """
+        if not warmup_enabled:
+            self._ready.set()
+            return
+        if worker_reports is not None:
+            target, args = self._await_workers, (worker_reports,)
+        else:
+            target, args = self._warm_up, ()
+        self._thread = threading.Thread(target=target, args=args, name="solver-warmup", daemon=True)
+        self._thread.start()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until warmup finishes.
+
+        Args:
+            timeout (float | None): Maximum seconds to wait.
+
+        Returns:
+            bool: True if the service is ready.
+        """
+        return self._ready.wait(timeout)
+
+    @property
+    def is_ready(self) -> bool:
+        """Whether warmup has finished (or was disabled)."""
+        return self._ready.is_set()
+
+    # -------------------------------------------------------------------------
+    # Warmup
+    # -------------------------------------------------------------------------
+    def _warm_up(self) -> None:
+        """Import heavy modules, run a tiny solve, then mark the service ready."""
+        try:
+            self.import_times_ms, self.warmup_ms = warmup_solve()
+        except Exception as e:
+            # A failed warmup must not keep the service unready forever
+            self.warmup_error = str(e)
+        finally:
+            self._ready.set()
+            print(f"[STARTUP] {self.report()}")
+
+    def _await_workers(self, worker_reports: Iterable[Dict[str, Any]]) -> None:
+        """Collect the workers' warmup reports, then mark the service ready."""
+        try:
+            for report in worker_reports:
+                self.worker_warmups.append(report)
+            # Summarize by the slowest worker; any worker error is surfaced
+            warm = [r for r in self.worker_warmups if r.get("warmup_ms") is not None]
+            if warm:
+                slowest = max(warm, key=lambda r: r["warmup_ms"])
+                self.import_times_ms, self.warmup_ms = slowest["import_times_ms"], slowest["warmup_ms"]
+            errors = [f"worker {r['worker']}: {r['error']}" for r in self.worker_warmups if r.get("error")]
+            self.warmup_error = "; ".join(errors) or None
+        except Exception as e:
+            self.warmup_error = str(e)
+        finally:
+            self._ready.set()
+            print(f"[STARTUP] {self.report()}")
+
+    # -------------------------------------------------------------------------
+    # Reporting
+    # -------------------------------------------------------------------------
+    def report(self) -> Dict[str, Any]:
+        """
+        Summarize startup timings.
+
+        Returns:
+            dict: Readiness flag, import times (ms) and warmup duration (ms);
+            with a solver pool, those of the slowest worker plus every
+            worker's report.
+        """
+        return {
+            "ready": self.is_ready,
+            "app_import_ms": self.app_import_ms,
+            "import_times_ms": self.import_times_ms,
+            "warmup_ms": self.warmup_ms,
+            "warmup_error": self.warmup_error,
+            "worker_warmups": self.worker_warmups,
+        }
+
+
+# -----------------------------------------------------------------------------
+# Global monitor instance
+# -----------------------------------------------------------------------------
+startup_monitor = StartupMonitor()
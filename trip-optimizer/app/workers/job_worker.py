@@ -0,0 +1,282 @@
+"""
+app/workers/job_worker.py
+
+Solver worker for the durable job queue.
+
+Claims pending optimization jobs from the shared database, solves them while
+renewing its lease, and records the result. Run any number of workers, on
+this host or on other nodes pointing at the same DATABASE_URL.
+
+Usage:
+    python -m app.workers.job_worker [--worker-id ID] [--once]
+"""
+
+# Standard library imports
+import argparse
+import os
+import signal
+import socket
+import threading
+import time
+from typing import Optional
+
+# Local application imports
+from app.core.config import settings
+from app.db import models
+from app.db.session import SessionLocal
+from app.models import schemas
+from app.services.data_manager import DataManager
+from app.services.job_queue import JobQueue
+from app.services.retention_service import RetentionService
+
+
+def default_worker_id(suffix: str = "") -> str:
+    """Worker identifier unique per host and process."""
+    return f"{socket.gethostname()}:{os.getpid()}{suffix}"
+
+
+# -----------------------------------------------------------------------------
+# Job execution
+# -----------------------------------------------------------------------------
+def execute_job(db, task_id: str) -> None:
+    """
+    Run the optimization workflow for a claimed job and store its result.
+
+    Steps (PIPELINE_MODE="staged"):
+        1. Clear staging rows left by an earlier attempt of this job.
+        2. Load the job's stored request payload into the database.
+        3. Run the optimization solver (solver errors yield an all-unassigned result).
+        4. Save the status, result, serialized body and trips in one commit.
+
+    With PIPELINE_MODE="direct", steps 1-2 are skipped: the solver works from
+    the parsed request, only the result (and body) is written before the job completes,
+    and staging rows and trips are written in the background when
+    PIPELINE_PERSIST_ARTIFACTS is set.
+
+    Args:
+        db (Session): Database session.
+        task_id (str): ID of the job being processed.
+
+    Raises:
+        Exception: Any error outside the solver; the caller re-queues the job.
+    """
+    # Imported here so OR-Tools is only loaded on the solve path
+    from app.services.optimization_service import OptimizationService
+
+    started = time.perf_counter()
+    task = db.get(models.OptimizationJob, task_id)
+    request = schemas.parse_optimization_request(task.request_payload)
+    direct = settings.PIPELINE_MODE == "direct"
+    print(f"[{task_id}] Starting {settings.PIPELINE_MODE} optimization workflow (attempt {task.attempts})...")
+
+    if not direct:
+        # Staging is scoped to this job; only a previous attempt's rows are cleared
+        dm = DataManager(db)
+        dm.clear_job_staging(task_id)
+
+        # Load new request data into tables
+        print(f"[{task_id}] Loading request data into DB...")
+        dm.load_and_save_payload(task.request_payload, task_id)
+
+    # Run the optimization solver (with graceful fallback)
+    print(f"[{task_id}] Running optimization solver...")
+    try:
+        result = OptimizationService(db).run_optimization(task_id, request)
+    except Exception as solver_err:
+        # Graceful fallback: mark all as unassigned instead of failing the job
+        print(f"[{task_id}] Solver error, returning fallback result: {solver_err}")
+        result = schemas.OptimizationResult(
+            job_id=task_id,
+            status="completed",
+            message="Fallback result: all requests unassigned due to solver error.",
+            scheduled_trips=[],
+            unassigned_requests=request.request_ids(),
+        )
+
+    # One write of the result, pre-serialized for GET /result, plus trips when staged
+    dm = DataManager(db)
+    if direct:
+        dm.save_optimization_result(task_id, result)
+    else:
+        dm.save_result_and_trips(task_id, result)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    print(f"[{task_id}] Optimization completed and committed in {elapsed_ms:.0f} ms.")
+
+    if direct and settings.PIPELINE_PERSIST_ARTIFACTS:
+        from app.services.artifact_writer import artifact_writer
+        artifact_writer.submit(task_id, task.request_payload, result)
+
+
+def notify_job_finished(db, task_id: str) -> None:
+    """
+    Send the completion webhook of a finished job, if it asked for one.
+
+    Delivery (with retries) runs in the background; the worker moves on.
+
+    Args:
+        db (Session): Database session.
+        task_id (str): ID of the job.
+    """
+    task = db.get(models.OptimizationJob, task_id)
+    if task is None or task.status == "pending":
+        return
+    callback_url = (task.request_payload or {}).get("callback_url")
+    if not callback_url:
+        return
+
+    from app.clients.webhook_client import webhook_client
+    webhook_client.send(callback_url, {
+        "event": "optimization.finished",
+        "job_id": task.id,
+        "status": task.status,
+        "result_url": f"{settings.API_V1_STR}/optimize/{task.id}/result",
+        "etag": task.result_etag,
+    })
+
+
+def _heartbeat_loop(task_id: str, worker_id: str, done: threading.Event) -> None:
+    """Renew the job's lease until ``done`` is set."""
+    while not done.wait(settings.JOB_HEARTBEAT_SECONDS):
+        db = SessionLocal()
+        try:
+            if not JobQueue(db).heartbeat(task_id, worker_id):
+                print(f"[{task_id}] Lease lost by {worker_id}; another worker may retry the job.")
+                return
+        except Exception as e:
+            print(f"[{task_id}] Heartbeat failed: {e}")
+        finally:
+            db.close()
+
+
+def process_job(task_id: str, worker_id: str) -> None:
+    """
+    Solve a job this worker has claimed, renewing its lease meanwhile.
+
+    Args:
+        task_id (str): ID of the claimed job.
+        worker_id (str): Worker holding the claim.
+    """
+    done = threading.Event()
+    heartbeat = threading.Thread(
+        target=_heartbeat_loop, args=(task_id, worker_id, done), name=f"heartbeat-{task_id}", daemon=True
+    )
+    heartbeat.start()
+
+    db = SessionLocal()
+    error: Optional[str] = None
+    try:
+        execute_job(db, task_id)
+    except Exception as e:
+        db.rollback()
+        error = str(e)
+        print(f"[{task_id}] Optimization attempt failed: {e}")
+    finally:
+        done.set()
+        try:
+            JobQueue(db).release(task_id, worker_id, error)
+            notify_job_finished(db, task_id)
+        finally:
+            db.close()
+
+
+def run_claimed_job(task_id: str, worker_id: str) -> None:
+    """
+    Claim one specific job and process it (in-process mode, no worker pool).
+
+    Args:
+        task_id (str): ID of the job to run.
+        worker_id (str): Identifier recorded on the claim.
+    """
+    db = SessionLocal()
+    try:
+        claimed = JobQueue(db).claim(worker_id, job_id=task_id)
+    finally:
+        db.close()
+    if claimed:
+        process_job(task_id, worker_id)
+
+
+# -----------------------------------------------------------------------------
+# Worker loop
+# -----------------------------------------------------------------------------
+def run_worker(worker_id: str, stop_event=None, wakeup_event=None, once: bool = False) -> None:
+    """
+    Claim and solve jobs until stopped.
+
+    Each iteration first re-queues jobs with expired leases (and, every
+    STAGING_PURGE_INTERVAL_SECONDS, purges expired staging rows; every
+    RETENTION_INTERVAL_SECONDS, applies job retention), then claims the
+    oldest waiting job. An idle worker sleeps for JOB_POLL_INTERVAL_SECONDS or
+    until ``wakeup_event`` is set.
+
+    Args:
+        worker_id (str): Identifier recorded on claims.
+        stop_event (Event | None): Stops the loop between jobs when set.
+        wakeup_event (Event | None): Set by the API when a job is queued.
+        once (bool): Return after one iteration (processing at most one job).
+    """
+    stop_event = stop_event or threading.Event()
+    print(f"[WORKER] {worker_id} started.")
+    next_purge = 0.0
+    next_retention = time.monotonic() + settings.RETENTION_INTERVAL_SECONDS
+    while not stop_event.is_set():
+        db = SessionLocal()
+        try:
+            if time.monotonic() >= next_purge:
+                next_purge = time.monotonic() + settings.STAGING_PURGE_INTERVAL_SECONDS
+                purged = DataManager(db).purge_expired_staging()
+                if purged:
+                    print(f"[WORKER] Purged {purged} expired staging rows.")
+            if time.monotonic() >= next_retention:
+                next_retention = time.monotonic() + settings.RETENTION_INTERVAL_SECONDS
+                retained = RetentionService(db).run()
+                if retained["removed"] or retained["vacuumed_pages"]:
+                    print(
+                        f"[WORKER] Retention removed {retained['removed']} jobs, "
+                        f"released {retained['vacuumed_pages']} pages."
+                    )
+            queue = JobQueue(db)
+            requeued, failed = queue.requeue_expired()
+            for job_id in requeued:
+                print(f"[WORKER] Re-queued {job_id} after its lease expired.")
+            for job_id in failed:
+                print(f"[WORKER] Failed {job_id}: lease expired {settings.JOB_MAX_ATTEMPTS} times.")
+                notify_job_finished(db, job_id)
+            task_id = queue.claim(worker_id)
+        except Exception as e:
+            print(f"[WORKER] {worker_id} could not poll the queue: {e}")
+            task_id = None
+        finally:
+            db.close()
+
+        if task_id:
+            process_job(task_id, worker_id)
+        if once:
+            break
+        if not task_id:
+            if wakeup_event is not None:
+                if wakeup_event.wait(settings.JOB_POLL_INTERVAL_SECONDS):
+                    wakeup_event.clear()
+            else:
+                stop_event.wait(settings.JOB_POLL_INTERVAL_SECONDS)
+    print(f"[WORKER] {worker_id} stopped.")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--worker-id", default=default_worker_id(), help="Identifier recorded on claims")
+    parser.add_argument("--once", action="store_true", help="Process at most one job and exit")
+    args = parser.parse_args()
+
+    from app.db.session import create_db_and_tables
+    create_db_and_tables()
+
+    # Finish the current job on SIGTERM/SIGINT; its lease covers a hard kill
+    stop_event = threading.Event()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(sig, lambda *_: stop_event.set())
+    run_worker(args.worker_id, stop_event=stop_event, once=args.once)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""
+app/workers/solver_pool.py
+
+Embedded solver worker pool for the Trip Optimizer service:
+- Runs queue workers in dedicated processes, off the API's GIL.
+- Warms up the solver in each worker before it claims jobs, and reports
+  the warmups so GET /ready waits for them.
+- Wakes an idle worker as soon as a job is queued.
+- Stops workers between jobs on shutdown; unfinished jobs stay queued.
+
+Queue admission and positions live in the database (see JobQueue), so they
+also account for standalone workers started with ``python -m app.workers.job_worker``.
+"""
+
+# Standard library imports
+import multiprocessing
+import queue
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional
+
+# Local application imports
+from app.core.config import settings
+
+
+# -----------------------------------------------------------------------------
+# Worker process entry point
+# -----------------------------------------------------------------------------
+def _worker_main(index: int, stop_event, wakeup_event, warmup_queue, warmup: bool) -> None:
+    """Warm up the solver (or just preload OR-Tools), report it, then run the queue worker loop."""
+    from app.utils.startup_utils import warmup_solve
+    from app.workers.job_worker import default_worker_id, run_worker
+
+    report: Dict[str, Any] = {"worker": index, "import_times_ms": {}, "warmup_ms": None, "error": None}
+    if warmup:
+        try:
+            report["import_times_ms"], report["warmup_ms"] = warmup_solve()
+        except Exception as e:
+            report["error"] = str(e)
+    else:
+        import app.services.optimization_solver  # noqa: F401
+    warmup_queue.put(report)
+
+    run_worker(default_worker_id(f"-{index}"), stop_event=stop_event, wakeup_event=wakeup_event)
+
+
+# -----------------------------------------------------------------------------
+# Solver Pool
+# -----------------------------------------------------------------------------
+class SolverPool:
+    """
+    Supervises a fixed number of queue worker processes.
+
+    Workers are spawned (not forked), so they never inherit the API's
+    threads or open database connections.
+    """
+
+    def __init__(self, workers: int):
+        """
+        Args:
+            workers (int): Number of solver worker processes.
+        """
+        self.workers = workers
+        self._lock = threading.Lock()
+        self._ctx = multiprocessing.get_context("spawn")
+        self._processes: List[multiprocessing.Process] = []
+        self._stop_event = None
+        self._wakeup_event = None
+        self._warmup_queue = None
+        self.warmup = False
+
+    # -------------------------------------------------------------------------
+    # Lifecycle
+    # -------------------------------------------------------------------------
+    def start(self, warmup: bool = False) -> None:
+        """
+        Start the worker processes (no-op if already running).
+
+        Args:
+            warmup (bool): Run a warmup solve in each worker before it claims
+                jobs. Off when started lazily for a queued job, which would
+                only wait behind it.
+        """
+        with self._lock:
+            if self._processes:
+                return
+            self._stop_event = self._ctx.Event()
+            self._wakeup_event = self._ctx.Event()
+            self._warmup_queue = self._ctx.Queue()
+            self.warmup = warmup
+            for index in range(self.workers):
+                process = self._ctx.Process(
+                    target=_worker_main,
+                    args=(index, self._stop_event, self._wakeup_event, self._warmup_queue, warmup),
+                    name=f"solver-worker-{index}",
+                    daemon=True,
+                )
+                process.start()
+                self._processes.append(process)
+            print(f"[POOL] Started {self.workers} solver worker process(es).")
+
+    def shutdown(self, timeout: Optional[float] = None) -> None:
+        """
+        Ask workers to stop after their current job and wait for them.
+
+        All workers share one deadline, so shutdown takes at most ``timeout``
+        however many there are. Workers still running then are terminated;
+        their jobs are re-queued once the lease expires.
+
+        Args:
+            timeout (float | None): Seconds to wait in total (defaults to one solver time limit).
+        """
+        with self._lock:
+            processes, self._processes = self._processes, []
+            if not processes:
+                return
+            self._stop_event.set()
+            self._wakeup_event.set()
+        timeout = settings.SOLVER_TIME_LIMIT_SECONDS if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        for process in processes:
+            process.join(max(0.0, deadline - time.monotonic()))
+        for process in processes:
+            if process.is_alive():
+                print(f"[POOL] Terminating {process.name}; its job will be re-queued.")
+                process.terminate()
+                process.join()
+
+    def warmup_reports(self) -> Iterator[Dict[str, Any]]:
+        """
+        Yield each worker's warmup report as it arrives.
+
+        Workers that exit before reporting yield an error report instead, so
+        readiness never waits on a dead process.
+
+        Yields:
+            dict: Worker index, import times (ms), warmup time (ms) and error.
+        """
+        with self._lock:
+            processes, warmup_queue = list(self._processes), self._warmup_queue
+        pending = set(range(len(processes)))
+        while pending:
+            try:
+                report = warmup_queue.get(timeout=1)
+            except queue.Empty:
+                for index in [i for i in pending if not processes[i].is_alive()]:
+                    pending.discard(index)
+                    yield {
+                        "worker": index, "import_times_ms": {}, "warmup_ms": None,
+                        "error": f"exited with code {processes[index].exitcode} before warming up",
+                    }
+                continue
+            if report["worker"] in pending:
+                pending.discard(report["worker"])
+                yield report
+
+    # -------------------------------------------------------------------------
+    # Notifications
+    # -------------------------------------------------------------------------
+    def wake(self) -> None:
+        """Signal that a job was queued, starting the workers on first use."""
+        # Started lazily when the app runs without its lifespan (e.g. scripts)
+        self.start()
+        self._wakeup_event.set()
+
+
+# -----------------------------------------------------------------------------
+# Global pool instance (None when solving in-process)
+# -----------------------------------------------------------------------------
+solver_pool: Optional[SolverPool] = (
+    SolverPool(settings.SOLVER_WORKER_PROCESSES) if settings.SOLVER_WORKER_PROCESSES > 0 else None
+)
@@ -0,0 +1,15 @@
+"""
+benchmarks
+
+Offline benchmark scripts for the Trip Optimizer. Run from the trip-optimizer
+directory, e.g. ``python -m benchmarks.compare_solvers``. Matrices come from
+the haversine fallback, so no Google Maps key or network access is needed.
+"""
+
+# Standard library imports
+import os
+
+# Settings must be resolvable before any app module is imported
+os.environ.setdefault("API_KEY", "benchmark")
+os.environ.setdefault("GOOGLE_MAPS_API_KEY", "")
+os.environ.setdefault("DATABASE_URL", "sqlite:///./benchmark.db")
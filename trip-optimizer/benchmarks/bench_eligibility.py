@@ -0,0 +1,108 @@
+"""
+benchmarks/bench_eligibility.py
+
+Compares two ways of handling vehicle unavailability on multi-day payloads:
+- "prefilter": one model per local day with only the vehicles available
+  that day (what clients did before the solver knew about unavailability).
+- "eligible": one model for all days, with per-request allowed vehicles.
+
+A share of the fleet is unavailable on each day.
+
+Usage:
+    python -m benchmarks.bench_eligibility [--days 2 3] [--requests-per-day 30] [--vehicles 10] [--unavailable 0.3] [--time-limit 5]
+"""
+
+# Standard library imports
+import argparse
+import random
+import time
+from collections import defaultdict
+from datetime import timedelta
+from typing import Any, Dict, List
+
+# Local application imports
+from app.core.config import settings
+from app.services.heuristic_solver import HeuristicSolver
+from app.services.optimization_solver import OptimizationSolver
+from app.services.routing_problem import dropoff_time_utc
+from benchmarks.instances import generate_multiday_instance
+
+
+def with_unavailability(payload: Dict[str, Any], share: float, seed: int) -> Dict[str, Any]:
+    """Mark a random share of the fleet unavailable on each local day of the payload."""
+    rng = random.Random(seed)
+    offset = timedelta(hours=settings.SOLVER_LOCAL_UTC_OFFSET_HOURS)
+    days = sorted({(dropoff_time_utc(r) + offset).date() for r in payload["requests"]})
+    vehicles = [{**v, "unavailability": []} for v in payload["vehicles"]]
+    for day in days:
+        for vehicle in rng.sample(vehicles, int(len(vehicles) * share)):
+            vehicle["unavailability"].append({"date": day.isoformat(), "period": 0})
+    return {**payload, "vehicles": vehicles}
+
+
+def run(solver_cls, payload: Dict[str, Any], mode: str) -> Dict[str, Any]:
+    """Solve one payload per day on the available fleet, or in one model with eligibility."""
+    if mode == "eligible":
+        batches = [(payload["vehicles"], payload["requests"])]
+    else:
+        offset = timedelta(hours=settings.SOLVER_LOCAL_UTC_OFFSET_HOURS)
+        by_day: Dict[str, List[Dict]] = defaultdict(list)
+        for req in payload["requests"]:
+            by_day[(dropoff_time_utc(req) + offset).date().isoformat()].append(req)
+        batches = [
+            ([v for v in payload["vehicles"] if day not in {u["date"] for u in v["unavailability"]}], reqs)
+            for day, reqs in sorted(by_day.items())
+        ]
+
+    started = time.perf_counter()
+    assigned, unassigned, pairs = [], 0, 0
+    for vehicles, requests in batches:
+        solver = solver_cls(vehicles, requests)
+        pairs += sum(len(vehicles) if a is None else len(a) for a in solver.allowed_vehicles)
+        result = solver.solve()
+        assigned.extend(result["assigned"])
+        unassigned += len(result["unassigned_requests"])
+    return {
+        "seconds": time.perf_counter() - started,
+        "models": len(batches),
+        "pairs": pairs,
+        "trips": len(assigned),
+        "unassigned": unassigned,
+        "route_time_s": sum(a["total_time_s"] for a in assigned),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--days", type=int, nargs="*", default=[2, 3])
+    parser.add_argument("--requests-per-day", type=int, default=30)
+    parser.add_argument("--vehicles", type=int, default=10)
+    parser.add_argument("--unavailable", type=float, default=0.3, help="Share of the fleet unavailable per day")
+    parser.add_argument("--time-limit", type=int, default=5, help="OR-Tools time limit per model in seconds")
+    parser.add_argument("--engines", nargs="*", default=["heuristic", "ortools"])
+    args = parser.parse_args()
+
+    settings.SOLVER_TIME_LIMIT_SECONDS = args.time_limit
+    engines = {"heuristic": HeuristicSolver, "ortools": OptimizationSolver}
+
+    header = (
+        f"{'engine':<9} {'days':>4} {'reqs':>5} | {'mode':<9} {'models':>6} {'pairs':>6} "
+        f"{'time_s':>8} {'trips':>5} {'unasg':>5} {'route_min':>9}"
+    )
+    print(header)
+    print("-" * len(header))
+    for engine in args.engines:
+        for days in args.days:
+            payload = generate_multiday_instance(days, args.requests_per_day, args.vehicles, seed=5)
+            payload = with_unavailability(payload, args.unavailable, seed=days)
+            for mode in ("prefilter", "eligible"):
+                stats = run(engines[engine], payload, mode)
+                print(
+                    f"{engine:<9} {days:>4} {len(payload['requests']):>5} | {mode:<9} {stats['models']:>6} "
+                    f"{stats['pairs']:>6} {stats['seconds']:>8.2f} {stats['trips']:>5} "
+                    f"{stats['unassigned']:>5} {stats['route_time_s'] / 60:>9.0f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+benchmarks/bench_encoding.py
+
+Compares JSON and MessagePack for the two large bodies the service
+exchanges: the /optimize request and the optimization result. Reports raw
+and gzip sizes, the time to encode, and the time to decode (plus pydantic
+validation for requests, as the API does).
+
+Usage:
+    python -m benchmarks.bench_encoding [--requests 2000] [--vehicles 200] [--repeat 5]
+"""
+
+# Standard library imports
+import argparse
+import gzip
+import json
+from typing import Any, Callable, Dict
+
+# Local application imports
+from app.models import schemas
+from app.utils.msgpack_utils import packb, unpackb
+from benchmarks.bench_payload import median_ms
+from benchmarks.bench_persistence import build_trips
+from benchmarks.instances import generate_instance
+
+
+def measure(encode: Callable[[], bytes], decode: Callable[[bytes], Any], repeat: int) -> Dict[str, float]:
+    """Sizes and median encode/decode times of one encoding."""
+    body = encode()
+    return {
+        "bytes": len(body),
+        "gzip_bytes": len(gzip.compress(body)),
+        "encode_ms": median_ms(encode, repeat),
+        "decode_ms": median_ms(lambda: decode(body), repeat),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--vehicles", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    payload = generate_instance(args.requests, args.vehicles, seed=7)
+    request = schemas.OptimizationRequest(**payload)
+    result = schemas.OptimizationResult(job_id="BENCH", status="completed", scheduled_trips=build_trips(payload))
+
+    cases = {
+        # Server side: parse and validate the submitted body
+        "request": {
+            "json": (
+                lambda: request.model_dump_json(exclude_none=True).encode("utf-8"),
+                lambda body: schemas.parse_optimization_request(json.loads(body)),
+            ),
+            "msgpack": (
+                lambda: packb(request.model_dump(exclude_none=True)),
+                lambda body: schemas.parse_optimization_request(unpackb(body)),
+            ),
+        },
+        # Client side: decode the result body
+        "result": {
+            "json": (lambda: result.model_dump_json().encode("utf-8"), json.loads),
+            "msgpack": (lambda: packb(result.model_dump()), unpackb),
+        },
+    }
+
+    print(f"{args.requests} requests, {args.vehicles} vehicles (median of {args.repeat})")
+    header = f"{'body':<8} {'encoding':<8} {'bytes':>10} {'gzip':>9} {'encode':>9} {'decode':>9}"
+    print(header)
+    print("-" * len(header))
+    for body_name, encodings in cases.items():
+        for name, (encode, decode) in encodings.items():
+            m = measure(encode, decode, args.repeat)
+            print(
+                f"{body_name:<8} {name:<8} {m['bytes']:>10,} {m['gzip_bytes']:>9,}"
+                f" {m['encode_ms']:>7.1f}ms {m['decode_ms']:>7.1f}ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
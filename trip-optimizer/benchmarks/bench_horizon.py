@@ -0,0 +1,75 @@
+"""
+benchmarks/bench_horizon.py
+
+Compares one model over a multi-day booking window with rolling-horizon
+solving (one window per day plus look-ahead), for a growing number of days
+with the same fleet and bookings per day.
+
+Usage:
+    python -m benchmarks.bench_horizon [--days 1 2 4 7] [--requests-per-day 40] [--vehicles 12] [--time-limit 5]
+"""
+
+# Standard library imports
+import argparse
+import time
+from typing import Any, Dict, List, Tuple
+
+# Local application imports
+from app.core.config import settings
+from app.services.heuristic_solver import HeuristicSolver
+from app.services.optimization_solver import OptimizationSolver
+from app.services.rolling_horizon import RollingHorizon
+from app.services.routing_problem import RoutingProblem
+from benchmarks.instances import generate_multiday_instance
+
+
+def run(solver_cls, payload: Dict[str, Any], rolling: bool) -> Dict[str, Any]:
+    """Solve one payload in one model or in rolling windows and collect plan statistics."""
+    started = time.perf_counter()
+    if rolling:
+        windows: List[Tuple[RoutingProblem, Dict]] = RollingHorizon(
+            solver_cls, payload["vehicles"], payload["requests"]
+        ).solve()
+    else:
+        solver = solver_cls(payload["vehicles"], payload["requests"])
+        windows = [(solver, solver.solve())]
+    elapsed = time.perf_counter() - started
+    assigned = [a for _, result in windows for a in result["assigned"]]
+    return {
+        "seconds": elapsed,
+        "windows": len(windows),
+        "trips": len(assigned),
+        "unassigned": sum(len(result["unassigned_requests"]) for _, result in windows),
+        "route_time_s": sum(a["total_time_s"] for a in assigned),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--days", type=int, nargs="*", default=[1, 2, 4, 7])
+    parser.add_argument("--requests-per-day", type=int, default=40)
+    parser.add_argument("--vehicles", type=int, default=12)
+    parser.add_argument("--time-limit", type=int, default=5, help="OR-Tools time limit per model in seconds")
+    parser.add_argument("--engines", nargs="*", default=["heuristic", "ortools"])
+    args = parser.parse_args()
+
+    settings.SOLVER_TIME_LIMIT_SECONDS = args.time_limit
+    engines = {"heuristic": HeuristicSolver, "ortools": OptimizationSolver}
+
+    header = f"{'engine':<9} {'days':>4} {'reqs':>5} | {'mode':<7} {'windows':>7} {'time_s':>8} {'trips':>5} {'unasg':>5} {'route_min':>9}"
+    print(header)
+    print("-" * len(header))
+    for engine in args.engines:
+        for days in args.days:
+            payload = generate_multiday_instance(days, args.requests_per_day, args.vehicles, seed=5)
+            for mode in ("single", "rolling"):
+                stats = run(engines[engine], payload, rolling=mode == "rolling")
+                print(
+                    f"{engine:<9} {days:>4} {len(payload['requests']):>5} | {mode:<7} {stats['windows']:>7} "
+                    f"{stats['seconds']:>8.2f} {stats['trips']:>5} {stats['unassigned']:>5} "
+                    f"{stats['route_time_s'] / 60:>9.0f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+benchmarks/bench_payload.py
+
+Compares the full (nested) and compact (columnar) /optimize payload formats
+on a shuttle instance where every booking starts or ends at one of a few
+plants: request body size, JSON parsing plus validation time, and the time
+to turn the validated request into the solver's node data.
+
+Usage:
+    python -m benchmarks.bench_payload [--requests 2000] [--vehicles 200] [--repeat 5]
+"""
+
+# Standard library imports
+import argparse
+import gzip
+import json
+import statistics
+import time
+from typing import Any, Callable, Dict
+
+# Local application imports
+from app.models import schemas
+from app.services.routing_problem import RoutingProblem
+from benchmarks.instances import generate_instance
+
+
+def median_ms(fn: Callable[[], Any], repeat: int) -> float:
+    """Median wall time of ``fn`` in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def measure(body: bytes, repeat: int) -> Dict[str, float]:
+    """Size, validate and prepare time of one request body."""
+    request = schemas.parse_optimization_request(json.loads(body))
+
+    def prepare():
+        vehicles, requests = request.solver_input()
+        RoutingProblem(vehicles, requests)
+
+    return {
+        "bytes": len(body),
+        "gzip_bytes": len(gzip.compress(body)),
+        "validate_ms": median_ms(lambda: schemas.parse_optimization_request(json.loads(body)), repeat),
+        "prepare_ms": median_ms(prepare, repeat),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--vehicles", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    full = generate_instance(args.requests, args.vehicles, seed=7)
+    bodies = {
+        "full": json.dumps(full, separators=(",", ":")).encode("utf-8"),
+        "compact": json.dumps(schemas.compact_payload(full), separators=(",", ":")).encode("utf-8"),
+    }
+
+    print(f"{args.requests} requests, {args.vehicles} vehicles (median of {args.repeat})")
+    header = f"{'format':<8} {'bytes':>10} {'gzip':>9} {'validate':>10} {'prepare':>9}"
+    print(header)
+    print("-" * len(header))
+    for name, body in bodies.items():
+        m = measure(body, args.repeat)
+        print(
+            f"{name:<8} {m['bytes']:>10,} {m['gzip_bytes']:>9,}"
+            f" {m['validate_ms']:>8.1f}ms {m['prepare_ms']:>7.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+"""
+benchmarks/bench_persistence.py
+
+Compares DataManager's bulk write path with the per-object ORM path it
+replaced for staging a payload, and the normalized trip tables (trips,
+trip_requests, trip_stops) with the previous layout of one trips row per
+request carrying the whole route as JSON.
+
+Each run uses a fresh SQLite file, so timings include commits and disk sync;
+"kB" is how much the write grew the database file.
+
+Usage:
+    python -m benchmarks.bench_persistence [--requests 2000] [--vehicles 200] [--repeat 3]
+"""
+
+# Standard library imports
+import argparse
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+# Third-party imports
+from sqlalchemy import (
+    JSON, Column, DateTime, Integer, MetaData, String, Table, create_engine, insert,
+)
+from sqlalchemy.orm import Session, sessionmaker
+
+# Local application imports
+from app.core.config import settings
+from app.db import models
+from app.db.session import Base
+from app.models import schemas
+from app.services.data_manager import DataManager
+from benchmarks.instances import generate_instance
+
+
+# -----------------------------------------------------------------------------
+# Baseline: per-object ORM writes
+# -----------------------------------------------------------------------------
+def orm_load_and_save(db: Session, request_data: Dict[str, Any], job_id: str) -> None:
+    """Stage a payload with one ``db.add`` per row (previous implementation)."""
+    processed: Dict[str, models.Location] = {}
+    depot = db.query(models.Location).filter_by(job_id=job_id, location_id="DEPOT").first()
+    if not depot:
+        depot = models.Location(
+            job_id=job_id, location_id="DEPOT",
+            latitude=str(settings.DEPOT_LATITUDE), longitude=str(settings.DEPOT_LONGITUDE),
+        )
+        db.add(depot)
+    processed["DEPOT"] = depot
+
+    locs = [v["base_location"] for v in request_data["vehicles"] if v.get("base_location")]
+    for req in request_data["requests"]:
+        locs.extend((req["pickup_location"], req["dropoff_location"]))
+    for loc in locs:
+        if loc["id"] not in processed:
+            location = models.Location(
+                job_id=job_id, location_id=loc["id"],
+                latitude=str(loc["latitude"]), longitude=str(loc["longitude"]),
+            )
+            db.add(location)
+            processed[loc["id"]] = location
+    db.flush()
+
+    for v in request_data["vehicles"]:
+        db.add(models.Vehicle(
+            job_id=job_id, vehicle_id=v["id"], capacity=v["capacity"],
+            base_location_id=v["base_location"]["id"] if v.get("base_location") else "DEPOT",
+            unavailable_dates=[],
+        ))
+    for r in request_data["requests"]:
+        db.add(models.BookingRequest(
+            job_id=job_id, request_id=r["id"],
+            pickup_location_id=r["pickup_location"]["id"],
+            dropoff_location_id=r["dropoff_location"]["id"],
+            dropoff_time=datetime.fromisoformat(r["dropoff_time"].replace("Z", "+00:00")),
+            capacity_demand=r["capacity_demand"],
+        ))
+    db.commit()
+
+
+# Previous trips layout: one row per request, route duplicated as JSON
+legacy_metadata = MetaData()
+legacy_trips = Table(
+    "legacy_trips", legacy_metadata,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("job_id", String, nullable=False, index=True),
+    Column("trip_index", Integer),
+    Column("vehicle_id", String, nullable=False),
+    Column("booking_request_id", String, nullable=False),
+    Column("trip_start_time", DateTime(timezone=True), nullable=False),
+    Column("trip_end_time", DateTime(timezone=True), nullable=False),
+    Column("total_distance", Integer, nullable=False),
+    Column("total_duration", Integer, nullable=False),
+    Column("trip_stop_sequence", JSON, nullable=False),
+)
+
+
+def legacy_save_trips(db: Session, scheduled_trips: List[schemas.ScheduledTrip], job_id: str) -> None:
+    """Bulk-insert one row per request with the trip's route as JSON (previous layout)."""
+    rows = []
+    for trip_index, trip_data in enumerate(scheduled_trips):
+        stop_sequence = [stop.model_dump(mode="json") for stop in trip_data.route]
+        for request_id in trip_data.combined_request_ids:
+            rows.append({
+                "job_id": job_id,
+                "trip_index": trip_index,
+                "vehicle_id": trip_data.vehicle_id,
+                "booking_request_id": request_id,
+                "trip_start_time": trip_data.trip_start_time,
+                "trip_end_time": trip_data.trip_end_time,
+                "total_duration": trip_data.total_duration_minutes,
+                "total_distance": trip_data.total_distance_meters,
+                "trip_stop_sequence": stop_sequence,
+            })
+    db.execute(insert(legacy_trips), rows)
+    db.commit()
+
+
+# -----------------------------------------------------------------------------
+# Fixtures
+# -----------------------------------------------------------------------------
+def build_trips(payload: Dict[str, Any], per_trip: int = 4) -> List[schemas.ScheduledTrip]:
+    """Group requests into synthetic trips so result writes have a realistic shape."""
+    start = datetime(2025, 8, 20, tzinfo=timezone.utc)
+    trips = []
+    requests = payload["requests"]
+    vehicles = payload["vehicles"]
+    for t, offset in enumerate(range(0, len(requests), per_trip)):
+        group = requests[offset:offset + per_trip]
+        stops = [
+            schemas.TripStop(
+                location_id=r[f"{kind}_location"]["id"],
+                latitude=r[f"{kind}_location"]["latitude"],
+                longitude=r[f"{kind}_location"]["longitude"],
+                estimated_arrival_time=start,
+                type=kind,
+                request_id=r["id"],
+            )
+            for kind in ("pickup", "dropoff")
+            for r in group
+        ]
+        trips.append(schemas.ScheduledTrip(
+            vehicle_id=vehicles[t % len(vehicles)]["id"],
+            combined_request_ids=[r["id"] for r in group],
+            trip_start_time=start,
+            trip_end_time=start + timedelta(hours=2),
+            total_duration_minutes=120,
+            total_distance_meters=50_000,
+            route=stops,
+        ))
+    return trips
+
+
+def timed_run(
+    fn: Callable[[Session, str], None], prepare: Callable[[Session, str], None] = None
+) -> Tuple[float, int]:
+    """Run ``fn`` against a fresh database; return its wall time in ms and the bytes it added."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "bench.db"
+        engine = create_engine(f"sqlite:///{path}")
+        Base.metadata.create_all(bind=engine)
+        legacy_metadata.create_all(bind=engine)
+        with sessionmaker(bind=engine)() as db:
+            db.add(models.OptimizationJob(id="BENCH", status="pending"))
+            db.commit()
+            if prepare:
+                prepare(db, "BENCH")
+            size_before = path.stat().st_size
+            started = time.perf_counter()
+            fn(db, "BENCH")
+            elapsed = (time.perf_counter() - started) * 1000
+        engine.dispose()
+        written = path.stat().st_size - size_before
+    return elapsed, written
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--vehicles", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    payload = generate_instance(args.requests, args.vehicles, seed=42)
+    trips = build_trips(payload)
+
+    def stage_bulk(db, job_id):
+        DataManager(db).load_and_save_payload(payload, job_id)
+
+    stops = sum(len(trip.route) for trip in trips)
+    staged_rows = len(payload["vehicles"]) + len(payload["requests"])
+    cases = [
+        ("staging", "orm", lambda db, j: orm_load_and_save(db, payload, j), None, staged_rows),
+        ("staging", "bulk", stage_bulk, None, staged_rows),
+        ("trips", "per-req", lambda db, j: legacy_save_trips(db, trips, j), stage_bulk, len(payload["requests"])),
+        (
+            "trips", "normal", lambda db, j: DataManager(db).save_trips(trips, j), stage_bulk,
+            len(trips) + len(payload["requests"]) + stops,
+        ),
+    ]
+
+    print(f"{args.requests} requests, {args.vehicles} vehicles, {len(trips)} trips, median of {args.repeat}")
+    header = f"{'write':<8} {'path':<7} {'rows':>7} {'ms':>9} {'speedup':>8} {'kB':>8}"
+    print(header)
+    print("-" * len(header))
+    baseline: Dict[str, float] = {}
+    for write, path, fn, prepare, rows in cases:
+        runs = [timed_run(fn, prepare) for _ in range(args.repeat)]
+        ms = statistics.median(elapsed for elapsed, _ in runs)
+        written = statistics.median(size for _, size in runs)
+        baseline.setdefault(write, ms)
+        print(f"{write:<8} {path:<7} {rows:>7} {ms:>9.1f} {baseline[write] / ms:>7.1f}x {written / 1024:>8.0f}")
+
+
+if __name__ == "__main__":
+    main()
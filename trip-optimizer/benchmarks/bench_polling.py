@@ -0,0 +1,230 @@
+"""
+benchmarks/bench_polling.py
+
+Measures latency of the read endpoints under a burst of concurrent polling,
+comparing the async handlers (async session, no threadpool) with the
+blocking ``def`` handlers they replaced.
+
+A uvicorn server runs in a subprocess; pollers repeatedly fetch job
+status and results while a probe measures ``/health`` alongside them. Every
+other poller refuses gzip, so results are also inflated by the server and
+their latency ("plain") is reported separately.
+
+Usage:
+    python -m benchmarks.bench_polling [--pollers 200] [--seconds 10] [--jobs 50]
+"""
+
+# Standard library imports
+import argparse
+import gzip
+import asyncio
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+# Third-party imports
+import httpx
+from fastapi import APIRouter, Depends, FastAPI, Header, HTTPException, Response
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+
+# Local application imports
+from app.api.routes import optimizer_router, public_router
+from app.core.config import settings
+from app.db import models
+from app.db.session import SessionLocal, create_db_and_tables
+from app.dependencies import get_db
+from app.models import schemas
+from app.services.job_queue import JobQueue
+from app.services.result_cache import accepts_gzip, etag_matches, result_bodies, result_cache
+from benchmarks.bench_persistence import build_trips
+from benchmarks.instances import generate_instance
+
+
+# -----------------------------------------------------------------------------
+# Baseline: blocking handlers (previous implementation)
+# -----------------------------------------------------------------------------
+blocking_router = APIRouter()
+
+
+@blocking_router.get("/health")
+def blocking_health():
+    return {"status": "ok"}
+
+
+@blocking_router.get("/optimize/{task_id}/status")
+def blocking_status(task_id: str, db: Session = Depends(get_db)):
+    task = db.get(models.OptimizationJob, task_id)
+    if not task:
+        raise HTTPException(status_code=404, detail="Task not found")
+    return {"job_id": task.id, "status": task.status, "queue_position": JobQueue(db).queue_position(task)}
+
+
+@blocking_router.get("/optimize/{task_id}/result")
+def blocking_result(
+    task_id: str,
+    if_none_match: Optional[str] = Header(default=None),
+    accept_encoding: Optional[str] = Header(default=None),
+    db: Session = Depends(get_db),
+):
+    Job = models.OptimizationJob
+    row = db.execute(select(Job.status, Job.result_etag).where(Job.id == task_id)).first()
+    if not row:
+        raise HTTPException(status_code=404, detail="Task not found")
+    blob = result_cache.get(task_id, row.result_etag)
+    if blob is None:
+        blob = db.scalar(select(Job.result_blob).where(Job.id == task_id))
+        result_cache.put(task_id, row.result_etag, blob)
+    headers = {"ETag": row.result_etag}
+    if etag_matches(if_none_match, row.result_etag):
+        return Response(status_code=304, headers=headers)
+    if accepts_gzip(accept_encoding):
+        headers["Content-Encoding"] = "gzip"
+        return Response(content=blob, media_type="application/json", headers=headers)
+    return Response(content=gzip.decompress(blob), media_type="application/json", headers=headers)
+
+
+def build_app() -> FastAPI:
+    """App serving the async routes under /async and the blocking ones under /blocking."""
+    app = FastAPI()
+    app.include_router(public_router, prefix="/async")
+    app.include_router(optimizer_router, prefix="/async")
+    app.include_router(blocking_router, prefix="/blocking")
+    return app
+
+
+# -----------------------------------------------------------------------------
+# Fixtures
+# -----------------------------------------------------------------------------
+@contextmanager
+def seeded_jobs(count: int):
+    """Store ``count`` jobs, half finished with a 400-request plan, and remove them afterwards."""
+    payload = generate_instance(400, 40, seed=3)
+    trips = build_trips(payload)
+    job_ids = []
+    with SessionLocal() as db:
+        for i in range(count):
+            job_id = f"BENCH-{uuid.uuid4()}"
+            if i % 2:
+                result = schemas.OptimizationResult(job_id=job_id, status="completed", scheduled_trips=trips)
+                db.add(models.OptimizationJob(
+                    id=job_id, status="completed", result=result.model_dump(mode="json"), **result_bodies(result)
+                ))
+            else:
+                # Held by a fake worker so nothing picks it up
+                db.add(models.OptimizationJob(id=job_id, status="pending", claimed_by="bench", attempts=1))
+            job_ids.append(job_id)
+        db.commit()
+    try:
+        yield job_ids
+    finally:
+        with SessionLocal() as db:
+            db.execute(delete(models.OptimizationJob).where(models.OptimizationJob.id.in_(job_ids)))
+            db.commit()
+
+
+@contextmanager
+def running_server():
+    """Run the benchmark app with uvicorn in a subprocess and yield its base URL."""
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    # A separate process, so the load generator does not compete for the server's GIL
+    server = subprocess.Popen([
+        sys.executable, "-m", "uvicorn", "benchmarks.bench_polling:build_app", "--factory",
+        "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning",
+        # Starved pollers can leave pooled connections idle past the 5 s default
+        "--timeout-keep-alive", "120",
+    ])
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        for _ in range(200):
+            try:
+                httpx.get(f"{base_url}/async/health", timeout=1)
+                break
+            except httpx.TransportError:
+                time.sleep(0.1)
+        yield base_url
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+
+
+# -----------------------------------------------------------------------------
+# Load generation
+# -----------------------------------------------------------------------------
+def percentile(samples: List[float], q: float) -> float:
+    return statistics.quantiles(samples, n=100)[q - 1] if len(samples) > 1 else (samples or [0.0])[0]
+
+
+async def run_load(base_url: str, mode: str, job_ids: List[str], pollers: int, seconds: float) -> Dict[str, List[float]]:
+    """Poll status and results from ``pollers`` clients while probing /health every 50 ms."""
+    headers = {"X-API-Key": settings.API_KEY}
+    latencies: Dict[str, List[float]] = {"poll": [], "plain": [], "health": []}
+    deadline = time.perf_counter() + seconds
+    limits = httpx.Limits(max_connections=pollers + 1, max_keepalive_connections=pollers + 1)
+
+    async with httpx.AsyncClient(base_url=f"{base_url}/{mode}", headers=headers, limits=limits, timeout=60) as client:
+        async def poller(seed: int):
+            rng = random.Random(seed)
+            # Odd pollers refuse gzip and get the inflated body
+            kind = "poll" if seed % 2 == 0 else "plain"
+            encoding = {"Accept-Encoding": "gzip" if kind == "poll" else "identity"}
+            etags: Dict[str, str] = {}
+            while time.perf_counter() < deadline:
+                job_id = rng.choice(job_ids)
+                started = time.perf_counter()
+                response = await client.get(f"/optimize/{job_id}/status", headers=encoding)
+                if response.json()["status"] == "completed":
+                    # Like a real poller, revalidate results already fetched
+                    cached = {"If-None-Match": etags[job_id]} if job_id in etags else {}
+                    response = await client.get(f"/optimize/{job_id}/result", headers={**encoding, **cached})
+                    etags[job_id] = response.headers["ETag"]
+                latencies[kind].append((time.perf_counter() - started) * 1000)
+
+        async def probe():
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                await client.get("/health")
+                latencies["health"].append((time.perf_counter() - started) * 1000)
+                await asyncio.sleep(0.05)
+
+        await asyncio.gather(probe(), *(poller(i) for i in range(pollers)))
+    return latencies
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pollers", type=int, default=200)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--jobs", type=int, default=50)
+    args = parser.parse_args()
+
+    create_db_and_tables()
+
+    print(f"{args.pollers} pollers for {args.seconds:.0f}s over {args.jobs} jobs ({settings.DATABASE_URL})")
+    header = (
+        f"{'handlers':<9} {'polls/s':>8} {'poll p50':>9} {'poll p99':>9} {'plain p99':>10} "
+        f"{'health p50':>11} {'health p99':>11}"
+    )
+    print(header)
+    print("-" * len(header))
+    with running_server() as base_url, seeded_jobs(args.jobs) as job_ids:
+        for mode in ("blocking", "async"):
+            latencies = asyncio.run(run_load(base_url, mode, job_ids, args.pollers, args.seconds))
+            poll, plain, health = latencies["poll"], latencies["plain"], latencies["health"]
+            print(
+                f"{mode:<9} {(len(poll) + len(plain)) / args.seconds:>8.0f} {percentile(poll, 50):>8.1f}ms"
+                f" {percentile(poll, 99):>8.1f}ms {percentile(plain, 99):>9.1f}ms"
+                f" {percentile(health, 50):>10.1f}ms {percentile(health, 99):>10.1f}ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
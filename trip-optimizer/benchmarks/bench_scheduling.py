@@ -0,0 +1,198 @@
+"""
+benchmarks/bench_scheduling.py
+
+Simulates the solver queue under a mixed workload and compares claim
+policies: batch jobs of a few thousand requests arrive among a stream of
+small ad-hoc jobs, and every job runs for its estimated solve time. Claims
+go through the real JobQueue on a private SQLite database (SCHEDULER_POLICY,
+SOLVER_MEMORY_BUDGET_MB); only the clock is simulated. Reports ad-hoc and
+batch queue waits and the peak estimated memory of running jobs.
+
+With --calibrate, solves instances of several sizes in fresh processes and
+prints measured wall time and peak memory next to the estimates.
+
+Usage:
+    python -m benchmarks.bench_scheduling [--workers 2] [--minutes 20] [--batch 2000 1500] [--adhoc-every 15]
+    python -m benchmarks.bench_scheduling --calibrate [--sizes 5 40 200 500] [--time-limit 5] [--engine ortools]
+"""
+
+# Standard library imports
+import argparse
+import heapq
+import multiprocessing
+import random
+import resource
+import statistics
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+# Third-party imports
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+# Local application imports
+from app.core.config import settings
+from app.db import models
+from app.db.session import Base
+from app.services.job_cost import estimate_job_cost, priority_at
+from app.services.job_queue import JobQueue
+from benchmarks.instances import generate_instance
+
+
+# -----------------------------------------------------------------------------
+# Queue simulation
+# -----------------------------------------------------------------------------
+def workload(minutes: float, batch_sizes: List[int], adhoc_every: float, seed: int) -> List[Tuple[float, str, Dict]]:
+    """Arrivals as (second, job ID, estimate): batch jobs early on, ad-hoc jobs throughout."""
+    rng = random.Random(seed)
+    arrivals = []
+    for i, size in enumerate(batch_sizes):
+        payload = generate_instance(size, max(2, size // 10), seed=i)
+        arrivals.append((i * 30.0, f"BATCH-{i}", estimate_job_cost(payload["vehicles"], payload["requests"])))
+    t, i = rng.uniform(0, adhoc_every), 0
+    while t < minutes * 60:
+        size = rng.randint(3, 20)
+        payload = generate_instance(size, max(2, size // 4), seed=100 + i)
+        arrivals.append((t, f"ADHOC-{i}", estimate_job_cost(payload["vehicles"], payload["requests"])))
+        t += rng.expovariate(1 / adhoc_every)
+        i += 1
+    return sorted(arrivals, key=lambda a: a[0])
+
+
+def simulate(arrivals: List[Tuple[float, str, Dict]], workers: int) -> Dict[str, float]:
+    """Run the arrivals through JobQueue with ``workers`` workers; every job takes its estimate."""
+    epoch = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{Path(tmp) / 'queue.db'}")
+        Base.metadata.create_all(bind=engine)
+        with sessionmaker(bind=engine)() as db:
+            queue = JobQueue(db)
+            pending = list(arrivals)
+            running: List[Tuple[float, str, str]] = []  # (finish second, job ID, worker)
+            idle = [f"W{i}" for i in range(workers)]
+            memory = {job_id: estimate.estimated_memory_mb for _, job_id, estimate in arrivals}
+            queued, waits, peak_memory, now = {}, {}, 0, 0.0
+
+            while pending or running or len(waits) < len(arrivals):
+                while pending and pending[0][0] <= now:
+                    at, job_id, estimate = pending.pop(0)
+                    queued_at = epoch + timedelta(seconds=at)
+                    db.add(models.OptimizationJob(
+                        id=job_id, status="pending", queued_at=queued_at, attempts=0,
+                        priority_at=priority_at(queued_at, estimate.estimated_seconds),
+                        estimated_seconds=estimate.estimated_seconds,
+                        estimated_memory_mb=estimate.estimated_memory_mb,
+                    ))
+                    queued[job_id] = (at, estimate.estimated_seconds)
+                db.commit()
+                while idle and (job_id := queue.claim(idle[-1])) is not None:
+                    heapq.heappush(running, (now + queued[job_id][1], job_id, idle.pop()))
+                    waits[job_id] = now - queued[job_id][0]
+                peak_memory = max(peak_memory, sum(memory[job_id] for _, job_id, _ in running))
+
+                # Advance to the next arrival or completion
+                next_arrival = pending[0][0] if pending else float("inf")
+                next_finish = running[0][0] if running else float("inf")
+                now = min(next_arrival, next_finish)
+                if now == float("inf"):
+                    break
+                while running and running[0][0] <= now:
+                    _, job_id, worker = heapq.heappop(running)
+                    db.get(models.OptimizationJob, job_id).status = "completed"
+                    idle.append(worker)
+                db.commit()
+        engine.dispose()
+
+    adhoc = [w for job_id, w in waits.items() if job_id.startswith("ADHOC")]
+    batch = [w for job_id, w in waits.items() if job_id.startswith("BATCH")]
+    return {
+        "adhoc_p50": statistics.median(adhoc) if adhoc else 0.0,
+        "adhoc_p95": statistics.quantiles(adhoc, n=20)[-1] if len(adhoc) > 1 else 0.0,
+        "adhoc_max": max(adhoc, default=0.0),
+        "batch_max": max(batch, default=0.0),
+        "peak_memory_mb": peak_memory,
+        "makespan": now,
+    }
+
+
+# -----------------------------------------------------------------------------
+# Calibration
+# -----------------------------------------------------------------------------
+def measure(requests: int, vehicles: int, engine: str, time_limit: int) -> Tuple[float, float]:
+    """Solve one instance in this (fresh) process; return wall seconds and peak RSS in MB."""
+    settings.SOLVER_TIME_LIMIT_SECONDS = time_limit
+    if engine == "heuristic":
+        from app.services.heuristic_solver import HeuristicSolver as solver_cls
+    else:
+        from app.services.optimization_solver import OptimizationSolver as solver_cls
+    payload = generate_instance(requests, vehicles, seed=1)
+    started = time.perf_counter()
+    solver_cls(payload["vehicles"], payload["requests"]).solve()
+    return time.perf_counter() - started, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def calibrate(sizes: List[int], engine: str, time_limit: int) -> None:
+    settings.SOLVER_TIME_LIMIT_SECONDS = time_limit
+    header = f"{'reqs':>5} {'vehs':>5} | {'est_s':>7} {'time_s':>7} | {'est_mb':>7} {'peak_mb':>7}"
+    print(f"{engine}, time limit {time_limit}s")
+    print(header)
+    print("-" * len(header))
+    for size in sizes:
+        vehicles = max(2, size // 6)
+        payload = generate_instance(size, vehicles, seed=1)
+        estimate = estimate_job_cost(payload["vehicles"], payload["requests"], engine)
+        # A fresh process per size, so peak memory is the solve's own
+        with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+            seconds, peak_mb = pool.submit(measure, size, vehicles, engine, time_limit).result()
+        print(
+            f"{size:>5} {vehicles:>5} | {estimate.estimated_seconds:>7.2f} {seconds:>7.2f} | "
+            f"{estimate.estimated_memory_mb:>7} {peak_mb:>7.0f}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--minutes", type=float, default=20)
+    parser.add_argument("--batch", type=int, nargs="*", default=[2000, 1500])
+    parser.add_argument("--adhoc-every", type=float, default=15, help="Mean seconds between ad-hoc jobs")
+    parser.add_argument("--memory-budget", type=int, default=settings.SOLVER_MEMORY_BUDGET_MB)
+    parser.add_argument("--calibrate", action="store_true")
+    parser.add_argument("--sizes", type=int, nargs="*", default=[5, 40, 200, 500])
+    parser.add_argument("--engine", choices=["ortools", "heuristic"], default="ortools")
+    parser.add_argument("--time-limit", type=int, default=5)
+    args = parser.parse_args()
+
+    if args.calibrate:
+        calibrate(args.sizes, args.engine, args.time_limit)
+        return
+
+    arrivals = workload(args.minutes, args.batch, args.adhoc_every, seed=7)
+    batch_est = [e for _, job_id, e in arrivals if job_id.startswith("BATCH")]
+    print(
+        f"{len(arrivals)} jobs over {args.minutes:.0f} min, {args.workers} workers; batch jobs "
+        + ", ".join(f"{e.estimated_seconds:.0f}s/{e.estimated_memory_mb}MB" for e in batch_est)
+    )
+    header = (
+        f"{'policy':<6} {'budget_mb':>9} | {'adhoc_p50':>9} {'adhoc_p95':>9} {'adhoc_max':>9} "
+        f"{'batch_max':>9} {'peak_mb':>8} {'makespan':>8}"
+    )
+    print(header)
+    print("-" * len(header))
+    for policy, budget in (("fifo", 0), ("sjf", 0), ("sjf", args.memory_budget)):
+        settings.SCHEDULER_POLICY = policy
+        settings.SOLVER_MEMORY_BUDGET_MB = budget
+        stats = simulate(arrivals, args.workers)
+        print(
+            f"{policy:<6} {budget or '-':>9} | {stats['adhoc_p50']:>9.1f} {stats['adhoc_p95']:>9.1f} "
+            f"{stats['adhoc_max']:>9.1f} {stats['batch_max']:>9.1f} {stats['peak_memory_mb']:>8} "
+            f"{stats['makespan']:>8.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+benchmarks/bench_time_windows.py
+
+Compares solve time and plan quality with no pickup windows, wide windows and
+tight windows (each ending an hour before the dropoff), with and without
+stop service times, on the same generated instance.
+
+Usage:
+    python -m benchmarks.bench_time_windows [--requests 40] [--vehicles 12] [--time-limit 5] [--service-minutes 5]
+"""
+
+# Standard library imports
+import argparse
+import copy
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+# Local application imports
+from app.core.config import settings
+from app.services.heuristic_solver import HeuristicSolver
+from app.services.optimization_solver import OptimizationSolver
+from benchmarks.instances import generate_instance
+
+# Pickup window opening hours before the dropoff (None: no window)
+WINDOWS = {"none": None, "wide": 6, "tight": 2}
+
+
+def with_windows(payload: Dict[str, Any], open_hours: Optional[int], service_minutes: float) -> Dict[str, Any]:
+    """Copy a payload, adding pickup windows closing an hour before each dropoff and service times."""
+    payload = copy.deepcopy(payload)
+    for req in payload["requests"]:
+        req["pickup_service_minutes"] = service_minutes
+        req["dropoff_service_minutes"] = service_minutes
+        if open_hours is None:
+            continue
+        dropoff = datetime.fromisoformat(req["dropoff_time"].replace("Z", "+00:00"))
+        req["earliest_pickup"] = (dropoff - timedelta(hours=open_hours)).strftime("%Y-%m-%dT%H:%M:%SZ")
+        req["latest_pickup"] = (dropoff - timedelta(hours=1)).strftime("%Y-%m-%dT%H:%M:%SZ")
+    return payload
+
+
+def run(solver_cls, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Solve one payload and collect plan statistics."""
+    started = time.perf_counter()
+    result = solver_cls(payload["vehicles"], payload["requests"]).solve()
+    elapsed = time.perf_counter() - started
+    return {
+        "seconds": elapsed,
+        "trips": len(result["assigned"]),
+        "unassigned": len(result["unassigned_requests"]),
+        "route_time_s": sum(a["total_time_s"] for a in result["assigned"]),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=40)
+    parser.add_argument("--vehicles", type=int, default=12)
+    parser.add_argument("--time-limit", type=int, default=5, help="OR-Tools time limit in seconds")
+    parser.add_argument("--service-minutes", type=float, default=5)
+    parser.add_argument("--engines", nargs="*", default=["heuristic", "ortools"])
+    args = parser.parse_args()
+
+    settings.SOLVER_TIME_LIMIT_SECONDS = args.time_limit
+    engines = {"heuristic": HeuristicSolver, "ortools": OptimizationSolver}
+    base = generate_instance(args.requests, args.vehicles, seed=5)
+
+    header = f"{'engine':<9} {'window':<6} {'svc_min':>7} | {'time_s':>8} {'trips':>5} {'unasg':>5} {'route_min':>9}"
+    print(header)
+    print("-" * len(header))
+    for engine in args.engines:
+        for name, open_hours in WINDOWS.items():
+            for service in (0, args.service_minutes):
+                stats = run(engines[engine], with_windows(base, open_hours, service))
+                print(
+                    f"{engine:<9} {name:<6} {service:>7g} | {stats['seconds']:>8.2f} {stats['trips']:>5} "
+                    f"{stats['unassigned']:>5} {stats['route_time_s'] / 60:>9.0f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
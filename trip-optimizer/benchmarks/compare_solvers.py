@@ -0,0 +1,71 @@
+"""
+benchmarks/compare_solvers.py
+
+Measures the heuristic engine against OR-Tools on the benchmark instances.
+
+Usage:
+    python -m benchmarks.compare_solvers [--time-limit SECONDS] [--instances small medium]
+"""
+
+# Standard library imports
+import argparse
+import time
+from typing import Any, Dict
+
+# Local application imports
+from app.core.config import settings
+from app.services.heuristic_solver import HeuristicSolver
+from app.services.optimization_solver import OptimizationSolver
+from benchmarks.instances import load_instances
+
+
+def run_solver(solver_cls, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Solve one instance and collect plan statistics.
+
+    Returns:
+        dict: Wall time, total route time, vehicles used and unassigned count.
+    """
+    solver = solver_cls(payload["vehicles"], payload["requests"])
+    started = time.perf_counter()
+    result = solver.solve()
+    elapsed = time.perf_counter() - started
+    return {
+        "seconds": elapsed,
+        "route_time_s": sum(a["total_time_s"] for a in result["assigned"]),
+        "vehicles": len(result["assigned"]),
+        "unassigned": len(result["unassigned_requests"]),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--time-limit", type=int, default=settings.SOLVER_TIME_LIMIT_SECONDS,
+                        help="OR-Tools time limit in seconds")
+    parser.add_argument("--instances", nargs="*", help="Subset of instance names to run")
+    args = parser.parse_args()
+
+    settings.SOLVER_TIME_LIMIT_SECONDS = args.time_limit
+    instances = load_instances()
+    names = args.instances or list(instances)
+
+    header = f"{'instance':<8} {'reqs':>5} {'veh':>4} | {'engine':<9} {'time_s':>8} {'route_min':>9} {'used':>4} {'unasg':>5} | {'gap_%':>6}"
+    print(header)
+    print("-" * len(header))
+    for name in names:
+        payload = instances[name]
+        baseline = run_solver(OptimizationSolver, payload)
+        heuristic = run_solver(HeuristicSolver, payload)
+        for engine, stats in (("ortools", baseline), ("heuristic", heuristic)):
+            gap = ""
+            if engine == "heuristic" and baseline["route_time_s"]:
+                gap = f"{100.0 * (stats['route_time_s'] - baseline['route_time_s']) / baseline['route_time_s']:6.1f}"
+            print(
+                f"{name:<8} {len(payload['requests']):>5} {len(payload['vehicles']):>4} | "
+                f"{engine:<9} {stats['seconds']:>8.3f} {stats['route_time_s'] / 60:>9.0f} "
+                f"{stats['vehicles']:>4} {stats['unassigned']:>5} | {gap:>6}"
+            )
+
+
+if __name__ == "__main__":
+    main()
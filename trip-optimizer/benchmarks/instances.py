@@ -0,0 +1,119 @@
+"""
+benchmarks/instances.py
+
+Deterministic benchmark instances for the Trip Optimizer.
+Generates shuttle-style payloads around Ho Chi Minh City (commutes between
+a few plants and many pickup points) in the same shape as POST /optimize.
+"""
+
+# Standard library imports
+import json
+import pathlib
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List
+
+SAMPLE_INPUT = pathlib.Path(__file__).resolve().parents[1] / "app" / "sample_data" / "sample_input.json"
+
+# Plants that most bookings start from or go to
+PLANTS = [
+    {"id": "PLANT-1", "latitude": 10.944313, "longitude": 107.140062},
+    {"id": "PLANT-2", "latitude": 10.572437, "longitude": 106.416062},
+    {"id": "PLANT-3", "latitude": 10.771937, "longitude": 106.721063},
+]
+
+# (name, number of requests, number of vehicles, seed)
+SIZES = [
+    ("small", 10, 4, 1),
+    ("medium", 40, 12, 2),
+    ("large", 120, 30, 3),
+]
+
+
+def generate_instance(num_requests: int, num_vehicles: int, seed: int) -> Dict[str, Any]:
+    """
+    Generate a reproducible optimization payload.
+
+    Args:
+        num_requests (int): Number of booking requests.
+        num_vehicles (int): Number of vehicles.
+        seed (int): Random seed.
+
+    Returns:
+        dict: Payload accepted by POST /optimize.
+    """
+    rng = random.Random(seed)
+    day = datetime(2025, 8, 20, tzinfo=timezone.utc)
+
+    vehicles = [
+        {"id": f"VEH-{i + 1}", "capacity": rng.choice([4, 7, 7, 16])}
+        for i in range(num_vehicles)
+    ]
+
+    requests: List[Dict[str, Any]] = []
+    for i in range(num_requests):
+        plant = rng.choice(PLANTS)
+        point = {
+            "id": f"LOC-{i + 1}",
+            "latitude": round(10.65 + rng.random() * 0.35, 6),
+            "longitude": round(106.55 + rng.random() * 0.45, 6),
+        }
+        inbound = rng.random() < 0.6
+        # Morning shifts arrive at plants, afternoon shifts leave them
+        hour = rng.choice([1, 2, 3]) if inbound else rng.choice([9, 10, 11])
+        dropoff_time = day + timedelta(hours=hour, minutes=rng.choice([0, 15, 30, 45]))
+        requests.append({
+            "id": f"REQ-{i + 1}",
+            "pickup_location": point if inbound else plant,
+            "dropoff_location": plant if inbound else point,
+            "dropoff_time": dropoff_time.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "capacity_demand": rng.randint(1, 4),
+        })
+
+    return {"vehicles": vehicles, "requests": requests}
+
+
+def generate_multiday_instance(days: int, requests_per_day: int, num_vehicles: int, seed: int) -> Dict[str, Any]:
+    """
+    Generate a payload spanning several consecutive days with the same fleet.
+
+    Args:
+        days (int): Number of days.
+        requests_per_day (int): Booking requests per day.
+        num_vehicles (int): Number of vehicles.
+        seed (int): Random seed.
+
+    Returns:
+        dict: Payload accepted by POST /optimize.
+    """
+    vehicles = generate_instance(0, num_vehicles, seed)["vehicles"]
+    requests: List[Dict[str, Any]] = []
+    for d in range(days):
+        prefix = f"D{d + 1}-"
+        for req in generate_instance(requests_per_day, 0, seed + d)["requests"]:
+            dropoff = datetime.fromisoformat(req["dropoff_time"].replace("Z", "+00:00")) + timedelta(days=d)
+            # Pickup points differ per day; plants are shared
+            stops = {
+                key: req[key] if req[key] in PLANTS else {**req[key], "id": prefix + req[key]["id"]}
+                for key in ("pickup_location", "dropoff_location")
+            }
+            requests.append({
+                **req,
+                **stops,
+                "id": prefix + req["id"],
+                "dropoff_time": dropoff.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            })
+    return {"vehicles": vehicles, "requests": requests}
+
+
+def load_instances() -> Dict[str, Dict[str, Any]]:
+    """
+    Load all benchmark instances, including the bundled sample input.
+
+    Returns:
+        dict: Instance name mapped to its payload.
+    """
+    instances = {"sample": json.loads(SAMPLE_INPUT.read_text())}
+    for name, num_requests, num_vehicles, seed in SIZES:
+        instances[name] = generate_instance(num_requests, num_vehicles, seed)
+    return instances
@@ -0,0 +1,389 @@
+"""
+benchmarks/load_test.py
+
+HTTP load generator for the optimizer API, replaying the request mix the
+booking server produces: bursts of POST /optimize submissions while pollers
+hammer job status and, once a job finishes, fetch its result.
+
+Targets:
+- "inprocess": the app served through httpx's ASGI transport, with its
+  lifespan (solver pool included) running in this process.
+- "server": the app under uvicorn in a subprocess on a free local port.
+- --url: an already running server (scenario settings are not applied).
+
+Matrices come from the haversine fallback and solver budgets are small, so
+runs need no Google Maps key. Scenario settings (time limit, workers, queue
+size, plus any --set NAME=VALUE) are applied as environment variables before
+the app is imported or started. Reports throughput, p50/p95/p99 latency,
+error rate (5xx and transport errors) and 429 rate per endpoint.
+
+Usage:
+    python -m benchmarks.load_test [--scenario burst|steady|overload|path.json] [--target inprocess|server]
+        [--url http://host:port] [--jobs 20] [--pollers 50] [--seconds 30] [--set SOLVER_WORKER_PROCESSES=4 ...]
+"""
+
+# Standard library imports
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from contextlib import asynccontextmanager, contextmanager
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
+
+# Third-party imports
+import httpx
+
+# Local application imports
+from benchmarks.instances import generate_instance
+
+API_PREFIX = "/optimizer/api/v1"
+
+# Built-in scenarios; any key may be overridden from the command line
+SCENARIOS: Dict[str, Dict[str, Any]] = {
+    # The server's usual pattern: a batch of submissions, then polling until done
+    "burst": {
+        "jobs": 20, "submit_rate": 0, "submitters": 20,
+        "pollers": 50, "poll_interval": 0.2, "long_poll": 0,
+        "requests_per_job": 20, "vehicles_per_job": 6, "seconds": 30,
+        "settings": {"SOLVER_TIME_LIMIT_SECONDS": 1, "SOLVER_WORKER_PROCESSES": 2, "SOLVER_QUEUE_MAXSIZE": 20},
+    },
+    # Submissions spread over the run at a fixed rate
+    "steady": {
+        "jobs": 30, "submit_rate": 1.0, "submitters": 4,
+        "pollers": 20, "poll_interval": 0.5, "long_poll": 0,
+        "requests_per_job": 20, "vehicles_per_job": 6, "seconds": 40,
+        "settings": {"SOLVER_TIME_LIMIT_SECONDS": 1, "SOLVER_WORKER_PROCESSES": 2, "SOLVER_QUEUE_MAXSIZE": 20},
+    },
+    # More submissions than the queue admits, to exercise 429 and Retry-After
+    "overload": {
+        "jobs": 60, "submit_rate": 0, "submitters": 30,
+        "pollers": 100, "poll_interval": 0.1, "long_poll": 0,
+        "requests_per_job": 20, "vehicles_per_job": 6, "seconds": 30,
+        "settings": {"SOLVER_TIME_LIMIT_SECONDS": 1, "SOLVER_WORKER_PROCESSES": 2, "SOLVER_QUEUE_MAXSIZE": 10},
+    },
+}
+
+FINISHED_STATUSES = {"completed", "failed", "completed_with_no_solution"}
+
+
+def load_scenario(name: str) -> Dict[str, Any]:
+    """A built-in scenario by name, or one read from a JSON file (missing keys from "burst")."""
+    if name in SCENARIOS:
+        return json.loads(json.dumps(SCENARIOS[name]))
+    path = Path(name)
+    if not path.is_file():
+        raise SystemExit(f"Unknown scenario {name!r}; use one of {', '.join(SCENARIOS)} or a JSON file")
+    custom = json.loads(path.read_text())
+    base = json.loads(json.dumps(SCENARIOS["burst"]))
+    base["settings"].update(custom.pop("settings", {}))
+    base.update(custom)
+    return base
+
+
+def percentile(samples: List[float], q: int) -> float:
+    """The q-th percentile of the samples (0.0 when there are none)."""
+    if len(samples) < 2:
+        return (samples or [0.0])[0]
+    return statistics.quantiles(samples, n=100)[q - 1]
+
+
+# -----------------------------------------------------------------------------
+# Metrics
+# -----------------------------------------------------------------------------
+class LoadStats:
+    """Latencies and outcomes per endpoint, plus job turnaround times."""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.statuses: Dict[str, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
+        self.transport_errors: Dict[str, int] = defaultdict(int)
+        self.submitted_at: Dict[str, float] = {}
+        self.turnaround: Dict[str, float] = {}
+
+    async def call(self, client: httpx.AsyncClient, endpoint: str, method: str, url: str, **kwargs) -> Optional[httpx.Response]:
+        """Send one request and record it under ``endpoint``; None on transport errors."""
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.TransportError:
+            self.transport_errors[endpoint] += 1
+            return None
+        finally:
+            self.latencies[endpoint].append((time.perf_counter() - started) * 1000)
+        self.statuses[endpoint][response.status_code] += 1
+        return response
+
+    def report(self, elapsed: float) -> List[Dict[str, Any]]:
+        """One row per endpoint: count, throughput, latency percentiles, error and 429 rates."""
+        rows = []
+        for endpoint in sorted(self.latencies):
+            samples = self.latencies[endpoint]
+            statuses = self.statuses[endpoint]
+            errors = self.transport_errors[endpoint] + sum(n for code, n in statuses.items() if code >= 500)
+            rows.append({
+                "endpoint": endpoint,
+                "count": len(samples),
+                "rps": len(samples) / elapsed if elapsed > 0 else 0.0,
+                "p50": percentile(samples, 50),
+                "p95": percentile(samples, 95),
+                "p99": percentile(samples, 99),
+                "error_rate": errors / len(samples),
+                "throttled_rate": statuses.get(429, 0) / len(samples),
+            })
+        return rows
+
+
+# -----------------------------------------------------------------------------
+# Load generation
+# -----------------------------------------------------------------------------
+async def run_scenario(client: httpx.AsyncClient, scenario: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Drive one scenario against a client whose base URL is the app root.
+
+    Submitters send ``jobs`` payloads (all at once when ``submit_rate`` is 0,
+    otherwise that many per second); a 429 is retried after its Retry-After
+    while the run lasts. Pollers pick random submitted jobs whose result has
+    not been fetched, poll their status and, once finished, fetch the result
+    (other pollers may still be polling the job at that moment). The run
+    ends after ``seconds`` or once every job's result has been fetched.
+
+    Args:
+        client (httpx.AsyncClient): Client for the app (in-process or over HTTP).
+        scenario (dict): Scenario keys as in SCENARIOS.
+
+    Returns:
+        dict: "rows" (per-endpoint report), "elapsed", "job_ids" and
+        "accepted" (jobs the API took), "finished" and
+        "turnaround_p50"/"turnaround_p95" in seconds.
+    """
+    stats = LoadStats()
+    payloads = [
+        generate_instance(scenario["requests_per_job"], scenario["vehicles_per_job"], seed=i)
+        for i in range(scenario["jobs"])
+    ]
+    pending: List[str] = []
+    queue: asyncio.Queue = asyncio.Queue()
+    for payload in payloads:
+        queue.put_nowait(payload)
+
+    started = time.perf_counter()
+    deadline = started + scenario["seconds"]
+    rate = scenario["submit_rate"]
+
+    async def submitter(offset: int):
+        while time.perf_counter() < deadline:
+            try:
+                payload = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            if rate:
+                # Ticket i may go out i / rate seconds after the start
+                ticket = scenario["jobs"] - queue.qsize() - 1
+                await asyncio.sleep(max(0.0, started + ticket / rate - time.perf_counter()))
+            while time.perf_counter() < deadline:
+                response = await stats.call(client, "POST /optimize", "POST", f"{API_PREFIX}/optimize", json=payload)
+                if response is not None and response.status_code == 202:
+                    job_id = response.json()["job_id"]
+                    stats.submitted_at[job_id] = time.perf_counter()
+                    pending.append(job_id)
+                    break
+                retry_after = float(response.headers.get("Retry-After", 1)) if response is not None else 1.0
+                await asyncio.sleep(min(retry_after, max(0.0, deadline - time.perf_counter())))
+
+    def done() -> bool:
+        # Every job submitted and every submitted job's result fetched
+        return queue.empty() and not pending and len(stats.submitted_at) == scenario["jobs"]
+
+    async def poller(seed: int):
+        rng = random.Random(seed)
+        params = {"wait": scenario["long_poll"]} if scenario["long_poll"] else None
+        while time.perf_counter() < deadline and not done():
+            if not pending:
+                await asyncio.sleep(scenario["poll_interval"])
+                continue
+            job_id = rng.choice(pending)
+            response = await stats.call(
+                client, "GET status", "GET", f"{API_PREFIX}/optimize/{job_id}/status", params=params
+            )
+            if response is not None and response.status_code == 200 and response.json()["status"] in FINISHED_STATUSES:
+                if job_id not in stats.turnaround:
+                    stats.turnaround[job_id] = time.perf_counter() - stats.submitted_at[job_id]
+                response = await stats.call(client, "GET result", "GET", f"{API_PREFIX}/optimize/{job_id}/result")
+                if response is not None and response.status_code == 200 and job_id in pending:
+                    pending.remove(job_id)
+            await asyncio.sleep(scenario["poll_interval"])
+
+    await asyncio.gather(
+        *(submitter(i) for i in range(max(1, scenario["submitters"]))),
+        *(poller(i) for i in range(scenario["pollers"])),
+    )
+    elapsed = time.perf_counter() - started
+    turnaround = list(stats.turnaround.values())
+    return {
+        "rows": stats.report(elapsed),
+        "elapsed": elapsed,
+        "job_ids": list(stats.submitted_at),
+        "accepted": len(stats.submitted_at),
+        "finished": len(turnaround),
+        "turnaround_p50": percentile(turnaround, 50),
+        "turnaround_p95": percentile(turnaround, 95),
+    }
+
+
+# -----------------------------------------------------------------------------
+# Targets
+# -----------------------------------------------------------------------------
+def client_options(api_key: str, connections: int) -> Dict[str, Any]:
+    """Shared httpx client options: API key, gzip results and a pool sized for all tasks."""
+    return {
+        "headers": {"X-API-Key": api_key, "Accept-Encoding": "gzip"},
+        "limits": httpx.Limits(max_connections=connections, max_keepalive_connections=connections),
+        "timeout": 120,
+    }
+
+
+@asynccontextmanager
+async def inprocess_client(connections: int) -> AsyncIterator[httpx.AsyncClient]:
+    """Client for the app served in this process, with its lifespan running."""
+    # Imported here so scenario settings in os.environ are read by the app
+    from app.core.config import settings
+    from app.db.session import async_engine
+    from app.main import app
+
+    try:
+        async with app.router.lifespan_context(app):
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(
+                transport=transport, base_url="http://inprocess", **client_options(settings.API_KEY, connections)
+            ) as client:
+                yield client
+    finally:
+        # Pooled aiosqlite connections run on non-daemon threads that would block exit
+        await async_engine.dispose()
+
+
+@contextmanager
+def running_server() -> Iterator[str]:
+    """Run the app with uvicorn in a subprocess (inheriting os.environ) and yield its base URL."""
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    server = subprocess.Popen([
+        sys.executable, "-m", "uvicorn", "app.main:app",
+        "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning", "--timeout-keep-alive", "120",
+    ])
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        for _ in range(300):
+            try:
+                httpx.get(f"{base_url}{API_PREFIX}/health", timeout=1)
+                break
+            except httpx.TransportError:
+                time.sleep(0.1)
+        yield base_url
+    finally:
+        server.terminate()
+        server.wait(timeout=60)
+
+
+def remove_jobs(job_ids: List[str]) -> None:
+    """Delete the run's jobs so unfinished ones are not picked up by later runs."""
+    from sqlalchemy import delete
+
+    from app.db import models
+    from app.db.session import SessionLocal
+
+    with SessionLocal() as db:
+        db.execute(delete(models.OptimizationJob).where(models.OptimizationJob.id.in_(job_ids)))
+        db.commit()
+
+
+async def run_target(args: argparse.Namespace, scenario: Dict[str, Any]) -> Dict[str, Any]:
+    """Run the scenario against the selected target."""
+    connections = scenario["submitters"] + scenario["pollers"]
+    if args.target == "inprocess" and not args.url:
+        async with inprocess_client(connections) as client:
+            return await run_scenario(client, scenario)
+    api_key = os.environ["API_KEY"]
+    if args.url:
+        async with httpx.AsyncClient(base_url=args.url, **client_options(api_key, connections)) as client:
+            return await run_scenario(client, scenario)
+    with running_server() as base_url:
+        async with httpx.AsyncClient(base_url=base_url, **client_options(api_key, connections)) as client:
+            return await run_scenario(client, scenario)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenario", default="burst", help="Built-in scenario name or JSON file")
+    parser.add_argument("--target", choices=["inprocess", "server"], default="inprocess")
+    parser.add_argument("--url", help="Base URL of a running server (overrides --target)")
+    for key in ("jobs", "submitters", "pollers", "requests_per_job", "vehicles_per_job"):
+        parser.add_argument(f"--{key.replace('_', '-')}", dest=key, type=int)
+    for key in ("submit_rate", "poll_interval", "long_poll", "seconds"):
+        parser.add_argument(f"--{key.replace('_', '-')}", dest=key, type=float)
+    parser.add_argument("--set", dest="overrides", action="append", default=[], metavar="NAME=VALUE",
+                        help="App setting for the run, e.g. SOLVER_QUEUE_MAXSIZE=50")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    scenario = load_scenario(args.scenario)
+    for key in list(scenario):
+        if getattr(args, key, None) is not None:
+            scenario[key] = getattr(args, key)
+    for pair in args.overrides:
+        name, sep, value = pair.partition("=")
+        if not sep:
+            raise SystemExit(f"Expected NAME=VALUE, got {pair!r}")
+        scenario["settings"][name.strip()] = value.strip()
+
+    if args.url:
+        print("[LOAD] Targeting an existing server; scenario settings are not applied")
+    else:
+        # Fallback matrices only: the load test must never call the Distance Matrix API
+        os.environ["GOOGLE_MAPS_API_KEY"] = ""
+        os.environ["SOLVER_WARMUP_ENABLED"] = "false"
+        for name, value in scenario["settings"].items():
+            os.environ[name] = str(value)
+
+    settings_text = " ".join(f"{k}={v}" for k, v in scenario["settings"].items())
+    print(
+        f"[LOAD] {args.scenario} on {args.url or args.target}: {scenario['jobs']} jobs x "
+        f"{scenario['requests_per_job']} requests, {scenario['submitters']} submitters, "
+        f"{scenario['pollers']} pollers, {scenario['seconds']:.0f}s ({settings_text})"
+    )
+    outcome = asyncio.run(run_target(args, scenario))
+    if not args.url:
+        remove_jobs(outcome["job_ids"])
+
+    if args.json:
+        print(json.dumps({k: v for k, v in outcome.items() if k != "job_ids"}, indent=2))
+        return
+    header = (
+        f"{'endpoint':<14} {'count':>6} {'req/s':>7} {'p50_ms':>8} {'p95_ms':>8} {'p99_ms':>8} "
+        f"{'errors':>7} {'429':>6}"
+    )
+    print(header)
+    print("-" * len(header))
+    for row in outcome["rows"]:
+        print(
+            f"{row['endpoint']:<14} {row['count']:>6} {row['rps']:>7.1f} {row['p50']:>8.1f} {row['p95']:>8.1f} "
+            f"{row['p99']:>8.1f} {row['error_rate']:>7.1%} {row['throttled_rate']:>6.1%}"
+        )
+    print(
+        f"{outcome['accepted']}/{scenario['jobs']} jobs accepted, {outcome['finished']} seen finished; "
+        f"turnaround p50 {outcome['turnaround_p50']:.1f}s, p95 {outcome['turnaround_p95']:.1f}s "
+        f"over {outcome['elapsed']:.1f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
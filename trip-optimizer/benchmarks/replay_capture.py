@@ -0,0 +1,101 @@
+"""
+benchmarks/replay_capture.py
+
+Replays a captured job (see CAPTURE_MODE) offline: every captured model is
+rebuilt with its recorded matrices and solved again with the captured
+solver settings, optionally overridden. No distance matrix API calls are
+made. Each model is solved --repeat times; min and median wall times are
+printed next to the captured outcome.
+
+Usage:
+    python -m benchmarks.replay_capture captures/OPT-1234.msgpack.gz [--engine ortools|heuristic]
+        [--set SOLVER_TIME_LIMIT_SECONDS=5 ...] [--repeat 3] [--model 0]
+"""
+
+# Standard library imports
+import argparse
+import statistics
+import time
+from typing import Any, Dict, List
+
+# Local application imports
+from app.core.config import settings
+from app.services.heuristic_solver import HeuristicSolver
+from app.services.instance_capture import build_solver, load_capture
+from app.services.optimization_solver import OptimizationSolver
+
+
+def apply_settings(values: Dict[str, Any]) -> None:
+    """Set solver settings, coercing strings to each setting's type."""
+    for name, value in values.items():
+        if name not in type(settings).model_fields:
+            raise SystemExit(f"Unknown setting: {name}")
+        current = getattr(settings, name)
+        if isinstance(value, str) and not isinstance(current, str):
+            if isinstance(current, bool):
+                value = value.lower() in ("1", "true", "yes", "on")
+            else:
+                value = type(current)(value)
+        setattr(settings, name, value)
+
+
+def parse_overrides(pairs: List[str]) -> Dict[str, str]:
+    """Parse NAME=VALUE command-line overrides."""
+    overrides = {}
+    for pair in pairs:
+        name, sep, value = pair.partition("=")
+        if not sep:
+            raise SystemExit(f"Expected NAME=VALUE, got {pair!r}")
+        overrides[name.strip()] = value.strip()
+    return overrides
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", help="Capture file (.msgpack.gz)")
+    parser.add_argument("--engine", choices=["ortools", "heuristic"], help="Defaults to the captured solver mode")
+    parser.add_argument("--set", dest="overrides", action="append", default=[], metavar="NAME=VALUE")
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--model", type=int, help="Replay only this model (rolling-horizon window)")
+    args = parser.parse_args()
+
+    capture = load_capture(args.path)
+    apply_settings(capture["settings"])
+    apply_settings(parse_overrides(args.overrides))
+    engine = args.engine or capture["solver_mode"]
+    solver_cls = HeuristicSolver if engine == "heuristic" else OptimizationSolver
+
+    version = capture["code_version"]
+    print(
+        f"Job {capture['job_id']} captured {capture['captured_at']:%Y-%m-%d %H:%M:%S} UTC "
+        f"(api {version['api_version']}, commit {(version['commit'] or 'unknown')[:12]}, "
+        f"ortools {version['ortools']}); solve took {capture['solve_seconds']}s"
+    )
+    print(f"Replaying with {engine}, time limit {settings.SOLVER_TIME_LIMIT_SECONDS}s, {args.repeat} run(s) per model")
+
+    header = (
+        f"{'model':>5} {'reqs':>5} {'nodes':>5} | {'min_s':>8} {'median_s':>8} {'trips':>5} {'unasg':>5} "
+        f"{'objective':>10} {'gap':>6} | {'captured':>10}"
+    )
+    print(header)
+    print("-" * len(header))
+    for index, model in enumerate(capture["models"]):
+        if args.model is not None and index != args.model:
+            continue
+        timings, result = [], None
+        for _ in range(max(1, args.repeat)):
+            solver = build_solver(model, solver_cls)
+            started = time.perf_counter()
+            result = solver.solve()
+            timings.append(time.perf_counter() - started)
+        outcome = model["outcome"]
+        print(
+            f"{index:>5} {len(model['requests']):>5} {model['size']:>5} | {min(timings):>8.3f} "
+            f"{statistics.median(timings):>8.3f} {len(result['assigned']):>5} "
+            f"{len(result['unassigned_requests']):>5} {result['objective']:>10} {result['optimality_gap']:>6.1%} | "
+            f"{outcome['objective'] if outcome['objective'] is not None else '-':>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
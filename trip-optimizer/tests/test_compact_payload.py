@@ -0,0 +1,86 @@
+import copy
+import os
+import uuid
+
+import pytest
+
+from app.db import models
+from app.db.session import SessionLocal
+from app.models import schemas
+from app.workers.job_worker import process_job
+from benchmarks.instances import generate_instance
+
+API_PREFIX = "/optimizer/api/v1"
+HEADERS = {"X-API-Key": os.environ.get("API_KEY", "test-api-key")}
+
+
+def _full_payload():
+    return {**generate_instance(num_requests=6, num_vehicles=2, seed=40), "solver_mode": "heuristic"}
+
+
+def _run(payload):
+    job_id = f"OPT-{uuid.uuid4()}"
+    with SessionLocal() as db:
+        db.add(models.OptimizationJob(
+            id=job_id, status="pending", request_payload=payload, claimed_by="test", attempts=1
+        ))
+        db.commit()
+    process_job(job_id, "test")
+    with SessionLocal() as db:
+        result = db.get(models.OptimizationJob, job_id).result
+    # Stop ETAs are still stamped with the wall clock
+    for trip in result["scheduled_trips"]:
+        for stop in trip["route"]:
+            stop.pop("estimated_arrival_time")
+    return result
+
+
+def test_compact_payload_round_trips_and_shares_locations():
+    full = _full_payload()
+    compact = schemas.compact_payload(full)
+
+    # Plants are listed once, however many requests use them
+    assert len(compact["locations"]["id"]) == len(set(compact["locations"]["id"]))
+    assert len(compact["locations"]["id"]) < 2 * len(full["requests"])
+
+    request = schemas.parse_optimization_request(compact)
+    assert isinstance(request, schemas.CompactOptimizationRequest)
+    assert request.request_ids() == [r["id"] for r in full["requests"]]
+
+    expanded = schemas.expand_payload(request.model_dump(mode="json"))
+    reference = schemas.OptimizationRequest(**full).model_dump(mode="json")
+    assert schemas.OptimizationRequest(**expanded).model_dump(mode="json") == reference
+
+
+def test_compact_and_full_payloads_give_the_same_plan():
+    full = _full_payload()
+    compact = schemas.parse_optimization_request(schemas.compact_payload(full)).model_dump(mode="json")
+
+    full_result, compact_result = _run(full), _run(compact)
+    assert compact_result["scheduled_trips"] == full_result["scheduled_trips"]
+    assert compact_result["unassigned_requests"] == full_result["unassigned_requests"]
+
+
+def test_post_accepts_compact_payload(client):
+    compact = schemas.compact_payload(_full_payload())
+    response = client.post(f"{API_PREFIX}/optimize", json=compact, headers=HEADERS)
+    assert response.status_code == 202
+
+    with SessionLocal() as db:
+        stored = db.get(models.OptimizationJob, response.json()["job_id"]).request_payload
+    # Stored as sent, not expanded
+    assert stored["format"] == "compact"
+    assert stored["locations"]["id"] == compact["locations"]["id"]
+
+
+@pytest.mark.parametrize("mutate, message", [
+    (lambda p: p["requests"]["pickup"].__setitem__(0, 999), "refers to location 999"),
+    (lambda p: p["requests"]["capacity_demand"].pop(), "equal lengths"),
+    (lambda p: p["locations"]["latitude"].pop(), "equal lengths"),
+])
+def test_invalid_compact_payload_is_rejected(client, mutate, message):
+    compact = copy.deepcopy(schemas.compact_payload(_full_payload()))
+    mutate(compact)
+    response = client.post(f"{API_PREFIX}/optimize", json=compact, headers=HEADERS)
+    assert response.status_code == 422
+    assert message in response.text
@@ -0,0 +1,60 @@
+import os
+import time
+
+from app.core.config import settings
+from app.services.heuristic_solver import HeuristicSolver
+from benchmarks.instances import generate_instance
+
+API_PREFIX = "/optimizer/api/v1"
+HEADERS = {"X-API-Key": os.environ.get("API_KEY", "test-api-key")}
+
+
+def test_heuristic_plan_respects_constraints():
+    payload = generate_instance(num_requests=30, num_vehicles=8, seed=7)
+    solver = HeuristicSolver(payload["vehicles"], payload["requests"])
+    result = solver.solve()
+    _, time_matrix = solver.build_matrices()
+
+    served = set()
+    for assigned in result["assigned"]:
+        vehicle = next(v for v in solver.vehicles if v["id"] == assigned["vehicle_id"])
+        nodes = assigned["route_nodes"] + [solver.depot_index]
+        elapsed, load, picked = 0, 0, set()
+        for prev, node in zip(nodes, nodes[1:]):
+            elapsed += time_matrix[prev][node]
+            load += solver.demands[node]
+            assert load <= vehicle["capacity"]
+            if node in solver.node_to_request:
+                ridx, kind = solver.node_to_request[node]
+                if kind == "pickup":
+                    picked.add(ridx)
+                else:
+                    assert ridx in picked
+                    assert elapsed <= solver._dropoff_deadlines_abs[ridx]
+        assert elapsed <= settings.SOLVER_MAX_VEHICLE_TIME_MINUTES * 60
+        served.update(assigned["requests"])
+
+    assert served.isdisjoint(result["unassigned_requests"])
+    assert served | set(result["unassigned_requests"]) == {r["id"] for r in payload["requests"]}
+
+
+def test_heuristic_mode_via_api(client):
+    payload = {**generate_instance(num_requests=6, num_vehicles=3, seed=11), "solver_mode": "heuristic"}
+    resp = client.post(f"{API_PREFIX}/optimize", json=payload, headers=HEADERS)
+    assert resp.status_code == 202
+    job_id = resp.json()["job_id"]
+
+    deadline = time.time() + 5
+    status = "pending"
+    while status == "pending" and time.time() < deadline:
+        status = client.get(f"{API_PREFIX}/optimize/{job_id}/status", headers=HEADERS).json()["status"]
+    assert status == "completed"
+
+    data = client.get(f"{API_PREFIX}/optimize/{job_id}/result", headers=HEADERS).json()
+    assert len(data["scheduled_trips"]) >= 1
+
+
+def test_unknown_solver_mode_is_rejected(client):
+    payload = {**generate_instance(num_requests=1, num_vehicles=1, seed=1), "solver_mode": "quantum"}
+    resp = client.post(f"{API_PREFIX}/optimize", json=payload, headers=HEADERS)
+    assert resp.status_code == 422
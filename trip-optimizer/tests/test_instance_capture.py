@@ -0,0 +1,70 @@
+import uuid
+
+from app.clients.distance_matrix_client import DistanceMatrixClient
+from app.core.config import settings
+from app.db import models
+from app.db.session import SessionLocal
+from app.services.instance_capture import build_solver, load_capture
+from app.services.optimization_solver import OptimizationSolver
+from app.workers.job_worker import process_job
+from benchmarks.instances import generate_instance, generate_multiday_instance
+
+
+def _run_job(payload):
+    job_id = f"OPT-{uuid.uuid4()}"
+    with SessionLocal() as db:
+        db.add(models.OptimizationJob(
+            id=job_id, status="pending", request_payload=payload, claimed_by="test", attempts=1
+        ))
+        db.commit()
+    process_job(job_id, "test")
+    return job_id
+
+
+def test_capture_records_models_matrices_and_settings(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "CAPTURE_MODE", "always")
+    monkeypatch.setattr(settings, "CAPTURE_DIR", str(tmp_path))
+    monkeypatch.setattr(settings, "SOLVER_HORIZON_MODE", "auto")
+    payload = {**generate_multiday_instance(days=2, requests_per_day=5, num_vehicles=3, seed=2), "solver_mode": "heuristic"}
+    job_id = _run_job(payload)
+
+    capture = load_capture(tmp_path / f"{job_id}.msgpack.gz")
+    assert capture["job_id"] == job_id
+    assert capture["solver_mode"] == "heuristic"
+    assert capture["settings"]["SOLVER_HORIZON_MODE"] == "auto"
+    assert capture["code_version"]["api_version"]
+    assert len(capture["models"]) > 1
+    captured_ids = sorted(r["id"] for model in capture["models"] for r in model["requests"])
+    assert set(captured_ids) == {r["id"] for r in payload["requests"]}
+
+    model = capture["models"][0]
+    solver = build_solver(model, OptimizationSolver)
+    expected = solver.distance_client.get_matrices(
+        *[[f"{loc['latitude']},{loc['longitude']}" for loc in solver.locations]] * 2
+    )
+    assert model["matrices"] == expected
+
+
+def test_slow_mode_skips_fast_jobs(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "CAPTURE_MODE", "slow")
+    monkeypatch.setattr(settings, "CAPTURE_SLOW_SECONDS", 3600)
+    monkeypatch.setattr(settings, "CAPTURE_DIR", str(tmp_path))
+    _run_job({**generate_instance(num_requests=3, num_vehicles=2, seed=3), "solver_mode": "heuristic"})
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_replay_uses_captured_matrices_only(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "CAPTURE_MODE", "always")
+    monkeypatch.setattr(settings, "CAPTURE_DIR", str(tmp_path))
+    monkeypatch.setattr(settings, "SOLVER_TIME_LIMIT_SECONDS", 1)
+    job_id = _run_job({**generate_instance(num_requests=6, num_vehicles=2, seed=4), "solver_mode": "ortools"})
+    capture = load_capture(tmp_path / f"{job_id}.msgpack.gz")
+
+    def no_network(*args, **kwargs):
+        raise AssertionError("replay fetched matrices")
+    monkeypatch.setattr(DistanceMatrixClient, "get_matrices", no_network)
+
+    model = capture["models"][0]
+    result = build_solver(model, OptimizationSolver).solve()
+    assert len(result["assigned"]) + len(result["unassigned_requests"]) > 0
+    assert result["lower_bound"] == model["outcome"]["lower_bound"]
@@ -0,0 +1,175 @@
+import os
+import threading
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.db import models
+from app.db.session import Base
+from app.services.job_cost import estimate_job_cost, priority_at
+from app.services.job_queue import JobQueue
+from benchmarks.instances import generate_instance
+
+API_PREFIX = "/optimizer/api/v1"
+HEADERS = {"X-API-Key": os.environ.get("API_KEY", "test-api-key")}
+
+
+@pytest.fixture()
+def queue_session(tmp_path):
+    """Sessions on a private database, out of reach of the running solver workers."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'queue.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(bind=engine)
+    engine.dispose()
+
+
+def _enqueue(Session, count):
+    start = datetime.now(timezone.utc)
+    with Session() as db:
+        for i in range(count):
+            db.add(models.OptimizationJob(
+                id=f"JOB-{i:02d}", status="pending", queued_at=start + timedelta(seconds=i), attempts=0
+            ))
+        db.commit()
+    return [f"JOB-{i:02d}" for i in range(count)]
+
+
+def test_concurrent_claims_are_exclusive(queue_session):
+    job_ids = _enqueue(queue_session, 12)
+    claimed = {}
+
+    def worker(name):
+        with queue_session() as db:
+            queue = JobQueue(db)
+            while (job_id := queue.claim(name)) is not None:
+                claimed.setdefault(job_id, []).append(name)
+
+    threads = [threading.Thread(target=worker, args=(f"W{i}",)) for i in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert sorted(claimed) == job_ids
+    assert all(len(owners) == 1 for owners in claimed.values())
+
+
+def test_expired_lease_is_requeued_then_failed(queue_session, monkeypatch):
+    monkeypatch.setattr(settings, "JOB_MAX_ATTEMPTS", 2)
+    (job_id,) = _enqueue(queue_session, 1)
+
+    def expire(db):
+        job = db.get(models.OptimizationJob, job_id)
+        job.lease_expires_at = datetime.now(timezone.utc) - timedelta(seconds=1)
+        db.commit()
+
+    with queue_session() as db:
+        queue = JobQueue(db)
+        assert queue.claim("crashed-worker") == job_id
+        assert queue.claim("other-worker") is None
+        expire(db)
+        assert queue.requeue_expired() == ([job_id], [])
+        assert not queue.heartbeat(job_id, "crashed-worker")
+
+        assert queue.claim("other-worker") == job_id
+        expire(db)
+        assert queue.requeue_expired() == ([], [job_id])
+        job = db.get(models.OptimizationJob, job_id)
+        db.refresh(job)
+        assert job.status == "failed"
+        assert job.attempts == 2
+
+
+def test_queue_positions_follow_queue_order(queue_session):
+    job_ids = _enqueue(queue_session, 3)
+    with queue_session() as db:
+        queue = JobQueue(db)
+        jobs = [db.get(models.OptimizationJob, j) for j in job_ids]
+        assert [queue.queue_position(j) for j in jobs] == [1, 2, 3]
+
+        assert queue.claim("worker") == job_ids[0]
+        for job in jobs:
+            db.refresh(job)
+        assert [queue.queue_position(j) for j in jobs] == [0, 1, 2]
+        assert queue.waiting_count() == 2
+
+
+def test_full_queue_returns_429_with_retry_hint(client, monkeypatch):
+    monkeypatch.setattr(settings, "SOLVER_QUEUE_MAXSIZE", 0)
+    payload = {"vehicles": [{"id": "VEH-1", "capacity": 4}], "requests": []}
+    resp = client.post(f"{API_PREFIX}/optimize", json=payload, headers=HEADERS)
+    assert resp.status_code == 429
+    assert int(resp.headers["Retry-After"]) > 0
+
+
+def _add_job(db, job_id, queued_at, requests=0, memory_mb=None):
+    payload = generate_instance(requests, max(1, requests // 5), seed=len(job_id)) if requests else None
+    estimate = estimate_job_cost(payload["vehicles"], payload["requests"]) if payload else None
+    db.add(models.OptimizationJob(
+        id=job_id, status="pending", queued_at=queued_at, attempts=0,
+        priority_at=priority_at(queued_at, estimate.estimated_seconds) if estimate else queued_at,
+        estimated_seconds=estimate.estimated_seconds if estimate else None,
+        estimated_memory_mb=memory_mb or (estimate.estimated_memory_mb if estimate else None),
+    ))
+    db.commit()
+
+
+def test_cheap_jobs_overtake_batch_jobs_until_it_has_aged(queue_session, monkeypatch):
+    monkeypatch.setattr(settings, "SCHEDULER_POLICY", "sjf")
+    monkeypatch.setattr(settings, "SCHEDULER_MAX_DELAY_SECONDS", 60)
+    start = datetime.now(timezone.utc)
+    with queue_session() as db:
+        _add_job(db, "BATCH", start, requests=400)
+        _add_job(db, "ADHOC", start + timedelta(seconds=10), requests=5)
+        _add_job(db, "LATE", start + timedelta(seconds=90), requests=5)
+        batch = db.get(models.OptimizationJob, "BATCH")
+        assert batch.estimated_seconds > db.get(models.OptimizationJob, "ADHOC").estimated_seconds
+
+        queue = JobQueue(db)
+        assert queue.queue_position(batch) == 2
+        # A job queued after the batch job's maximum delay no longer overtakes it
+        assert [queue.claim("worker") for _ in range(3)] == ["ADHOC", "BATCH", "LATE"]
+
+
+def test_memory_budget_keeps_large_jobs_apart(queue_session, monkeypatch):
+    monkeypatch.setattr(settings, "SOLVER_MEMORY_BUDGET_MB", 1000)
+    start = datetime.now(timezone.utc)
+    with queue_session() as db:
+        _add_job(db, "HUGE-1", start, memory_mb=800)
+        _add_job(db, "HUGE-2", start + timedelta(seconds=1), memory_mb=800)
+        _add_job(db, "SMALL", start + timedelta(seconds=2), memory_mb=100)
+        _add_job(db, "GIANT", start + timedelta(seconds=3), memory_mb=5000)
+        queue = JobQueue(db)
+
+        assert queue.claim("W1") == "HUGE-1"
+        # HUGE-2 does not fit next to HUGE-1, and nothing overtakes it meanwhile
+        assert queue.claim("W2") is None
+
+        db.get(models.OptimizationJob, "HUGE-1").status = "completed"
+        db.commit()
+        assert queue.claim("W2") == "HUGE-2"
+        assert queue.claim("W1") == "SMALL"
+
+        for job_id in ("HUGE-2", "SMALL"):
+            db.get(models.OptimizationJob, job_id).status = "completed"
+        db.commit()
+        # Larger than the whole budget: runs alone
+        assert queue.claim("W1") == "GIANT"
+
+
+def test_estimate_endpoint_is_a_dry_run(client):
+    def estimate(requests):
+        payload = generate_instance(requests, 4, seed=3)
+        resp = client.post(f"{API_PREFIX}/optimize/estimate", json=payload, headers=HEADERS)
+        assert resp.status_code == 200
+        return resp.json()
+
+    small, large = estimate(5), estimate(200)
+    assert small["estimate"]["nodes"] == 11
+    assert small["estimate"]["matrix_elements"] == 121
+    assert small["estimate"]["estimated_seconds"] < large["estimate"]["estimated_seconds"]
+    assert small["estimate"]["estimated_memory_mb"] < large["estimate"]["estimated_memory_mb"]
+    assert small["queue_ahead"] >= 0 and small["queue_full"] is False
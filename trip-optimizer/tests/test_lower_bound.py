@@ -0,0 +1,63 @@
+import uuid
+
+import pytest
+
+from app.core.config import settings
+from app.db import models
+from app.db.session import SessionLocal
+from app.models import schemas
+from app.services.heuristic_solver import HeuristicSolver
+from app.services.lower_bound import optimality_gap
+from app.services.optimization_solver import OptimizationSolver
+from app.workers.job_worker import process_job
+from benchmarks.instances import generate_instance, generate_multiday_instance
+
+
+@pytest.mark.parametrize("solver_cls", [HeuristicSolver, OptimizationSolver])
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_bound_never_exceeds_plan_objective(solver_cls, seed, monkeypatch):
+    monkeypatch.setattr(settings, "SOLVER_TIME_LIMIT_SECONDS", 1)
+    payload = generate_instance(num_requests=12, num_vehicles=3, seed=seed)
+    result = solver_cls(payload["vehicles"], payload["requests"]).solve()
+    assert 0 < result["lower_bound"] <= result["objective"]
+    assert result["optimality_gap"] == optimality_gap(result["objective"], result["lower_bound"])
+
+
+def test_requests_no_vehicle_can_carry_pay_their_penalty_in_the_bound():
+    payload = generate_instance(num_requests=4, num_vehicles=2, seed=4)
+    payload["requests"][0]["capacity_demand"] = 99
+    solver = HeuristicSolver(payload["vehicles"], payload["requests"])
+    result = solver.solve()
+    assert result["unassigned_requests"] == [payload["requests"][0]["id"]]
+    assert solver.lower_bound.servable == [False, True, True, True]
+    assert result["lower_bound"] >= 2 * settings.SOLVER_UNASSIGNED_PENALTY
+    assert result["lower_bound"] <= result["objective"]
+
+
+def test_search_stops_once_within_gap_threshold(monkeypatch):
+    monkeypatch.setattr(settings, "SOLVER_TIME_LIMIT_SECONDS", 10)
+    monkeypatch.setattr(settings, "SOLVER_GAP_STOP_THRESHOLD", 0.99)
+    payload = generate_instance(num_requests=10, num_vehicles=3, seed=5)
+    result = OptimizationSolver(payload["vehicles"], payload["requests"]).solve()
+    assert result["stopped_early"]
+    assert result["optimality_gap"] <= 0.99
+
+
+def test_result_reports_solver_stats(monkeypatch):
+    monkeypatch.setattr(settings, "SOLVER_HORIZON_MODE", "auto")
+    payload = {**generate_multiday_instance(days=2, requests_per_day=6, num_vehicles=3, seed=7), "solver_mode": "heuristic"}
+    job_id = f"OPT-{uuid.uuid4()}"
+    with SessionLocal() as db:
+        db.add(models.OptimizationJob(
+            id=job_id, status="pending", request_payload=payload, claimed_by="test", attempts=1
+        ))
+        db.commit()
+    process_job(job_id, "test")
+    with SessionLocal() as db:
+        result = schemas.OptimizationResult(**db.get(models.OptimizationJob, job_id).result)
+
+    stats = result.solver_stats
+    assert stats is not None
+    assert 0 < stats.lower_bound <= stats.objective
+    assert 0 <= stats.optimality_gap < 1
+    assert not stats.stopped_early
@@ -0,0 +1,128 @@
+import gzip
+import os
+import time
+import uuid
+
+import pytest
+
+from app.db import models
+from app.db.session import SessionLocal
+from app.models import schemas
+from app.services import result_cache as result_cache_module
+from app.services.result_cache import msgpack_etag, result_cache
+from app.utils.msgpack_utils import MSGPACK_MEDIA_TYPE, packb, prefers_msgpack, unpackb
+from benchmarks.instances import generate_instance
+
+API_PREFIX = "/optimizer/api/v1"
+HEADERS = {"X-API-Key": os.environ.get("API_KEY", "test-api-key")}
+MSGPACK_HEADERS = {**HEADERS, "Content-Type": MSGPACK_MEDIA_TYPE}
+
+
+def _payload():
+    return {**generate_instance(num_requests=4, num_vehicles=2, seed=33), "solver_mode": "heuristic"}
+
+
+def _stored_payload(job_id):
+    with SessionLocal() as db:
+        return db.get(models.OptimizationJob, job_id).request_payload
+
+
+def _wait_finished(client, job_id):
+    deadline = time.time() + 10
+    while time.time() < deadline:
+        if client.get(f"{API_PREFIX}/optimize/{job_id}/status", headers=HEADERS).json()["status"] != "pending":
+            return
+        time.sleep(0.1)
+
+
+@pytest.mark.parametrize("accept, expected", [
+    (None, False),
+    ("*/*", False),
+    ("application/json", False),
+    ("application/msgpack", True),
+    ("application/x-msgpack, application/json;q=0.5", True),
+    ("application/msgpack;q=0.5, application/json", False),
+])
+def test_accept_negotiation_defaults_to_json(accept, expected):
+    assert prefers_msgpack(accept) is expected
+
+
+def test_msgpack_request_matches_json_request(client):
+    payload = _payload()
+    # Datetimes travel as MessagePack timestamps
+    request = schemas.OptimizationRequest(**payload)
+    packed = packb(request.model_dump(exclude_none=True))
+    assert len(packed) < len(request.model_dump_json(exclude_none=True))
+
+    via_json = client.post(f"{API_PREFIX}/optimize", json=payload, headers=HEADERS)
+    via_msgpack = client.post(f"{API_PREFIX}/optimize", content=packed, headers=MSGPACK_HEADERS)
+    assert via_msgpack.status_code == 202
+    assert _stored_payload(via_msgpack.json()["job_id"]) == _stored_payload(via_json.json()["job_id"])
+
+
+def test_msgpack_compact_request_is_validated(client):
+    compact = schemas.compact_payload(_payload())
+    compact["requests"]["pickup"][0] = 999
+    response = client.post(f"{API_PREFIX}/optimize", content=packb(compact), headers=MSGPACK_HEADERS)
+    assert response.status_code == 422
+    assert "refers to location 999" in response.text
+
+    garbage = client.post(f"{API_PREFIX}/optimize", content=b"\xc1\xc1", headers=MSGPACK_HEADERS)
+    assert garbage.status_code == 400
+
+
+def test_msgpack_result_round_trips_with_own_etag(client):
+    job_id = client.post(f"{API_PREFIX}/optimize", json=_payload(), headers=HEADERS).json()["job_id"]
+    _wait_finished(client, job_id)
+    url = f"{API_PREFIX}/optimize/{job_id}/result"
+
+    as_json = client.get(url, headers=HEADERS)
+    as_msgpack = client.get(url, headers={**HEADERS, "Accept": MSGPACK_MEDIA_TYPE, "Accept-Encoding": "gzip"})
+    assert as_msgpack.status_code == 200
+    assert as_msgpack.headers["content-type"] == MSGPACK_MEDIA_TYPE
+    assert as_msgpack.headers["etag"] != as_json.headers["etag"]
+
+    decoded = unpackb(as_msgpack.content)
+    assert decoded["scheduled_trips"]
+    assert schemas.OptimizationResult(**decoded).model_dump(mode="json") == as_json.json()
+
+    revalidated = client.get(url, headers={
+        **HEADERS, "Accept": MSGPACK_MEDIA_TYPE, "If-None-Match": as_msgpack.headers["etag"],
+    })
+    assert revalidated.status_code == 304
+    # The MessagePack ETag never validates the JSON representation
+    stale = client.get(url, headers={**HEADERS, "If-None-Match": as_msgpack.headers["etag"]})
+    assert stale.status_code == 200
+
+
+def test_msgpack_body_is_stored_with_the_result(client, monkeypatch):
+    job_id = client.post(f"{API_PREFIX}/optimize", json=_payload(), headers=HEADERS).json()["job_id"]
+    _wait_finished(client, job_id)
+    with SessionLocal() as db:
+        stored = gzip.decompress(db.get(models.OptimizationJob, job_id).result_msgpack_blob)
+
+    # Served as stored: nothing is re-encoded per request
+    result_cache.clear()
+    monkeypatch.setattr(result_cache_module, "packb", lambda value: pytest.fail("result re-encoded"))
+    url = f"{API_PREFIX}/optimize/{job_id}/result"
+    response = client.get(url, headers={**HEADERS, "Accept": MSGPACK_MEDIA_TYPE, "Accept-Encoding": "identity"})
+    assert response.status_code == 200
+    assert response.content == stored
+
+
+def test_legacy_result_is_backfilled_as_msgpack(client):
+    job_id = f"OPT-{uuid.uuid4()}"
+    with SessionLocal() as db:
+        db.add(models.OptimizationJob(
+            id=job_id, status="completed", result={"scheduled_trips": [], "unassigned_requests": ["REQ-1"]}
+        ))
+        db.commit()
+
+    url = f"{API_PREFIX}/optimize/{job_id}/result"
+    response = client.get(url, headers={**HEADERS, "Accept": MSGPACK_MEDIA_TYPE})
+    assert response.status_code == 200
+    assert unpackb(response.content)["unassigned_requests"] == ["REQ-1"]
+    with SessionLocal() as db:
+        job = db.get(models.OptimizationJob, job_id)
+        assert job.result_blob and job.result_msgpack_blob
+        assert msgpack_etag(job.result_etag) == response.headers["etag"]
@@ -0,0 +1,74 @@
+import uuid
+
+import pytest
+from sqlalchemy import event, func, select
+
+from app.core.config import settings
+from app.db import models
+from app.db.session import SessionLocal
+from app.services.artifact_writer import artifact_writer
+from app.workers.job_worker import execute_job
+from benchmarks.instances import generate_instance
+
+
+def _held_job(db):
+    """A pending job claimed by the test itself, so pooled workers leave it alone."""
+    payload = {**generate_instance(num_requests=5, num_vehicles=2, seed=21), "solver_mode": "heuristic"}
+    job = models.OptimizationJob(
+        id=f"OPT-{uuid.uuid4()}", status="pending", request_payload=payload, claimed_by="test", attempts=1
+    )
+    db.add(job)
+    db.commit()
+    return job.id
+
+
+def _staged_rows(db, model, job_id):
+    return db.scalar(select(func.count()).select_from(model).where(model.job_id == job_id))
+
+
+@pytest.mark.parametrize("persist", [True, False])
+def test_direct_pipeline_skips_staging_on_critical_path(monkeypatch, persist):
+    monkeypatch.setattr(settings, "PIPELINE_MODE", "direct")
+    monkeypatch.setattr(settings, "PIPELINE_PERSIST_ARTIFACTS", persist)
+    db = SessionLocal()
+    try:
+        job_id = _held_job(db)
+        execute_job(db, job_id)
+
+        job = db.get(models.OptimizationJob, job_id)
+        assert job.status == "completed"
+        assert job.result["scheduled_trips"]
+
+        artifact_writer.flush(timeout=10)
+        db.expire_all()
+        expected_requests = 5 if persist else 0
+        assert _staged_rows(db, models.BookingRequest, job_id) == expected_requests
+        assert (_staged_rows(db, models.Trip, job_id) > 0) is persist
+    finally:
+        db.close()
+
+
+@pytest.mark.parametrize("mode", ["staged", "direct"])
+def test_result_is_written_once_with_its_body(monkeypatch, mode):
+    monkeypatch.setattr(settings, "PIPELINE_MODE", mode)
+    monkeypatch.setattr(settings, "PIPELINE_PERSIST_ARTIFACTS", False)
+    result_writes = []
+
+    def count(conn, cursor, statement, *args):
+        if statement.startswith("UPDATE optimization_jobs") and "result=" in statement.replace(" ", ""):
+            result_writes.append(statement)
+
+    db = SessionLocal()
+    engine = db.get_bind()
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        job_id = _held_job(db)
+        execute_job(db, job_id)
+        job = db.get(models.OptimizationJob, job_id)
+        assert job.status == "completed"
+        assert job.result_blob and job.result_etag
+        assert len(result_writes) == 1
+        assert "result_etag" in result_writes[0]
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+        db.close()
@@ -0,0 +1,145 @@
+import copy
+import os
+import time
+import uuid
+
+from app.db import models
+from app.db.session import SessionLocal
+from app.models import schemas
+from app.services.plan_delta import diff_plans
+
+API_PREFIX = "/optimizer/api/v1"
+HEADERS = {"X-API-Key": os.environ.get("API_KEY", "test-api-key")}
+
+PAYLOAD = {
+    "vehicles": [{"id": "VEH-1", "capacity": 6}, {"id": "VEH-2", "capacity": 6}],
+    "requests": [
+        {
+            "id": "REQ-1",
+            "pickup_location": {"id": "LOC-1", "latitude": 10.771937, "longitude": 106.721063},
+            "dropoff_location": {"id": "LOC-2", "latitude": 10.850000, "longitude": 106.800000},
+            "dropoff_time": "2025-08-20T09:00:00Z",
+            "capacity_demand": 2,
+        },
+        {
+            "id": "REQ-2",
+            "pickup_location": {"id": "LOC-3", "latitude": 10.650000, "longitude": 106.650000},
+            "dropoff_location": {"id": "LOC-1", "latitude": 10.771937, "longitude": 106.721063},
+            "dropoff_time": "2025-08-20T15:00:00Z",
+            "capacity_demand": 3,
+        },
+    ],
+}
+
+
+def _trip(vehicle_id, request_ids, start="2025-08-20T08:00:00Z", distance=1000):
+    return {
+        "vehicle_id": vehicle_id,
+        "combined_request_ids": request_ids,
+        "trip_start_time": start,
+        "trip_end_time": "2025-08-20T10:00:00Z",
+        "total_duration_minutes": 120,
+        "total_distance_meters": distance,
+        "route": [],
+    }
+
+
+def _run_job(client, payload):
+    resp = client.post(f"{API_PREFIX}/optimize", json=payload, headers=HEADERS)
+    assert resp.status_code == 202
+    job_id = resp.json()["job_id"]
+    deadline = time.time() + 10
+    while time.time() < deadline:
+        if client.get(f"{API_PREFIX}/optimize/{job_id}/status", headers=HEADERS).json()["status"] != "pending":
+            break
+        time.sleep(0.1)
+    return job_id
+
+
+def test_trips_are_matched_by_vehicle_and_request_set():
+    previous = {
+        "scheduled_trips": [
+            _trip("VEH-1", ["REQ-1", "REQ-2"]),
+            _trip("VEH-2", ["REQ-3"]),
+            _trip("VEH-3", ["REQ-4"]),
+        ],
+        "unassigned_requests": ["REQ-5"],
+    }
+    current = {
+        "scheduled_trips": [
+            _trip("VEH-1", ["REQ-2", "REQ-1"]),                     # same set, same schedule
+            _trip("VEH-2", ["REQ-3"], start="2025-08-20T08:15:00Z"),  # re-timed
+            _trip("VEH-3", ["REQ-5"]),                              # new request set
+        ],
+        "unassigned_requests": ["REQ-4"],
+    }
+
+    delta = diff_plans("OPT-2", "OPT-1", current, previous)
+
+    assert delta.unchanged_count == 1
+    assert [t.vehicle_id for t in delta.modified] == ["VEH-2"]
+    assert [t.combined_request_ids for t in delta.added] == [["REQ-5"]]
+    assert delta.removed_trip_keys == [diff_plans("OPT-1", "-", previous, None).added[2].trip_key]
+    assert delta.newly_unassigned == ["REQ-4"]
+    assert delta.newly_assigned == ["REQ-5"]
+
+
+def test_delta_against_previous_job(client):
+    first = _run_job(client, PAYLOAD)
+    result = client.get(f"{API_PREFIX}/optimize/{first}/result", headers=HEADERS).json()
+    assert all(trip["trip_key"] for trip in result["scheduled_trips"])
+
+    # Same input: nothing to write downstream
+    second = _run_job(client, {**PAYLOAD, "previous_job_id": first})
+    delta = client.get(f"{API_PREFIX}/optimize/{second}/delta", headers=HEADERS).json()
+    assert delta["previous_job_id"] == first
+    assert delta["added"] == delta["modified"] == delta["removed_trip_keys"] == []
+    assert delta["unchanged_count"] == len(result["scheduled_trips"])
+
+    # REQ-2 cancelled: only the trip that served it changes
+    reduced = copy.deepcopy(PAYLOAD)
+    reduced["requests"] = reduced["requests"][:1]
+    third = _run_job(client, reduced)
+    delta = client.get(
+        f"{API_PREFIX}/optimize/{third}/delta", params={"previous_job_id": first}, headers=HEADERS
+    ).json()
+    removed = [t["trip_key"] for t in result["scheduled_trips"] if "REQ-2" in t["combined_request_ids"]]
+    assert removed and set(removed) <= set(delta["removed_trip_keys"])
+    assert all("REQ-2" not in t["combined_request_ids"] for t in delta["added"] + delta["modified"])
+
+
+def test_delta_requires_a_known_previous_job(client):
+    resp = client.post(
+        f"{API_PREFIX}/optimize", json={**PAYLOAD, "previous_job_id": "OPT-missing"}, headers=HEADERS
+    )
+    assert resp.status_code == 400
+
+    job_id = _run_job(client, PAYLOAD)
+    assert client.get(f"{API_PREFIX}/optimize/{job_id}/delta", headers=HEADERS).status_code == 400
+    resp = client.get(
+        f"{API_PREFIX}/optimize/{job_id}/delta", params={"previous_job_id": "OPT-missing"}, headers=HEADERS
+    )
+    assert resp.status_code == 404
+
+
+def test_failed_jobs_have_no_delta(client):
+    job_id = _run_job(client, PAYLOAD)
+    failed_id = f"OPT-{uuid.uuid4()}"
+    with SessionLocal() as db:
+        db.add(models.OptimizationJob(
+            id=failed_id, status="failed", result={"message": "boom"}, request_payload=PAYLOAD, attempts=3
+        ))
+        db.commit()
+
+    for task_id, previous_id in ((job_id, failed_id), (failed_id, job_id)):
+        resp = client.get(
+            f"{API_PREFIX}/optimize/{task_id}/delta", params={"previous_job_id": previous_id}, headers=HEADERS
+        )
+        assert resp.status_code == 400
+
+
+def test_compact_conversion_keeps_previous_job_id():
+    full = {**PAYLOAD, "previous_job_id": "OPT-1"}
+    compact = schemas.compact_payload(full)
+    assert compact["previous_job_id"] == "OPT-1"
+    assert schemas.expand_payload(compact)["previous_job_id"] == "OPT-1"
@@ -0,0 +1,116 @@
+import os
+import time
+
+API_PREFIX = "/optimizer/api/v1"
+HEADERS = {"X-API-Key": os.environ.get("API_KEY", "test-api-key")}
+
+PAYLOAD = {
+    "vehicles": [
+        {"id": "VEH-1", "capacity": 6},
+        {"id": "VEH-2", "capacity": 6},
+        {"id": "VEH-3", "capacity": 6},
+    ],
+    "requests": [
+        {
+            "id": "REQ-1",
+            "pickup_location": {"id": "LOC-1", "latitude": 10.771937, "longitude": 106.721063},
+            "dropoff_location": {"id": "LOC-2", "latitude": 10.850000, "longitude": 106.800000},
+            "dropoff_time": "2025-08-20T09:00:00Z",
+            "capacity_demand": 2,
+        },
+        {
+            "id": "REQ-2",
+            "pickup_location": {"id": "LOC-1", "latitude": 10.771937, "longitude": 106.721063},
+            "dropoff_location": {"id": "LOC-3", "latitude": 10.650000, "longitude": 106.650000},
+            "dropoff_time": "2025-08-20T10:00:00Z",
+            "capacity_demand": 3,
+        },
+        {
+            "id": "REQ-3",
+            "pickup_location": {"id": "LOC-4", "latitude": 10.900000, "longitude": 106.800000},
+            "dropoff_location": {"id": "LOC-1", "latitude": 10.771937, "longitude": 106.721063},
+            "dropoff_time": "2025-08-20T14:00:00Z",
+            "capacity_demand": 2,
+        },
+    ],
+}
+
+
+def _run_job(client, payload):
+    resp = client.post(f"{API_PREFIX}/optimize", json=payload, headers=HEADERS)
+    assert resp.status_code == 202
+    job_id = resp.json()["job_id"]
+    deadline = time.time() + 10
+    while time.time() < deadline:
+        status = client.get(f"{API_PREFIX}/optimize/{job_id}/status", headers=HEADERS).json()["status"]
+        if status != "pending":
+            break
+        time.sleep(0.1)
+    result = client.get(f"{API_PREFIX}/optimize/{job_id}/result", headers=HEADERS).json()
+    assert result["status"] == "completed"
+    return job_id, result
+
+
+def test_stops_are_tagged_with_requests(client):
+    _, result = _run_job(client, PAYLOAD)
+    for trip in result["scheduled_trips"]:
+        served = {s["request_id"] for s in trip["route"] if s["type"] in ("pickup", "dropoff")}
+        assert served == set(trip["combined_request_ids"])
+
+
+def test_repair_removed_vehicle_reassigns_orphans(client):
+    job_id, result = _run_job(client, PAYLOAD)
+    broken = result["scheduled_trips"][0]
+
+    resp = client.post(
+        f"{API_PREFIX}/optimize/{job_id}/repair",
+        json={"remove_vehicle_ids": [broken["vehicle_id"]]},
+        headers=HEADERS,
+    )
+    assert resp.status_code == 200
+    repair = resp.json()
+    assert repair["base_job_id"] == job_id
+    assert broken["vehicle_id"] in repair["removed_trip_vehicle_ids"]
+
+    repaired = client.get(f"{API_PREFIX}/optimize/{repair['job_id']}/result", headers=HEADERS).json()
+    vehicles = {t["vehicle_id"] for t in repaired["scheduled_trips"]}
+    assert broken["vehicle_id"] not in vehicles
+
+    served = {rid for t in repaired["scheduled_trips"] for rid in t["combined_request_ids"]}
+    for rid in broken["combined_request_ids"]:
+        assert rid in served or rid in repaired["unassigned_requests"]
+
+    # Trips that were not touched are carried over unchanged
+    changed = {t["vehicle_id"] for t in repair["changed_trips"]}
+    before = {t["vehicle_id"]: t for t in result["scheduled_trips"]}
+    for trip in repaired["scheduled_trips"]:
+        if trip["vehicle_id"] not in changed:
+            assert trip == before[trip["vehicle_id"]]
+
+
+def test_repair_cancelled_request(client):
+    job_id, result = _run_job(client, PAYLOAD)
+
+    resp = client.post(
+        f"{API_PREFIX}/optimize/{job_id}/repair",
+        json={"remove_request_ids": ["REQ-2"]},
+        headers=HEADERS,
+    )
+    assert resp.status_code == 200
+    repaired = client.get(f"{API_PREFIX}/optimize/{resp.json()['job_id']}/result", headers=HEADERS).json()
+    served = {rid for t in repaired["scheduled_trips"] for rid in t["combined_request_ids"]}
+    assert "REQ-2" not in served
+    assert "REQ-2" not in repaired["unassigned_requests"]
+
+
+def test_repair_rejects_unknown_ids(client):
+    job_id, _ = _run_job(client, PAYLOAD)
+    resp = client.post(
+        f"{API_PREFIX}/optimize/{job_id}/repair",
+        json={"remove_vehicle_ids": ["VEH-404"]},
+        headers=HEADERS,
+    )
+    assert resp.status_code == 400
+
+    resp = client.post(f"{API_PREFIX}/optimize/OPT-missing/repair", json={}, headers=HEADERS)
+    assert resp.status_code == 404
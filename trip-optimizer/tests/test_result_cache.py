@@ -0,0 +1,92 @@
+import os
+import time
+import uuid
+
+from app.db import models
+from app.db.session import SessionLocal
+from app.services.result_cache import ResultCache
+from benchmarks.instances import generate_instance
+
+API_PREFIX = "/optimizer/api/v1"
+HEADERS = {"X-API-Key": os.environ.get("API_KEY", "test-api-key")}
+
+
+def _completed_job(client):
+    payload = {**generate_instance(num_requests=4, num_vehicles=2, seed=31), "solver_mode": "heuristic"}
+    job_id = client.post(f"{API_PREFIX}/optimize", json=payload, headers=HEADERS).json()["job_id"]
+    deadline = time.time() + 10
+    while time.time() < deadline:
+        if client.get(f"{API_PREFIX}/optimize/{job_id}/status", headers=HEADERS).json()["status"] != "pending":
+            break
+        time.sleep(0.1)
+    return job_id
+
+
+def test_result_is_served_gzipped_with_etag_and_304(client):
+    job_id = _completed_job(client)
+    url = f"{API_PREFIX}/optimize/{job_id}/result"
+
+    resp = client.get(url, headers={**HEADERS, "Accept-Encoding": "gzip"})
+    assert resp.status_code == 200
+    assert resp.headers["content-encoding"] == "gzip"
+    etag = resp.headers["etag"]
+    assert resp.json()["job_id"] == job_id
+
+    plain = client.get(url, headers={**HEADERS, "Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers
+    assert plain.headers["etag"] == etag
+    assert plain.json() == resp.json()
+
+    cached = client.get(url, headers={**HEADERS, "If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+
+
+def test_legacy_result_is_serialized_on_first_read(client):
+    job_id = f"OPT-{uuid.uuid4()}"
+    with SessionLocal() as db:
+        db.add(models.OptimizationJob(
+            id=job_id, status="completed", result={"scheduled_trips": [], "unassigned_requests": ["REQ-1"]}
+        ))
+        db.commit()
+
+    resp = client.get(f"{API_PREFIX}/optimize/{job_id}/result", headers=HEADERS)
+    assert resp.status_code == 200
+    assert resp.json()["unassigned_requests"] == ["REQ-1"]
+
+    with SessionLocal() as db:
+        assert db.get(models.OptimizationJob, job_id).result_etag == resp.headers["etag"]
+
+
+def test_lru_evicts_by_entries_and_bytes_and_checks_etag():
+    cache = ResultCache(max_entries=2, max_bytes=10)
+    cache.put("A", '"a"', b"1234")
+    cache.put("B", '"b"', b"1234")
+    assert cache.get("A", '"a"') == b"1234"  # A is now most recent
+
+    cache.put("C", '"c"', b"1234")  # over max_entries: evicts B
+    assert cache.get("B", '"b"') is None
+    assert cache.get("A", '"stale"') is None
+
+    cache.put("D", '"d"', b"12345678")  # over max_bytes: evicts A and C
+    assert cache.get("A", '"a"') is None
+    assert cache.get("C", '"c"') is None
+    assert cache.get("D", '"d"') == b"12345678"
+
+
+def test_gzip_follows_accept_encoding_q_values(client):
+    job_id = _completed_job(client)
+    url = f"{API_PREFIX}/optimize/{job_id}/result"
+    for header, gzipped in [
+        ("gzip", True),
+        ("br;q=1.0, gzip;q=0.5", True),
+        ("*", True),
+        ("gzip;q=0", False),
+        ("gzip;q=0, *", False),
+        ("identity, x-gzip", False),
+        ("br", False),
+    ]:
+        resp = client.get(url, headers={**HEADERS, "Accept-Encoding": header})
+        assert resp.status_code == 200
+        assert (resp.headers.get("content-encoding") == "gzip") is gzipped, header
+        assert resp.json()["job_id"] == job_id
@@ -0,0 +1,134 @@
+import gzip
+import json
+import os
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.db import models
+from app.db.session import Base, build_engine
+from app.services.data_manager import DataManager
+from app.services.retention_service import RetentionService
+from benchmarks.instances import generate_instance
+
+API_PREFIX = "/optimizer/api/v1"
+HEADERS = {"X-API-Key": os.environ.get("API_KEY", "test-api-key")}
+
+
+@pytest.fixture()
+def retention_session(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "JOB_ARCHIVE_DIR", str(tmp_path / "archive"))
+    monkeypatch.setattr(settings, "RETENTION_BATCH_SIZE", 3)
+    engine = build_engine(f"sqlite:///{tmp_path / 'retention.db'}")
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(bind=engine)
+    engine.dispose()
+
+
+def _add_job(db, job_id, age_days, status="completed", staged=False):
+    payload = generate_instance(num_requests=3, num_vehicles=1, seed=5)
+    db.add(models.OptimizationJob(
+        id=job_id, status=status, request_payload=payload, result={"job_id": job_id, "status": status},
+        created_at=datetime.now(timezone.utc) - timedelta(days=age_days),
+    ))
+    db.commit()
+    if staged:
+        DataManager(db).load_and_save_payload(payload, job_id)
+
+
+def _job_ids(db):
+    return set(db.scalars(select(models.OptimizationJob.id)))
+
+
+def test_retention_archives_old_and_excess_jobs(retention_session, monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "JOB_RETENTION_DAYS", 30)
+    monkeypatch.setattr(settings, "JOB_RETENTION_MAX_JOBS", 5)
+    with retention_session() as db:
+        for i in range(4):
+            _add_job(db, f"OLD-{i}", age_days=40 + i, staged=(i == 0))
+        _add_job(db, "OLD-PENDING", age_days=50, status="pending")
+        for i in range(6):
+            _add_job(db, f"NEW-{i}", age_days=i)
+
+        result = RetentionService(db).run()
+
+        # Old jobs go by age, NEW-5 by count; pending jobs are always kept
+        assert result["removed"] == 5
+        assert _job_ids(db) == {"OLD-PENDING"} | {f"NEW-{i}" for i in range(5)}
+        assert db.scalar(select(func.count()).select_from(models.BookingRequest)) == 0
+
+    archived = {}
+    for path in (tmp_path / "archive").glob("jobs-*.jsonl.gz"):
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                record = json.loads(line)
+                archived[record["id"]] = record
+    assert set(archived) == {f"OLD-{i}" for i in range(4)} | {"NEW-5"}
+    assert archived["OLD-0"]["result"] == {"job_id": "OLD-0", "status": "completed"}
+    assert len(archived["OLD-0"]["request_payload"]["requests"]) == 3
+
+
+def test_failed_batch_is_archived_once_on_retry(retention_session, monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "JOB_RETENTION_DAYS", 30)
+    with retention_session() as db:
+        for i in range(2):
+            _add_job(db, f"OLD-{i}", age_days=40)
+        service = RetentionService(db)
+
+        # The delete never commits: nothing may reach the archive
+        commit = db.commit
+        monkeypatch.setattr(db, "commit", lambda: (_ for _ in ()).throw(RuntimeError("disk full")))
+        with pytest.raises(RuntimeError):
+            service.run()
+        assert list((tmp_path / "archive").iterdir()) == []
+        assert _job_ids(db) == {"OLD-0", "OLD-1"}
+
+        monkeypatch.setattr(db, "commit", commit)
+        assert service.run()["removed"] == 2
+
+    ids = []
+    for path in (tmp_path / "archive").iterdir():
+        assert path.name.endswith(".jsonl.gz")
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            ids += [json.loads(line)["id"] for line in f]
+    assert sorted(ids) == ["OLD-0", "OLD-1"]
+
+
+def test_retention_disabled_keeps_everything(retention_session, monkeypatch):
+    monkeypatch.setattr(settings, "JOB_RETENTION_DAYS", 0)
+    monkeypatch.setattr(settings, "JOB_RETENTION_MAX_JOBS", 0)
+    with retention_session() as db:
+        _add_job(db, "ANCIENT", age_days=999)
+        assert RetentionService(db).run()["removed"] == 0
+        assert _job_ids(db) == {"ANCIENT"}
+
+
+def test_incremental_vacuum_releases_pages(retention_session, monkeypatch):
+    monkeypatch.setattr(settings, "JOB_RETENTION_DAYS", 1)
+    with retention_session() as db:
+        for i in range(20):
+            _add_job(db, f"JOB-{i}", age_days=10, staged=True)
+        service = RetentionService(db)
+        assert service.storage_report()["auto_vacuum"] == "incremental"
+
+        monkeypatch.setattr(settings, "VACUUM_INCREMENTAL_PAGES", 1_000_000)
+        before = service.storage_report()["database_bytes"]
+        result = service.run()
+        assert result["removed"] == 20
+        assert result["vacuumed_pages"] > 0
+        report = service.storage_report()
+        assert report["database_bytes"] < before
+        assert report["free_bytes"] == 0
+
+
+def test_storage_endpoint_reports_tables(client):
+    response = client.get(f"{API_PREFIX}/admin/storage", headers=HEADERS)
+    assert response.status_code == 200
+    body = response.json()
+    tables = {t["name"]: t for t in body["tables"]}
+    assert {"optimization_jobs", "trips", "booking_requests"} <= set(tables)
+    assert tables["optimization_jobs"]["rows"] > 0
+    assert body["retention_days"] == settings.JOB_RETENTION_DAYS
@@ -0,0 +1,87 @@
+import uuid
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+
+from app.core.config import settings
+from app.db import models
+from app.db.session import SessionLocal
+from app.models import schemas
+from app.services.heuristic_solver import HeuristicSolver
+from app.services.optimization_solver import OptimizationSolver
+from app.services.rolling_horizon import RollingHorizon, use_rolling_horizon
+from app.workers.job_worker import process_job
+from benchmarks.instances import generate_instance, generate_multiday_instance
+
+
+def _parse(value):
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def test_auto_mode_switches_on_span(monkeypatch):
+    monkeypatch.setattr(settings, "SOLVER_HORIZON_MODE", "auto")
+    assert not use_rolling_horizon(generate_multiday_instance(1, 20, 4, seed=1)["requests"])
+    assert use_rolling_horizon(generate_multiday_instance(3, 20, 4, seed=1)["requests"])
+    assert not use_rolling_horizon(generate_multiday_instance(3, 20, 4, seed=1)["requests"], mode="single")
+
+
+def test_windows_commit_every_request_once_without_overlapping_trips():
+    payload = generate_multiday_instance(days=3, requests_per_day=25, num_vehicles=6, seed=4)
+    windows = RollingHorizon(HeuristicSolver, payload["vehicles"], payload["requests"]).solve()
+    assert len(windows) > 1
+
+    served, unassigned = [], []
+    trips_by_vehicle = defaultdict(list)
+    for _, result in windows:
+        unassigned.extend(result["unassigned_requests"])
+        for assigned in result["assigned"]:
+            served.extend(assigned["requests"])
+            trips_by_vehicle[assigned["vehicle_id"]].append((_parse(assigned["start_time"]), _parse(assigned["end_time"])))
+
+    assert sorted(served + unassigned) == sorted(r["id"] for r in payload["requests"])
+    # A vehicle's next trip leaves only after its previous one returned
+    for trips in trips_by_vehicle.values():
+        trips.sort()
+        for (_, end), (start, _) in zip(trips, trips[1:]):
+            assert start >= end
+
+
+def test_ortools_respects_vehicle_ready_times(monkeypatch):
+    monkeypatch.setattr(settings, "SOLVER_TIME_LIMIT_SECONDS", 1)
+    payload = generate_instance(num_requests=6, num_vehicles=2, seed=9)
+    ready = {"VEH-1": datetime(2025, 8, 20, 2, 0, tzinfo=timezone.utc)}
+    solver = OptimizationSolver(payload["vehicles"], payload["requests"], vehicle_ready_times=ready)
+    for assigned in solver.solve()["assigned"]:
+        if assigned["vehicle_id"] == "VEH-1":
+            assert _parse(assigned["start_time"]) >= ready["VEH-1"]
+
+
+def test_busy_vehicle_does_not_hide_idle_vehicle_of_equal_capacity():
+    payload = generate_instance(num_requests=3, num_vehicles=2, seed=5)
+    for vehicle in payload["vehicles"]:
+        vehicle["capacity"] = 16
+    # VEH-1 is still on a trip committed by an earlier window
+    ready = {"VEH-1": datetime(2025, 8, 21, tzinfo=timezone.utc)}
+    result = HeuristicSolver(payload["vehicles"], payload["requests"], vehicle_ready_times=ready).solve()
+    assert result["unassigned_requests"] == []
+    assert {a["vehicle_id"] for a in result["assigned"]} == {"VEH-2"}
+
+
+def test_multiday_job_is_solved_in_windows(monkeypatch):
+    monkeypatch.setattr(settings, "SOLVER_HORIZON_MODE", "auto")
+    payload = {**generate_multiday_instance(days=3, requests_per_day=10, num_vehicles=4, seed=6), "solver_mode": "heuristic"}
+    job_id = f"OPT-{uuid.uuid4()}"
+    with SessionLocal() as db:
+        db.add(models.OptimizationJob(
+            id=job_id, status="pending", request_payload=payload, claimed_by="test", attempts=1
+        ))
+        db.commit()
+    process_job(job_id, "test")
+    with SessionLocal() as db:
+        result = schemas.OptimizationResult(**db.get(models.OptimizationJob, job_id).result)
+
+    served = [rid for trip in result.scheduled_trips for rid in trip.combined_request_ids]
+    assert sorted(served + result.unassigned_requests) == sorted(r["id"] for r in payload["requests"])
+    # Vehicles get a trip per window instead of one trip for the whole booking window
+    assert len(result.scheduled_trips) > len({trip.vehicle_id for trip in result.scheduled_trips})
+    starts = [trip.trip_start_time for trip in result.scheduled_trips]
+    assert max(starts) - min(starts) > timedelta(days=1)
@@ -0,0 +1,151 @@
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+
+from app.db import models
+from app.db.session import Base
+from app.services.data_manager import DataManager
+from benchmarks.instances import generate_instance
+
+API_PREFIX = "/optimizer/api/v1"
+HEADERS = {"X-API-Key": os.environ.get("API_KEY", "test-api-key")}
+
+
+@pytest.fixture()
+def staging_session(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'staging.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(bind=engine)
+    engine.dispose()
+
+
+def _count(db, model, job_id):
+    return db.scalar(select(func.count()).select_from(model).where(model.job_id == job_id))
+
+
+def test_concurrent_jobs_stage_same_ids_without_collisions(staging_session):
+    # Every job reuses the same vehicle, request and location IDs
+    payload = generate_instance(num_requests=15, num_vehicles=5, seed=4)
+    job_ids = [f"JOB-{i}" for i in range(4)]
+    errors = []
+
+    def stage(job_id):
+        try:
+            with staging_session() as db:
+                db.add(models.OptimizationJob(id=job_id, status="pending"))
+                db.commit()
+                DataManager(db).load_and_save_payload(payload, job_id)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=stage, args=(job_id,)) for job_id in job_ids]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert errors == []
+
+    with staging_session() as db:
+        for job_id in job_ids:
+            assert _count(db, models.Vehicle, job_id) == 5
+            assert _count(db, models.BookingRequest, job_id) == 15
+
+        # Clearing one job leaves the others untouched
+        DataManager(db).clear_job_staging("JOB-0")
+        assert _count(db, models.BookingRequest, "JOB-0") == 0
+        assert _count(db, models.BookingRequest, "JOB-1") == 15
+
+
+def test_purge_removes_only_expired_finished_jobs(staging_session):
+    payload = generate_instance(num_requests=3, num_vehicles=1, seed=8)
+    old = datetime.now(timezone.utc) - timedelta(hours=48)
+    with staging_session() as db:
+        db.add_all([
+            models.OptimizationJob(id="OLD-DONE", status="completed", created_at=old, updated_at=old),
+            models.OptimizationJob(id="OLD-PENDING", status="pending", created_at=old),
+            models.OptimizationJob(id="NEW-DONE", status="completed"),
+        ])
+        db.commit()
+        dm = DataManager(db)
+        for job_id in ("OLD-DONE", "OLD-PENDING", "NEW-DONE"):
+            dm.load_and_save_payload(payload, job_id)
+
+        assert dm.purge_expired_staging(ttl_hours=24) > 0
+        assert _count(db, models.Location, "OLD-DONE") == 0
+        assert _count(db, models.Location, "OLD-PENDING") > 0
+        assert _count(db, models.Location, "NEW-DONE") > 0
+
+
+def test_concurrent_jobs_all_complete(client):
+    payload = generate_instance(num_requests=6, num_vehicles=3, seed=12)
+    job_ids = [
+        client.post(f"{API_PREFIX}/optimize", json=payload, headers=HEADERS).json()["job_id"]
+        for _ in range(4)
+    ]
+
+    deadline = time.time() + 60
+    statuses = {}
+    while time.time() < deadline:
+        statuses = {
+            job_id: client.get(f"{API_PREFIX}/optimize/{job_id}/status", headers=HEADERS).json()["status"]
+            for job_id in job_ids
+        }
+        if "pending" not in statuses.values():
+            break
+        time.sleep(0.2)
+    assert set(statuses.values()) == {"completed"}
+
+    for job_id in job_ids:
+        data = client.get(f"{API_PREFIX}/optimize/{job_id}/result", headers=HEADERS).json()
+        assert data["scheduled_trips"]
+        assert not data.get("message")
+
+
+def test_restaging_and_resaving_trips_is_idempotent(staging_session):
+    from benchmarks.bench_persistence import build_trips
+
+    payload = generate_instance(num_requests=8, num_vehicles=2, seed=6)
+    trips = build_trips(payload)
+    with staging_session() as db:
+        db.add(models.OptimizationJob(id="RETRY", status="pending"))
+        db.commit()
+        dm = DataManager(db)
+        for _ in range(2):
+            dm.load_and_save_payload(payload, "RETRY")
+            dm.save_trips(trips, "RETRY")
+
+        assert _count(db, models.BookingRequest, "RETRY") == 8
+        assert _count(db, models.Trip, "RETRY") == len(trips)
+        assert _count(db, models.TripRequest, "RETRY") == 8
+        assert _count(db, models.TripStop, "RETRY") == sum(len(trip.route) for trip in trips)
+        stop = db.scalars(
+            select(models.TripStop)
+            .where(models.TripStop.job_id == "RETRY", models.TripStop.trip_index == 0)
+            .order_by(models.TripStop.sequence)
+        ).first()
+        assert stop.request_id == trips[0].route[0].request_id
+
+
+def test_legacy_per_request_trips_table_is_recreated(tmp_path, monkeypatch):
+    from sqlalchemy import inspect, text
+
+    from app.db import session
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE trips (id INTEGER PRIMARY KEY, job_id VARCHAR, trip_index INTEGER, "
+            "booking_request_id VARCHAR, trip_stop_sequence JSON)"
+        ))
+    monkeypatch.setattr(session, "engine", engine)
+    session._drop_legacy_staging_tables()
+    Base.metadata.create_all(bind=engine)
+
+    inspector = inspect(engine)
+    assert "booking_request_id" not in {col["name"] for col in inspector.get_columns("trips")}
+    assert {"trip_requests", "trip_stops"} <= set(inspector.get_table_names())
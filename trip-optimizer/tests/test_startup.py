@@ -0,0 +1,80 @@
+import pathlib
+import subprocess
+import sys
+import threading
+import time
+
+from app.utils.startup_utils import StartupMonitor, startup_monitor
+from app.workers.solver_pool import SolverPool, solver_pool
+
+API_PREFIX = "/optimizer/api/v1"
+
+
+def test_ready_reports_warmup(client):
+    assert startup_monitor.wait(timeout=30)
+    resp = client.get(f"{API_PREFIX}/ready")
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["status"] == "ready"
+    assert data["warmup_error"] is None
+    # A pool started lazily for a queued job (no lifespan) skips the warmup
+    if solver_pool is None or solver_pool.warmup:
+        assert data["warmup_ms"] is not None
+
+
+def test_solver_workers_warm_up_before_ready():
+    pool = SolverPool(2)
+    monitor = StartupMonitor()
+    pool.start(warmup=True)
+    try:
+        monitor.start(True, pool.warmup_reports())
+        assert monitor.wait(timeout=60)
+        report = monitor.report()
+        assert sorted(r["worker"] for r in report["worker_warmups"]) == [0, 1]
+        assert all(r["warmup_ms"] is not None and r["error"] is None for r in report["worker_warmups"])
+        assert report["warmup_ms"] == max(r["warmup_ms"] for r in report["worker_warmups"])
+        assert report["warmup_error"] is None
+    finally:
+        pool.shutdown(timeout=5)
+
+
+def test_shutdown_waits_one_deadline_for_all_workers():
+    class StuckWorker:
+        name = "stuck"
+
+        def __init__(self):
+            self.alive, self.waited = True, 0.0
+
+        def join(self, timeout=None):
+            if self.alive and timeout:
+                time.sleep(timeout)
+                self.waited += timeout
+
+        def is_alive(self):
+            return self.alive
+
+        def terminate(self):
+            self.alive = False
+
+    pool = SolverPool(3)
+    workers = [StuckWorker() for _ in range(3)]
+    pool._processes = list(workers)
+    pool._stop_event, pool._wakeup_event = threading.Event(), threading.Event()
+    started = time.monotonic()
+    pool.shutdown(timeout=0.5)
+    assert time.monotonic() - started < 1.0
+    assert not any(worker.alive for worker in workers)
+
+
+def test_ready_is_503_while_warming_up(client, monkeypatch):
+    monkeypatch.setattr("app.api.routes.startup_monitor", StartupMonitor())
+    resp = client.get(f"{API_PREFIX}/ready")
+    assert resp.status_code == 503
+    assert resp.json()["status"] == "warming_up"
+
+
+def test_app_import_does_not_load_ortools():
+    code = "import sys, app.main; print('ortools' in sys.modules)"
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                         cwd=pathlib.Path(__file__).resolve().parents[1])
+    assert out.stdout.strip().splitlines()[-1] == "False"
@@ -0,0 +1,86 @@
+import os
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.core.config import settings
+from app.services.heuristic_solver import HeuristicSolver
+from app.services.optimization_service import OptimizationService
+from app.services.optimization_solver import OptimizationSolver
+from benchmarks.instances import generate_instance
+
+API_PREFIX = "/optimizer/api/v1"
+HEADERS = {"X-API-Key": os.environ.get("API_KEY", "test-api-key")}
+
+
+def _parse(value):
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def _with_windows(payload, before_hours=(3, 1), service_minutes=5):
+    """Give every request a pickup window before its dropoff and stop service times."""
+    for req in payload["requests"]:
+        dropoff = _parse(req["dropoff_time"])
+        req["earliest_pickup"] = (dropoff - timedelta(hours=before_hours[0])).strftime("%Y-%m-%dT%H:%M:%SZ")
+        req["latest_pickup"] = (dropoff - timedelta(hours=before_hours[1])).strftime("%Y-%m-%dT%H:%M:%SZ")
+        req["pickup_service_minutes"] = service_minutes
+        req["dropoff_service_minutes"] = service_minutes
+    return payload
+
+
+def _assert_schedule_respects_windows(solver, result):
+    _, time_matrix = solver.build_matrices()
+    assert result["assigned"]
+    for assigned in result["assigned"]:
+        nodes = assigned["route_nodes"] + [solver.depot_index]
+        times = assigned["stop_times"]
+        assert len(times) == len(nodes)
+        for m, node in enumerate(nodes):
+            earliest, latest = solver.time_windows[node]
+            assert times[m] >= earliest
+            assert latest is None or times[m] <= latest
+            if m:
+                # Service at the previous stop and travel both fit before this stop
+                prev = nodes[m - 1]
+                assert times[m] >= times[m - 1] + solver.service_times[prev] + time_matrix[prev][node]
+        assert times[-1] - times[0] <= settings.SOLVER_MAX_VEHICLE_TIME_MINUTES * 60
+
+
+@pytest.mark.parametrize("solver_cls", [HeuristicSolver, OptimizationSolver])
+def test_pickup_windows_and_service_times_are_respected(solver_cls, monkeypatch):
+    monkeypatch.setattr(settings, "SOLVER_TIME_LIMIT_SECONDS", 1)
+    payload = _with_windows(generate_instance(num_requests=12, num_vehicles=4, seed=3))
+    solver = solver_cls(payload["vehicles"], payload["requests"])
+    assert solver.has_earliest_times
+    _assert_schedule_respects_windows(solver, solver.solve())
+
+
+def test_stop_etas_come_from_the_schedule():
+    payload = _with_windows(generate_instance(num_requests=6, num_vehicles=2, seed=8))
+    solver = HeuristicSolver(payload["vehicles"], payload["requests"])
+    trips = OptimizationService.build_scheduled_trips(solver, solver.solve())
+    assert trips
+    for trip in trips:
+        etas = [stop.estimated_arrival_time for stop in trip.route]
+        assert etas == sorted(etas)
+        assert etas[0] == trip.trip_start_time
+        assert etas[-1] == trip.trip_end_time
+        for stop in trip.route:
+            if stop.type == "pickup":
+                req = next(r for r in payload["requests"] if r["id"] == stop.request_id)
+                assert _parse(req["earliest_pickup"]) <= stop.estimated_arrival_time <= _parse(req["latest_pickup"])
+
+
+def test_pickup_window_after_dropoff_is_rejected(client):
+    payload = generate_instance(num_requests=1, num_vehicles=1, seed=1)
+    req = payload["requests"][0]
+    dropoff = _parse(req["dropoff_time"])
+    req["earliest_pickup"] = (dropoff - timedelta(hours=1)).strftime("%Y-%m-%dT%H:%M:%SZ")
+    req["latest_pickup"] = (dropoff - timedelta(hours=2)).strftime("%Y-%m-%dT%H:%M:%SZ")
+    resp = client.post(f"{API_PREFIX}/optimize", json=payload, headers=HEADERS)
+    assert resp.status_code == 422
+
+    req["latest_pickup"] = None
+    req["earliest_pickup"] = (dropoff + timedelta(minutes=1)).strftime("%Y-%m-%dT%H:%M:%SZ")
+    resp = client.post(f"{API_PREFIX}/optimize", json=payload, headers=HEADERS)
+    assert resp.status_code == 422
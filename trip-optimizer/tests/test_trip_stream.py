@@ -0,0 +1,103 @@
+import json
+import os
+import uuid
+from datetime import timedelta
+
+import pytest
+
+from app.db import models
+from app.db.session import SessionLocal
+from app.models import schemas
+from app.services.data_manager import DataManager
+from app.services.trip_stream import TripStream
+from benchmarks.bench_persistence import build_trips
+from benchmarks.instances import generate_instance
+
+API_PREFIX = "/optimizer/api/v1"
+HEADERS = {"X-API-Key": os.environ.get("API_KEY", "test-api-key")}
+
+
+def _finished_job(persist_trips: bool):
+    """A completed job with 10 trips over 3 vehicles, starting an hour apart."""
+    payload = generate_instance(num_requests=30, num_vehicles=3, seed=12)
+    trips = build_trips(payload, per_trip=3)
+    for i, trip in enumerate(trips):
+        trip.trip_start_time += timedelta(hours=i)
+    job_id = f"OPT-{uuid.uuid4()}"
+    result = schemas.OptimizationResult(job_id=job_id, status="completed", scheduled_trips=trips)
+    with SessionLocal() as db:
+        db.add(models.OptimizationJob(id=job_id, status="pending", request_payload=payload, claimed_by="test"))
+        db.commit()
+        dm = DataManager(db)
+        if persist_trips:
+            dm.load_and_save_payload(payload, job_id)
+            dm.save_result_and_trips(job_id, result)
+        else:
+            dm.save_optimization_result(job_id, result)
+        db.get(models.OptimizationJob, job_id).status = "completed"
+        db.commit()
+    return job_id, result
+
+
+def _stream(client, job_id, **params):
+    response = client.get(f"{API_PREFIX}/optimize/{job_id}/trips", params=params, headers=HEADERS)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    return [json.loads(line) for line in response.text.splitlines()], response.headers.get("X-Next-After")
+
+
+@pytest.mark.parametrize("persist_trips", [True, False])
+def test_stream_matches_result(client, persist_trips):
+    job_id, result = _finished_job(persist_trips)
+    lines, next_after = _stream(client, job_id)
+    assert next_after is None
+    assert [line["trip_index"] for line in lines] == list(range(len(result.scheduled_trips)))
+    for line, trip in zip(lines, result.scheduled_trips):
+        line.pop("trip_index")
+        assert schemas.ScheduledTrip(**line) == trip
+
+
+@pytest.mark.parametrize("persist_trips", [True, False])
+def test_stream_filters_and_pages(client, persist_trips):
+    job_id, result = _finished_job(persist_trips)
+    trips = result.scheduled_trips
+
+    vehicle = trips[0].vehicle_id
+    lines, _ = _stream(client, job_id, vehicle_id=vehicle)
+    assert [line["trip_index"] for line in lines] == [i for i, t in enumerate(trips) if t.vehicle_id == vehicle]
+
+    window = {"start_from": trips[2].trip_start_time.isoformat(), "start_to": trips[5].trip_start_time.isoformat()}
+    lines, _ = _stream(client, job_id, **window)
+    assert [line["trip_index"] for line in lines] == [2, 3, 4]
+
+    pages, after = [], -1
+    while after is not None:
+        lines, next_after = _stream(client, job_id, after=after, limit=4)
+        pages.append([line["trip_index"] for line in lines])
+        after = int(next_after) if next_after is not None else None
+    assert pages == [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9]]
+
+
+def test_fallback_page_reads_result_once(client, monkeypatch):
+    job_id, _ = _finished_job(persist_trips=False)
+    reads = []
+    stored_result = TripStream._stored_result
+
+    def counting(self, db):
+        reads.append(self.job_id)
+        return stored_result(self, db)
+
+    monkeypatch.setattr(TripStream, "_stored_result", counting)
+    lines, next_after = _stream(client, job_id, after=1, limit=3)
+    assert [line["trip_index"] for line in lines] == [2, 3, 4]
+    assert next_after == "4"
+    assert reads == [job_id]
+
+
+def test_stream_requires_finished_job(client):
+    with SessionLocal() as db:
+        job_id = f"OPT-{uuid.uuid4()}"
+        db.add(models.OptimizationJob(id=job_id, status="pending", claimed_by="test"))
+        db.commit()
+    assert client.get(f"{API_PREFIX}/optimize/{job_id}/trips", headers=HEADERS).status_code == 400
+    assert client.get(f"{API_PREFIX}/optimize/OPT-missing/trips", headers=HEADERS).status_code == 404
@@ -0,0 +1,94 @@
+from datetime import datetime
+
+import pytest
+
+from app.core.config import settings
+from app.services.heuristic_solver import HeuristicSolver
+from app.services.optimization_solver import OptimizationSolver
+from app.services.routing_problem import RoutingProblem
+from benchmarks.instances import generate_instance, generate_multiday_instance
+
+
+def _local_date(request):
+    # Generated dropoffs are 08:00-18:45 in Vietnam (UTC+7), so UTC and local dates agree
+    return datetime.fromisoformat(request["dropoff_time"].replace("Z", "+00:00")).date().isoformat()
+
+
+def test_unavailable_days_restrict_vehicles_per_request():
+    payload = generate_multiday_instance(days=2, requests_per_day=3, num_vehicles=3, seed=2)
+    payload["vehicles"][0]["unavailability"] = [{"date": "2025-08-20", "period": 0}]
+    payload["vehicles"][1]["unavailability"] = [{"date": "2025-08-21", "period": 0}]
+    problem = RoutingProblem(payload["vehicles"], payload["requests"])
+
+    for ridx, req in enumerate(payload["requests"]):
+        expected = [1, 2] if _local_date(req) == "2025-08-20" else [0, 2]
+        assert problem.allowed_vehicles[ridx] == expected
+        assert problem.vehicle_allowed(2, ridx)
+
+
+def test_local_day_boundary_uses_configured_offset():
+    payload = generate_instance(num_requests=1, num_vehicles=2, seed=1)
+    # 23:30 UTC on Aug 19 is 06:30 on Aug 20 in Vietnam
+    payload["requests"][0]["dropoff_time"] = "2025-08-19T23:30:00Z"
+    payload["vehicles"][0]["unavailability"] = [{"date": "2025-08-20", "period": 0}]
+    assert RoutingProblem(payload["vehicles"], payload["requests"]).allowed_vehicles == [[1]]
+
+
+@pytest.mark.parametrize("solver_cls", [HeuristicSolver, OptimizationSolver])
+def test_multiday_model_never_assigns_unavailable_vehicles(solver_cls, monkeypatch):
+    monkeypatch.setattr(settings, "SOLVER_TIME_LIMIT_SECONDS", 2)
+    payload = generate_multiday_instance(days=2, requests_per_day=8, num_vehicles=4, seed=3)
+    unavailable = {"VEH-1": "2025-08-20", "VEH-2": "2025-08-21"}
+    for vehicle in payload["vehicles"]:
+        if vehicle["id"] in unavailable:
+            vehicle["unavailability"] = [{"date": unavailable[vehicle["id"]], "period": 0}]
+    date_by_request = {r["id"]: _local_date(r) for r in payload["requests"]}
+
+    result = solver_cls(payload["vehicles"], payload["requests"]).solve()
+    assert result["assigned"]
+    for assigned in result["assigned"]:
+        for rid in assigned["requests"]:
+            assert unavailable.get(assigned["vehicle_id"]) != date_by_request[rid]
+
+
+def test_requests_without_eligible_vehicle_stay_unassigned(monkeypatch):
+    monkeypatch.setattr(settings, "SOLVER_TIME_LIMIT_SECONDS", 1)
+    payload = generate_instance(num_requests=4, num_vehicles=2, seed=5)
+    for vehicle in payload["vehicles"]:
+        vehicle["unavailability"] = [{"date": "2025-08-20", "period": 0}]
+
+    for solver_cls in (HeuristicSolver, OptimizationSolver):
+        result = solver_cls(payload["vehicles"], payload["requests"]).solve()
+        assert result["assigned"] == []
+        assert sorted(result["unassigned_requests"]) == sorted(r["id"] for r in payload["requests"])
+
+
+def test_heuristic_tries_every_idle_vehicle_of_equal_capacity():
+    payload = generate_instance(num_requests=3, num_vehicles=2, seed=5)
+    for vehicle in payload["vehicles"]:
+        vehicle["capacity"] = 16
+    payload["vehicles"][0]["unavailability"] = [{"date": "2025-08-20", "period": 0}]
+
+    result = HeuristicSolver(payload["vehicles"], payload["requests"]).solve()
+    assert result["unassigned_requests"] == []
+    assert {a["vehicle_id"] for a in result["assigned"]} == {payload["vehicles"][1]["id"]}
+
+
+@pytest.mark.parametrize("earliest_pickup", [
+    None,                    # the ride to a 00:10 dropoff starts before midnight
+    "2025-08-19T03:00:00Z",  # 10:00 local: a window opening before the problem's anchor
+])
+def test_pickup_before_local_midnight_excludes_previous_day(earliest_pickup):
+    payload = generate_instance(num_requests=1, num_vehicles=2, seed=1)
+    request = payload["requests"][0]
+    # 17:10 UTC on Aug 19 is 00:10 on Aug 20 in Vietnam
+    request["dropoff_time"] = "2025-08-19T17:10:00Z"
+    if earliest_pickup:
+        request["earliest_pickup"] = earliest_pickup
+    payload["vehicles"][0]["unavailability"] = [{"date": "2025-08-19", "period": 0}]
+    # Depot, pickup, dropoff: a 30 minute ride
+    time_matrix = [[0, 600, 600], [600, 0, 1800], [600, 1800, 0]]
+    distance_matrix = [[0, 1000, 1000], [1000, 0, 20000], [1000, 20000, 0]]
+
+    problem = RoutingProblem(payload["vehicles"], payload["requests"], matrices=(distance_matrix, time_matrix))
+    assert problem.allowed_vehicles == [[1]]
@@ -0,0 +1,115 @@
+import json
+import os
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+from app.clients.webhook_client import WebhookClient, sign_payload
+from app.core.config import settings
+from app.db import models
+from app.db.session import SessionLocal
+from app.workers.job_worker import process_job
+from benchmarks.instances import generate_instance
+
+API_PREFIX = "/optimizer/api/v1"
+HEADERS = {"X-API-Key": os.environ.get("API_KEY", "test-api-key")}
+
+
+@pytest.fixture()
+def receiver():
+    """Local webhook receiver; answers with queued status codes, then 200."""
+    deliveries, responses, delivered = [], [], threading.Event()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers["Content-Length"]))
+            deliveries.append((dict(self.headers), body))
+            code = responses.pop(0) if responses else 200
+            self.send_response(code)
+            self.end_headers()
+            if code == 200:
+                delivered.set()
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}/hook", deliveries, responses, delivered
+    server.shutdown()
+    server.server_close()
+
+
+def _held_job(db, **payload_extra):
+    """A pending job claimed by the test itself, so pooled workers leave it alone."""
+    payload = {**generate_instance(num_requests=4, num_vehicles=2, seed=8), "solver_mode": "heuristic", **payload_extra}
+    job = models.OptimizationJob(
+        id=f"OPT-{uuid.uuid4()}", status="pending", request_payload=payload, claimed_by="test", attempts=1
+    )
+    db.add(job)
+    db.commit()
+    return job.id
+
+
+def test_webhook_is_signed_and_retried(monkeypatch, receiver):
+    url, deliveries, responses, _ = receiver
+    monkeypatch.setattr(settings, "WEBHOOK_BACKOFF_SECONDS", 0)
+    responses.extend([500, 503])
+
+    assert WebhookClient().deliver(url, {"event": "optimization.finished", "job_id": "OPT-1"}) is True
+    assert [h["X-Optimizer-Delivery-Attempt"] for h, _ in deliveries] == ["1", "2", "3"]
+    headers, body = deliveries[-1]
+    assert headers["X-Optimizer-Signature"] == sign_payload(body, headers["X-Optimizer-Timestamp"])
+    assert json.loads(body)["job_id"] == "OPT-1"
+
+    # Client errors other than 408/429 are not retried
+    deliveries.clear()
+    responses.append(400)
+    assert WebhookClient().deliver(url, {"event": "optimization.finished"}) is False
+    assert len(deliveries) == 1
+
+
+def test_finished_job_notifies_callback_url(receiver):
+    url, deliveries, _, delivered = receiver
+    with SessionLocal() as db:
+        job_id = _held_job(db, callback_url=url)
+    process_job(job_id, "test")
+
+    assert delivered.wait(10)
+    event = json.loads(deliveries[-1][1])
+    with SessionLocal() as db:
+        job = db.get(models.OptimizationJob, job_id)
+        assert event == {
+            "event": "optimization.finished",
+            "job_id": job_id,
+            "status": "completed",
+            "result_url": f"{API_PREFIX}/optimize/{job_id}/result",
+            "etag": job.result_etag,
+        }
+
+
+def test_status_long_poll_returns_on_completion(client):
+    with SessionLocal() as db:
+        job_id = _held_job(db)
+
+    def complete_later():
+        time.sleep(0.5)
+        with SessionLocal() as db:
+            db.get(models.OptimizationJob, job_id).status = "completed"
+            db.commit()
+
+    threading.Thread(target=complete_later).start()
+    started = time.monotonic()
+    response = client.get(f"{API_PREFIX}/optimize/{job_id}/status", params={"wait": 10}, headers=HEADERS)
+    assert response.status_code == 200
+    assert response.json()["status"] == "completed"
+    assert time.monotonic() - started < 5
+
+    too_long = client.get(
+        f"{API_PREFIX}/optimize/{job_id}/status",
+        params={"wait": settings.LONG_POLL_MAX_WAIT_SECONDS + 1}, headers=HEADERS,
+    )
+    assert too_long.status_code == 422